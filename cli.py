@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+from config import volatility_workers, volatility_engine, scheduler_time_budget_s, result_cache_enabled
+
+# Detect operating system
+os_name = platform.system()
+
+# Define appropriate directories based on OS
+if os_name == "Windows":
+    drive_path = "O:\\"
+    volatility_output_dir = "O:\\02_volatility_output"
+    tree_output_dir = "O:\\03_trees"
+else:  # Linux/macOS
+    drive_path = "/tmp/MemoryInvestigator"
+    volatility_output_dir = "/tmp/MemoryInvestigator/02_volatility_output"
+    tree_output_dir = "/tmp/MemoryInvestigator/03_trees"
+
+# Pipeline stages in execution order
+STAGES = ["setup", "volatility", "filescan", "tree", "llm", "rag-standard", "rag-experimental"]
+DEFAULT_STAGES = ["setup", "volatility", "tree"]
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+
+def emit(event, **fields):
+    """
+    Writes a progress event as one JSON line to stdout.
+
+    :param event: Name of the event.
+    :param fields: Fields of the event.
+    """
+    print(json.dumps({"time": round(time.time(), 3), "event": event, **fields}, default=str), flush=True)
+
+def default_api_key(llm_option):
+    """
+    Reads the API key of the LLM provider from the environment.
+    """
+    return os.environ.get("GOOGLE_API_KEY" if llm_option.startswith("gemini") else "OPENAI_API_KEY")
+
+def default_embedding(llm_option):
+    """
+    Returns the default embedding of the LLM provider, as preselected on the RAG pages.
+    """
+    return "models/embedding-001" if llm_option.startswith("gemini") else "text-embedding-3-large"
+
+def parse_args(argv=None):
+    """
+    Parses the command line arguments.
+
+    :param argv: Optional list of arguments, defaults to sys.argv.
+    :return: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs the MemoryInvestigator pipeline without Streamlit. Progress is written to stdout as JSON Lines.",
+        epilog="Exit codes: 0 = all stages succeeded, 1 = a stage failed, 2 = usage error, "
+               "3 = all stages finished but some plugins failed.")
+    parser.add_argument("memory_file", nargs="?", help="Path to the memory dump file, needed by the volatility and filescan stages.")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help=f"Comma-separated stages out of {', '.join(STAGES)} (default: {','.join(DEFAULT_STAGES)}).")
+    parser.add_argument("--plugins", help="Comma-separated Volatility3 plugins (default: all plugins of the basic analysis).")
+    parser.add_argument("--output-dir", default=volatility_output_dir, help="Directory of the Volatility3 outputs.")
+    parser.add_argument("--tree-dir", default=tree_output_dir, help="Directory the tree is saved to and read from.")
+    parser.add_argument("--workers", type=int, default=volatility_workers, help="Number of plugins running in parallel.")
+    parser.add_argument("--engine", choices=["subprocess", "framework"], default=volatility_engine, help="Volatility3 engine.")
+    parser.add_argument("--time-budget", type=float, default=scheduler_time_budget_s, help="Time budget of the analysis in seconds.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the persistent result cache.")
+    parser.add_argument("--incremental", action="store_true", help="Only run plugins whose output is missing or stale.")
+    parser.add_argument("--llm", help="LLM used by the llm and rag stages.")
+    parser.add_argument("--api-key", help="API key of the LLM, defaults to GOOGLE_API_KEY or OPENAI_API_KEY.")
+    parser.add_argument("--prompt", help="Prompt of the llm stage.")
+    parser.add_argument("--parts", type=int, default=1, help="Number of parts the tree is divided into for the llm stage.")
+    parser.add_argument("--embedding", help="Embedding of the rag stages, defaults to the first embedding of the LLM provider.")
+    parser.add_argument("--malpedia-reference", help="Malpedia reference name added to the standard RAG.")
+    args = parser.parse_args(argv)
+
+    args.stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in args.stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    args.stages = [stage for stage in STAGES if stage in args.stages]
+
+    if {"volatility", "filescan"} & set(args.stages):
+        if not args.memory_file:
+            parser.error("the volatility and filescan stages need a memory dump file")
+        if not os.path.isfile(args.memory_file):
+            parser.error(f"memory dump file not found: {args.memory_file}")
+        args.memory_file = os.path.abspath(args.memory_file)
+
+    if {"llm", "rag-standard", "rag-experimental"} & set(args.stages):
+        if not args.llm:
+            parser.error("the llm and rag stages need --llm")
+        args.api_key = args.api_key or default_api_key(args.llm)
+        if not args.api_key:
+            parser.error("the llm and rag stages need --api-key or the API key in the environment")
+        args.embedding = args.embedding or default_embedding(args.llm)
+    if "llm" in args.stages and not args.prompt:
+        parser.error("the llm stage needs --prompt")
+    if args.parts < 1:
+        parser.error("--parts must be at least 1")
+    return args
+
+def run_setup(args):
+    """
+    Creates the drive and downloads Volatility3, unless they already exist.
+    """
+    from utils.folder_setup import create_drive
+    from utils.volatility_analysis import volatility_path
+
+    if not os.path.exists(drive_path):
+        create_drive(os_name)
+    if not os.path.isfile(volatility_path):
+        from utils.volatility_downloader import volatility_download
+        volatility_download()
+    return {"drive": drive_path, "volatility": volatility_path}
+
+def run_volatility(args):
+    """
+    Runs the Volatility3 plugins stage by stage, every plugin status is emitted as an event.
+    """
+    from utils.fingerprint import register_dump
+    from utils.plugin_scheduler import schedule_analysis
+    from utils.volatility_analysis import GLOBAL_VOLATILITY
+
+    plugins = args.plugins.split(",") if args.plugins else GLOBAL_VOLATILITY
+    register_dump(args.memory_file)
+
+    def plugin_status(plugin, status, message):
+        emit("plugin", plugin=plugin, status=status, message=message)
+
+    results = schedule_analysis(args.memory_file, plugins, max_workers=args.workers, status_callback=plugin_status,
+                                time_budget=args.time_budget, engine=args.engine,
+                                use_cache=result_cache_enabled and not args.no_cache, output_dir=args.output_dir,
+                                incremental=args.incremental)
+    statuses = [result["status"] for result in results]
+    return {"plugins": {status: statuses.count(status) for status in sorted(set(statuses))},
+            "failed_plugins": [result["plugin"] for result in results if result["status"] == "failed"]}
+
+def run_filescan(args):
+    """
+    Runs the 'windows.filescan' plugin for the data extraction.
+    """
+    from utils.background_filescan import run_filescan_once
+
+    result = run_filescan_once(args.memory_file, engine=args.engine, use_cache=result_cache_enabled and not args.no_cache)
+    return {"status": result["status"], "output_file": result["output_file"], "rows": result["output_rows"]}
+
+def run_tree(args):
+    """
+    Builds the basic tree from the Volatility3 outputs in the output directory.
+    """
+    from utils.plugin_scheduler import flag_suspicious_pids
+    from utils.tree_builder import build_basic_tree
+
+    names = sorted(os.listdir(args.output_dir)) if os.path.isdir(args.output_dir) else []
+    finished = [name[:-len(".json")] for name in names if name.endswith(".json")]
+    if build_basic_tree(args.output_dir, finished, flag_suspicious_pids(args.output_dir), args.tree_dir) is None:
+        raise FileNotFoundError(f"No windows.pslist output in {args.output_dir}.")
+    return {"tree": os.path.join(args.tree_dir, "basic_system_analysis_tree.json"), "plugins": finished}
+
+def run_llm(args):
+    """
+    Analyzes the tree with the LLM, every response is emitted as an event.
+    """
+    from utils.llm_analysis import analyze_tree
+    from utils.select_tree import choose_basic_or_costume_tree
+
+    tree = choose_basic_or_costume_tree(args.tree_dir)
+    if tree is None:
+        raise FileNotFoundError("Please build a tree first.")
+
+    def llm_response(label, text):
+        emit("llm_response", part=label, text=text)
+
+    analysis = analyze_tree(args.llm, args.api_key, args.parts, args.prompt, tree=tree, response_callback=llm_response)
+    return {"tree": tree, "responses": len(analysis["parts"]) + (analysis["summary"] is not None)}
+
+def run_rag_standard(args):
+    """
+    Builds the standard RAG from the provided books and the optional Malpedia reference.
+    """
+    from utils.build_rag_from_books import build_standard_rag
+
+    build_standard_rag(args.api_key, args.llm, args.embedding, args.malpedia_reference)
+    return {}
+
+def run_rag_experimental(args):
+    """
+    Builds the experimental forensic RAG from the books and the Volatility3 outputs.
+    """
+    from utils.build_rag_from_books_and_volatility3_data import build_experimental_forensic_rag
+
+    build_experimental_forensic_rag(args.api_key, args.llm, args.embedding)
+    return {}
+
+# Stage functions, imported lazily so a run only loads the modules of its stages
+STAGE_FUNCTIONS = {
+    "setup": run_setup,
+    "volatility": run_volatility,
+    "filescan": run_filescan,
+    "tree": run_tree,
+    "llm": run_llm,
+    "rag-standard": run_rag_standard,
+    "rag-experimental": run_rag_experimental,
+}
+
+def main(argv=None):
+    """
+    Runs the selected stages in order and stops at the first failed stage.
+
+    :param argv: Optional list of arguments, defaults to sys.argv.
+    :return: Exit code.
+    """
+    args = parse_args(argv)
+    started_at = time.time()
+    emit("pipeline_started", memory_file=args.memory_file, stages=args.stages)
+    failed_plugins = []
+
+    for stage in args.stages:
+        emit("stage_started", stage=stage)
+        stage_started_at = time.time()
+        try:
+            summary = STAGE_FUNCTIONS[stage](args)
+        except Exception as e:
+            emit("stage_failed", stage=stage, error=str(e) or type(e).__name__, error_type=type(e).__name__,
+                 duration_s=round(time.time() - stage_started_at, 3))
+            emit("pipeline_finished", status="failed", duration_s=round(time.time() - started_at, 3))
+            return EXIT_FAILED
+        failed_plugins += summary.pop("failed_plugins", [])
+        emit("stage_finished", stage=stage, duration_s=round(time.time() - stage_started_at, 3), **summary)
+
+    status = "partial" if failed_plugins else "done"
+    emit("pipeline_finished", status=status, failed_plugins=failed_plugins, duration_s=round(time.time() - started_at, 3))
+
+    # Results stored before the full hash of the dump was known are still added to the cache before exiting
+    from utils.result_cache import wait_for_pending_stores
+    wait_for_pending_stores()
+    return EXIT_PARTIAL if failed_plugins else EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
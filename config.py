@@ -10,4 +10,46 @@ llm_options = [
     "o1-preview",
     "o1-2024-12-17",
     "o1"
-]
\ No newline at end of file
+]
+
+# Number of Volatility3 plugins executed in parallel (1 = sequential)
+volatility_workers = 4
+
+# Estimated peak memory of a single Volatility3 plugin run in MB, used to cap the degree of parallelism
+volatility_plugin_memory_mb = 2048
+
+# Minimum free physical memory in MB before another Volatility3 plugin is started
+volatility_min_free_memory_mb = 2048
+
+# Volatility3 engine: "subprocess" starts vol.py per plugin, "framework" runs all plugins in-process on one shared context
+volatility_engine = "subprocess"
+
+# Persistent cache of Volatility3 plugin results, keyed by the full hash of the memory dump, plugin, arguments and version
+result_cache_enabled = True
+result_cache_max_size_mb = 20480
+
+# Volatility3 output format: "jsonl" streams one row per line while a plugin runs, "json" writes one document at the end
+volatility_output_format = "jsonl"
+
+# Optional time budget in seconds for the scheduled analysis, no further plugins are started once it is used up
+scheduler_time_budget_s = None
+
+# Limits per Volatility3 plugin run (None = no limit). A plugin exceeding its wall-clock time or resident memory
+# is killed; the address space limit is enforced by the OS on Linux/macOS. A plugin of the framework engine runs
+# in-process and cannot be stopped, so the framework engine requires the timeout and memory limit to be None.
+volatility_plugin_timeout_s = 3600
+volatility_plugin_max_memory_mb = 8192
+volatility_plugin_address_space_mb = None
+
+# Retries of a failed plugin run with exponential backoff in seconds, timeouts are not retried
+volatility_plugin_retries = 1
+volatility_retry_backoff_s = 10
+
+# Never download symbol tables, e.g. on air-gapped machines; symbols come from imported packs in the persistent symbol cache
+symbol_offline = False
+
+# Memory budget of the process-wide cache of loaded outputs and trees, the least recently used are evicted first
+artifact_cache_max_mb = 1024
+
+# Number of memory dumps analyzed at the same time in batch mode, the plugin workers are shared between them
+batch_parallel_dumps = 2
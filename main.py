@@ -40,11 +40,15 @@ def main():
             pages = {
                 "Environment": [
                     st.Page("pages/data_input.py", title="Data Input"),
+                    st.Page("pages/batch_analysis.py", title="Batch Analysis"),
+                    st.Page("pages/telemetry.py", title="Run Telemetry"),
                 ],
                 "Simple Analysis": [
                     st.Page("pages/display_data.py", title="Display Data as Table"),
                     st.Page("pages/graph.py", title="Display Data as Graph"),
                     st.Page("pages/extract_data.py", title="Extract Data"),
+                    st.Page("pages/search.py", title="Search All Outputs"),
+                    st.Page("pages/sql_query.py", title="SQL Query"),
                 ],
                 "Artificial Intelligence Analysis": [
                     st.Page("pages/tree_of_table.py", title="Analysis with Tree-of-Table"),
@@ -61,6 +65,8 @@ def main():
             pages = {
                 "Environment": [
                     st.Page("pages/data_input.py", title="Data Input"),
+                    st.Page("pages/batch_analysis.py", title="Batch Analysis"),
+                    st.Page("pages/telemetry.py", title="Run Telemetry"),
                 ],
                 "Help": [
                     st.Page("pages/help.py", title="Help"),
@@ -0,0 +1,72 @@
+import time
+import streamlit as st
+
+from config import batch_parallel_dumps
+from utils.file_handler import find_all_memory_files, memory_dump_dir
+from utils.volatility_analysis import GLOBAL_VOLATILITY
+from utils.batch_queue import load_queue, enqueue, requeue_failed, clear_finished, start_batch, is_batch_running, \
+    batch_progress, dump_dirs, batch_dir
+
+# Streamlit page title and description
+st.title("Batch Analysis")
+st.caption(f"Analyze many memory dumps at once. Every dump in `{memory_dump_dir}` can be queued, its Volatility3 outputs and basic tree are kept apart in `{batch_dir}`. The queue survives a restart of the app and can be resumed.")
+
+# Queue the memory dumps of the memory directory
+memory_files = find_all_memory_files()
+left, right = st.columns(2)
+selected_files = left.multiselect("Memory dumps to queue:", options=memory_files, default=memory_files)
+parallel_dumps = right.number_input("Memory dumps analyzed in parallel:", min_value=1, max_value=16, value=batch_parallel_dumps)
+
+if left.button("Add to Queue", use_container_width=True, disabled=not selected_files):
+    st.toast(f"{enqueue(selected_files)} memory dumps added to the queue.")
+
+jobs = load_queue()
+running = is_batch_running()
+unfinished = [job for job in jobs if job["status"] in ("queued", "running")]
+
+# Start the batch, or resume it after a restart of the app
+if right.button("Resume Batch" if any(job["started_at"] for job in unfinished) else "Start Batch",
+                use_container_width=True, disabled=running or not unfinished):
+    start_batch(parallel_dumps)
+    running = True
+
+if not jobs:
+    st.info("The queue is empty. Add memory dumps to start a batch analysis.")
+    st.stop()
+
+# Queue progress and throughput
+progress = batch_progress(jobs)
+st.progress((progress["done"] + progress["failed"]) / len(jobs))
+queued_col, running_col, done_col, failed_col, throughput_col = st.columns(5)
+queued_col.metric("Queued", progress["queued"])
+running_col.metric("Running", progress["running"])
+done_col.metric("Done", progress["done"])
+failed_col.metric("Failed", progress["failed"])
+throughput_col.metric("Dumps per Hour", progress["dumps_per_hour"] if progress["dumps_per_hour"] is not None else "-")
+
+st.dataframe([
+    {
+        "Memory Dump": job["name"],
+        "Size (GB)": round(job["size"] / 1024 ** 3, 2),
+        "Status": job["status"],
+        "Plugins": f"{job['finished_plugins']}/{len(GLOBAL_VOLATILITY)}",
+        "Failed Plugins": ", ".join(job["failed_plugins"]),
+        "Duration (min)": round(((job["finished_at"] or time.time()) - job["started_at"]) / 60, 1) if job["started_at"] else None,
+        "Output": dump_dirs(job)[0],
+        "Error": job["error"],
+    }
+    for job in jobs
+], use_container_width=True, hide_index=True)
+
+retry_col, clear_col = st.columns(2)
+if retry_col.button("Retry Failed Dumps", use_container_width=True, disabled=not progress["failed"]):
+    st.toast(f"{requeue_failed()} memory dumps queued again.")
+    st.rerun()
+if clear_col.button("Clear Finished Dumps", use_container_width=True, disabled=running):
+    st.toast(f"{clear_finished()} memory dumps removed from the queue, their outputs are kept.")
+    st.rerun()
+
+# Refresh the progress while the batch is running
+if running:
+    time.sleep(5)
+    st.rerun()
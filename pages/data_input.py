@@ -1,12 +1,19 @@
 import os
 import json
+import time
 import platform
 import streamlit as st
 
 # Import utility functions for handling memory files, running analysis, and building trees
 from utils.file_handler import handle_memory_upload, find_memory_files
-from utils.volatility_analysis import run_analysis, GLOBAL_VOLATILITY, run_file_search_analysis
-from utils.tree_builder import build_hierarchical_tree, load_selected_files
+from utils.volatility_analysis import OPTIONAL_VOLATILITY, modify_global_var, volatility_version
+from utils.plugin_scheduler import schedule_analysis
+from utils.tree_builder import build_basic_tree, update_trees
+from utils.output_provenance import plan_incremental
+from utils.background_filescan import start_background_filescan
+from utils.result_cache import list_cache_entries, cache_size, purge_cache, cache_dir
+from utils.fingerprint import register_dump, load_case_fingerprints, is_fingerprint_running
+from utils.symbol_cache import list_symbols, import_symbol_pack, symbol_dir
 
 # Detect operating system
 os_name = platform.system()
@@ -23,6 +30,11 @@ else:  # Linux/macOS
     tree_dir = "/tmp/MemoryInvestigator/03_trees"
     volatility_output = "/tmp/MemoryInvestigator/02_volatility_output"
 
+# Plugins of the analysis in this session, the global list is shared by all sessions
+if "volatility_plugins" not in st.session_state:
+    st.session_state["volatility_plugins"] = modify_global_var()
+plugins = st.session_state["volatility_plugins"]
+
 # Streamlit page title and description
 st.title("Data Input")
 st.caption(f"Upload memory files and enter project details on this page. If a memory file is available, you can start exploring memory data and generating insights. For more information, visit the [`Help Page`](./help).")
@@ -39,8 +51,13 @@ if uploaded_files:
     os.makedirs(memory_dir, exist_ok=True)
     for uploaded_file in uploaded_files:
         file_path = handle_memory_upload(uploaded_file, memory_dir)
+        register_dump(file_path)
         st.success(f"File saved to: {file_path}")
 
+    # The file scan of the analyzed memory dump starts right away, it is needed on the Extract Data page
+    if find_memory_files():
+        start_background_filescan(find_memory_files())
+
 # Function for user data input
 def input_data():
     """
@@ -62,14 +79,20 @@ def input_data():
 # Function to save user input to JSON file
 def save_to_json(name, project_name, date, txt):
     """
-    Saves the user-provided project settings to a JSON file.
+    Saves the user-provided project settings to a JSON file, keeping other case data like dump fingerprints.
     """
-    settings_data = {
+    try:
+        with open(settings_file, "r") as json_file:
+            settings_data = json.load(json_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        settings_data = {}
+
+    settings_data.update({
         "name": name,
         "project_name": project_name,
         "date": str(date),  # Convert date to string for JSON serialization
         "notes": txt
-    }
+    })
     os.makedirs(os.path.dirname(settings_file), exist_ok=True)
     with open(settings_file, "w") as json_file:
         json.dump(settings_data, json_file, indent=4)
@@ -89,6 +112,15 @@ try:
     if os.path.exists(memory_dir) and any(file.lower().endswith(('.raw', '.vmem', '.vmsn', '.mem')) for file in os.listdir(memory_dir)):
         st.success("Valid memory files found in the directory.")
 
+        # Show the fingerprints stored with the case
+        fingerprints = load_case_fingerprints()
+        for file in sorted(os.listdir(memory_dir)):
+            if file in fingerprints:
+                full = fingerprints[file].get("full_fingerprint")
+                if not full and is_fingerprint_running(os.path.join(memory_dir, file)):
+                    full = "computing in the background..."
+                st.caption(f"`{file}`: fast fingerprint `{fingerprints[file]['fast_fingerprint']}`, full hash `{full or 'not computed'}`")
+
         # Check if a hierarchical tree has already been generated
         if os.path.exists(tree_dir) and any(file.lower().endswith('.json') for file in os.listdir(tree_dir)):
             st.success("A valid tree was found in the directory. You can now start digging deeper.")
@@ -98,20 +130,39 @@ try:
         # Button to trigger analysis and tree-building
         if right.button("Analyze Data and Build a Basic Tree", use_container_width=True):
             memory_file = find_memory_files()
-            with st.spinner("Analyzing your memory dump..."):
-                run_analysis(memory_file, GLOBAL_VOLATILITY)
-                run_file_search_analysis(memory_file)
-
-            with st.spinner("Building a basic tree."):
-                output_path = os.path.join(volatility_output, "windows.pslist.json")
-                if os.path.exists(output_path):
-                    selected_filepaths = [output_path]
-                    selected_files = load_selected_files(selected_filepaths)
-                    mode = "basic"
-                    hierarchical_tree = build_hierarchical_tree(selected_files, mode, pid=None)
-                    st.success("Data analyzed and simple tree built!")
-                else:
-                    st.error("Output file not found. Ensure the drive is connected and the analysis ran successfully.")
+            register_dump(memory_file)
+            start_background_filescan(memory_file)
+            with st.status("Analyzing your memory dump...", expanded=True) as analysis_status:
+                progress_bar = st.progress(0.0)
+                plugin_lines = {plugin: st.empty() for plugin in plugins}
+                finished = []
+
+                def show_plugin_status(plugin, status, result):
+                    """
+                    Displays the current status of a plugin and updates the overall progress.
+                    """
+                    icons = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌", "skipped": "⏭️"}
+                    plugin_lines[plugin].write(f"{icons[status]} `{plugin}`: {result or status}")
+                    if status in ("done", "failed", "skipped"):
+                        finished.append(plugin)
+                        progress_bar.progress(len(finished) / len(plugins))
+
+                def update_basic_tree(finished_plugins, flagged_pids):
+                    """
+                    Rebuilds the basic tree whenever a stage has landed, showing the findings of the flagged processes.
+                    """
+                    if build_basic_tree(volatility_output, finished_plugins, flagged_pids) is not None:
+                        st.write(f"🌳 Basic tree updated, {len(flagged_pids)} flagged processes.")
+
+                schedule_analysis(memory_file, plugins, status_callback=show_plugin_status, stage_callback=update_basic_tree)
+                st.write("🔄 `windows.filescan`: running in the background, see the Extract Data page")
+                analysis_status.update(label="Memory dump analyzed.", state="complete", expanded=False)
+
+            # The basic tree is built by the scheduler stages
+            if os.path.exists(os.path.join(volatility_output, "windows.pslist.json")):
+                st.success("Data analyzed and simple tree built!")
+            else:
+                st.error("Output file not found. Ensure the drive is connected and the analysis ran successfully.")
 
             # Trigger a rerun
             st.rerun()
@@ -120,3 +171,90 @@ try:
 
 except Exception as e:
     st.error(f"Drive `{memory_dir}` cannot be accessed. Renew or restart the environment.")
+
+# Add plugins to an existing analysis, only missing and stale outputs are computed
+with st.expander("Add Plugins"):
+    memory_file = find_memory_files()
+    added_plugins = st.multiselect("Plugins to add to the analysis:", options=[plugin for plugin in OPTIONAL_VOLATILITY if plugin not in plugins])
+    if memory_file:
+        # The outputs are only checked on demand, checking them samples the memory dump for its fingerprint
+        if st.button("Run Missing and Stale Plugins", use_container_width=True):
+            plugins = st.session_state["volatility_plugins"] = modify_global_var(plugins, add=added_plugins)
+            plan = plan_incremental(memory_file, plugins, volatility_output, volatility_version)
+            st.dataframe([{"Plugin": plugin, "Output": state, "Reason": reason} for plugin, (state, reason) in plan.items()],
+                         use_container_width=True, hide_index=True)
+            outdated = [plugin for plugin, (state, reason) in plan.items() if state != "current"]
+            merged = set()
+
+            def merge_into_trees(finished_plugins, flagged_pids):
+                """
+                Merges the outputs of the newly finished plugins into the basic and customized tree.
+                """
+                new_plugins = [plugin for plugin in finished_plugins if plugin in outdated and plugin not in merged]
+                if new_plugins:
+                    update_trees(volatility_output, new_plugins, flagged_pids)
+                    merged.update(new_plugins)
+                    st.write(f"🌳 Trees updated with {', '.join(new_plugins)}.")
+
+            def show_outdated_status(plugin, status, result):
+                """
+                Displays the result of every plugin that is run again.
+                """
+                if plugin in outdated and status in ("done", "failed", "skipped"):
+                    st.write(f"`{plugin}`: {result or status}")
+
+            if outdated:
+                with st.status(f"Running {len(outdated)} plugins...", expanded=True) as incremental_status:
+                    schedule_analysis(memory_file, plugins, status_callback=show_outdated_status,
+                                      stage_callback=merge_into_trees, incremental=True)
+                    incremental_status.update(label="Plugins added.", state="complete", expanded=False)
+                st.rerun()
+            else:
+                st.success("All outputs are up to date.")
+    else:
+        st.caption("Upload a memory dump to add plugins.")
+
+# Inspect and purge the persistent cache of Volatility3 results
+with st.expander("Result Cache"):
+    cache_entries = list_cache_entries()
+    st.caption(f"Volatility3 results are cached in `{cache_dir}` and survive `Renew Environment`. {len(cache_entries)} entries, {cache_size() / (1024 * 1024):.1f} MB.")
+    if cache_entries:
+        st.dataframe([
+            {
+                "Memory Dump": entry["dump"],
+                "Plugin": entry["plugin"],
+                "Arguments": json.dumps(entry["args"]),
+                "Size (MB)": round(entry["size"] / (1024 * 1024), 2),
+                "Hits": entry["hits"],
+                "Last Access": time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_access"])),
+            }
+            for entry in cache_entries
+        ], use_container_width=True)
+        if st.button("Purge Result Cache", use_container_width=True):
+            removed = purge_cache()
+            st.success(f"{removed} cached results removed.")
+
+# Inspect the persistent symbol cache and pre-load symbol packs for offline analyses
+with st.expander("Symbol Cache"):
+    symbols = list_symbols()
+    st.caption(f"Volatility3 symbol tables are cached in `{symbol_dir}` and survive `Renew Environment`. {len(symbols)} Windows kernel symbol tables, memory dumps with known symbols are analyzed offline.")
+    if symbols:
+        st.dataframe([
+            {
+                "PDB": entry["pdb"],
+                "GUID": entry["guid"],
+                "Age": entry["age"],
+                "Size (MB)": round(entry["size"] / (1024 * 1024), 2),
+                "Source": entry["source"],
+                "Added": time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["added"])),
+            }
+            for entry in symbols
+        ], use_container_width=True)
+    pack_path = st.text_input("Path to a local symbol pack (zip or tar archive, or a single ISF file):")
+    if st.button("Import Symbol Pack", use_container_width=True, disabled=not pack_path):
+        try:
+            with st.spinner("Importing symbol tables..."):
+                imported = import_symbol_pack(pack_path)
+            st.success(f"{imported} symbol tables imported.")
+        except (OSError, ValueError) as e:
+            st.error(f"Symbol pack `{pack_path}` cannot be imported: {e}")
@@ -1,9 +1,15 @@
 import os
-import json
 import platform
+import time
 import pandas as pd
 import streamlit as st
 
+from utils.artifact_loader import load_frame
+from utils.search_index import search_rows
+from utils.table_query import search_matches
+from utils.paged_table import paged_dataframe
+from utils.volatility_reader import IncrementalReader
+
 # Detect operating system
 os_name = platform.system()
 
@@ -38,26 +44,33 @@ selected_files = st.multiselect(
 # General search field for filtering across all data columns
 general_search_term = st.text_input("Enter search term to filter all data:")
 
+# Reload the tables every few seconds while plugins are still writing their output
+live_update = st.toggle("Live update while plugins are running")
+
+# Readers keep the rows across reruns, so only newly written rows are parsed
+if "output_readers" not in st.session_state:
+    st.session_state["output_readers"] = {}
+
 if selected_files:
     # Iterate through selected JSON files and display their contents
     for file_name in selected_files:
         file_path = os.path.join(folder_path, file_name)
 
-        # Read JSON file with UTF-16 encoding (fallback to UTF-8)
+        # Read complete outputs from their columnar file, outputs of running plugins incrementally
         try:
-            with open(file_path, 'r', encoding='utf-16') as file:
-                data = json.load(file)
-        except (UnicodeError, json.JSONDecodeError):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
-            except Exception as e:
-                st.error(f"Error reading {file_name}: {e}")
-                continue
+            data = load_frame(file_path)
+            if data is None:
+                reader = st.session_state["output_readers"].setdefault(file_path, IncrementalReader(file_path))
+                data = reader.read()
+        except Exception as e:
+            st.error(f"Error reading {file_name}: {e}")
+            continue
 
         # Convert JSON data to Pandas DataFrame
         try:
-            if isinstance(data, list):  # If JSON is an array of objects
+            if isinstance(data, pd.DataFrame):
+                df = data
+            elif isinstance(data, list):  # If JSON is an array of objects
                 df = pd.DataFrame(data)
             elif isinstance(data, dict):  # If JSON is a dictionary
                 df = pd.DataFrame([data])
@@ -73,29 +86,30 @@ if selected_files:
             df = df[reordered_columns]
 
             # Apply general search across all columns
+            matches = None
             if general_search_term:
-                filtered_df = df[
-                    df.apply(
-                        lambda row: row.astype(str).str.contains(general_search_term, case=False, na=False).any(),
-                        axis=1
-                    )
-                ]
+                # Complete outputs are searched in their index, outputs of running plugins column by column
+                matches = search_rows(file_path, general_search_term) if isinstance(data, pd.DataFrame) else None
+                if matches is None:
+                    matches = search_matches(df, general_search_term)
                 st.write(f"### Results for '{general_search_term}' in {file_name}:")
-                st.dataframe(filtered_df)
             else:
                 st.write(f"### Data from {file_name}")
-                st.dataframe(df)
 
             # Enable optional column-specific filtering
+            column_name = column_filter = None
             if st.checkbox(f"Enable column-specific filtering for {file_name}"):
                 column_name = st.selectbox(f"Select column to filter in {file_name}:", df.columns, key=f"col-{file_name}")
                 column_filter = st.text_input(f"Enter value to filter {column_name}:", key=f"filter-{file_name}")
-                if column_filter:
-                    filtered_column_df = df[df[column_name].astype(str).str.contains(column_filter, case=False, na=False)]
-                    st.write(f"### Results for filter '{column_filter}' in column '{column_name}' of {file_name}:")
-                    st.dataframe(filtered_column_df)
+
+            # Filtering, sorting and paging run on the server, only the shown page is sent to the browser
+            paged_dataframe(df, f"table-{file_name}", matches, column_name, column_filter)
 
         except Exception as e:
             st.error(f"Error processing {file_name}: {e}")
 else:
     st.info("Please select at least one JSON file to display.")
+
+if live_update:
+    time.sleep(5)
+    st.rerun()
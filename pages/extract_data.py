@@ -1,12 +1,20 @@
 import os
-import json
+import time
 import platform
 import pandas as pd
 import streamlit as st
 
 # Import necessary utility functions for memory file handling and extraction
-from utils.volatility_analysis import run_file_search_analysis, run_file_extraction
+from utils.volatility_analysis import run_file_extraction, run_batch_extraction
+from utils.background_filescan import start_background_filescan, filescan_status
+from utils.extraction_index import update_index, index_rows, find_by_hash, find_by_path
 from utils.file_handler import find_memory_files
+from utils.fingerprint import fast_fingerprint
+from utils.artifact_loader import load_frame
+from utils.search_index import search_rows
+from utils.table_query import search_matches
+from utils.paged_table import paged_dataframe
+from utils.volatility_reader import IncrementalReader
 
 # Detect operating system
 os_name = platform.system()
@@ -21,30 +29,52 @@ FILE_PATH = os.path.join(data_extraction_dir, "windows.filescan.json")
 
 # Streamlit page title and description
 st.title("Extract Data")
-st.caption(f"Display and search detected files from Volatility3's file scan. Extract specific files to `{data_extraction_dir}` using the provided virtual offset.")
+st.caption(f"Display and search detected files from Volatility3's file scan. Extract specific files to `{data_extraction_dir}` using the provided virtual offset, or select several rows of the table to extract them in one pass.")
 
-# If the file scan JSON does not exist, run the file analysis first
+# The file scan runs in the background, it is started here if the memory dump was not analyzed yet
+memory_file = find_memory_files()
+if memory_file is None:
+    st.warning("No memory dump found. Upload one on the Data Input page.")
+    st.stop()
+scan = start_background_filescan(memory_file)
+if scan["status"] == "failed":
+    st.error(scan["message"])
+    if st.button("Retry File Scan", use_container_width=True):
+        start_background_filescan(memory_file, retry=True)
+        st.rerun()
 if not os.path.isfile(FILE_PATH):
-    memory_file = find_memory_files()
-    filescan_data = run_file_search_analysis(memory_file)
+    if scan["status"] == "running":
+        st.info(f"`windows.filescan` is running in the background for {time.time() - scan['started_at']:.0f} s. The files found are shown as soon as the first rows arrive.")
+        time.sleep(2)
+        st.rerun()
+    st.stop()
 
-# Load the file scan JSON output
+# Load the finished file scan from its columnar file, a running scan incrementally across reruns
 try:
-    with open(FILE_PATH, 'r', encoding='utf-16') as file:
-        data = json.load(file)
-except (UnicodeError, json.JSONDecodeError):
-    try:
-        with open(FILE_PATH, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-    except Exception as e:
-        st.error(f"Error reading {FILE_PATH}: {e}")
-        st.stop()
+    data = load_frame(FILE_PATH)
+    if data is None:
+        # The rows read so far only belong to this scan of this dump, another dump or a new scan starts over
+        reader_key = (fast_fingerprint(memory_file), FILE_PATH, scan["started_at"])
+        if st.session_state.get("filescan_reader_key") != reader_key:
+            st.session_state["filescan_reader"] = IncrementalReader(FILE_PATH)
+            st.session_state["filescan_reader_key"] = reader_key
+        data = st.session_state["filescan_reader"].read()
+except Exception as e:
+    st.error(f"Error reading {FILE_PATH}: {e}")
+    st.stop()
+
+# Progress of a running scan, the rows found so far are shown below
+if scan["status"] == "running":
+    st.info(f"`windows.filescan` is running in the background for {time.time() - scan['started_at']:.0f} s, {len(data)} files found so far.")
 
 # General search input for filtering results
+shown_df = selection = None
 general_search_term = st.text_input("Enter search term to filter all data:")
 
 try:
-    if isinstance(data, list):  # If JSON is an array of objects
+    if isinstance(data, pd.DataFrame):
+        df = data
+    elif isinstance(data, list):  # If JSON is an array of objects
         df = pd.DataFrame(data)
     elif isinstance(data, dict):  # If JSON is a dictionary
         df = pd.DataFrame([data])
@@ -59,18 +89,18 @@ try:
     df = df[reordered_columns]
 
     # Apply general search across all columns
+    matches = None
     if general_search_term:
-        filtered_df = df[
-            df.apply(
-                lambda row: row.astype(str).str.contains(general_search_term, case=False, na=False).any(),
-                axis=1
-            )
-        ]
+        # A finished scan is searched in its index, a running one column by column
+        matches = search_rows(FILE_PATH, general_search_term) if isinstance(data, pd.DataFrame) else None
+        if matches is None:
+            matches = search_matches(df, general_search_term)
         st.write(f"### Results for '{general_search_term}' in {FILE_PATH}:")
-        st.dataframe(filtered_df)
     else:
         st.write(f"### Data from {FILE_PATH}")
-        st.dataframe(df)
+
+    # Only the shown page is sent to the browser, rows selected on it are extracted together
+    shown_df, selection = paged_dataframe(df, "filescan_table", matches, selectable=True)
 
 except Exception as e:
     st.error(f"Error processing {FILE_PATH}: {e}")
@@ -83,4 +113,58 @@ if st.button("Extract File", use_container_width=True):
     with st.spinner("Extracting File..."):
         memory_file = find_memory_files()
         extracted_file = run_file_extraction(memory_file, offset)
+        update_index()
         st.success("Data extracted.")
+
+# Extract the files of all selected rows in one pass
+selected_offsets = []
+if selection is not None and "Offset" in shown_df.columns:
+    selected_offsets = [int(offset) for offset in shown_df.iloc[selection.selection.rows]["Offset"].dropna()]
+if st.button(f"Extract {len(selected_offsets)} Selected Files", use_container_width=True, disabled=not selected_offsets):
+    progress_bar = st.progress(0.0)
+    reports = []
+
+    def show_extraction(report):
+        """
+        Updates the progress whenever the files of an offset are extracted.
+        """
+        reports.append(report)
+        progress_bar.progress(len(reports) / len(selected_offsets), text=f"`{report['offset']}`: {report['message']}")
+
+    run_batch_extraction(memory_file, selected_offsets, result_callback=show_extraction)
+    st.session_state["extraction_reports"] = reports
+    with st.spinner("Hashing extracted files..."):
+        update_index()
+
+# Report of the last extraction of selected files
+if st.session_state.get("extraction_reports"):
+    reports = st.session_state["extraction_reports"]
+    failed = sum(1 for report in reports if report["status"] == "failed")
+    st.write(f"### Extraction Report: {len(reports) - failed} offsets extracted, {failed} failed")
+    st.dataframe(pd.DataFrame([
+        {"Offset": report["offset"], "Status": report["status"], "Files": ", ".join(report["files"]), "Message": report["message"]}
+        for report in reports
+    ]), use_container_width=True, hide_index=True)
+
+# Hashes of the extracted files, identical contents are stored once
+with st.expander("Extracted Files Index"):
+    if st.button("Index Extracted Files", use_container_width=True):
+        with st.spinner("Hashing extracted files..."):
+            st.success(f"{update_index()} new or changed files indexed.")
+    lookup = st.text_input("Look up by MD5, SHA-1, SHA-256, file name or original path:")
+    if lookup:
+        matches = find_by_hash(lookup) or find_by_path(lookup)
+        rows = [row for row in index_rows() if row["File"] in {match["name"] for match in matches}]
+    else:
+        rows = index_rows()
+    if rows:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    elif lookup:
+        st.info("No extracted file matches.")
+    else:
+        st.info("No extracted files indexed yet.")
+
+# Refresh the rows found so far while the scan is running
+if filescan_status(memory_file)["status"] == "running":
+    time.sleep(2)
+    st.rerun()
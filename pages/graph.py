@@ -1,9 +1,10 @@
-import json
 import os
 import platform
 import streamlit as st
 from streamlit_agraph import agraph, Config, Node, Edge
 
+from utils.process_graph import load_graph, neighbourhood
+
 # Detect operating system
 os_name = platform.system()
 
@@ -17,53 +18,55 @@ else:  # Linux/macOS
 st.title("Graph Generator")
 st.caption("Visualize PIDs in a graph, zoom in or out, and search for a specific PID.")
 
-def build_process_tree(data, highlight_pid=None):
+def build_process_tree(graph, shown, highlight_pid=None):
     """
-    Build nodes and edges for the process tree visualization.
+    Build nodes and edges for the shown part of the process tree, placed at their cached layout positions.
 
-    :param data: List of process dictionaries.
-    :param highlight_pid: PID to highlight in the graph.
+    :param graph: Graph dictionary, see process_graph.build_graph.
+    :param shown: Set of process keys (PID, CreateTime) to show.
+    :param highlight_pid: PID to highlight in the graph, all instances of a reused PID are highlighted.
     :return: Tuple (nodes, edges).
     """
-    process_map = {process['PID']: process for process in data}
     nodes = []
     edges = []
 
-    for process in data:
-        pid = process['PID']
-        ppid = process['PPID']
-        name = process['ImageFileName']
+    for key in shown:
+        pid = key[0]
+        process = graph["processes"][key]
+        name = process.get("ImageFileName")
+        x, y = graph["positions"][key]
 
         # Highlight specific node if it matches highlight_pid
         node_color = "#000000" if highlight_pid == pid else "#B3EBF2"  # Default and highlight colors
 
+        # Mark exited processes and processes with hidden children, a click on them shows their children
+        hidden = sum(1 for child in graph["children"].get(key, ()) if child not in shown)
+        label = f"{name} (PID: {pid})" + (" (exited)" if process.get("ExitTime") else "") + (f" [+{hidden}]" if hidden else "")
+
         # Add node for the process
-        nodes.append(Node(id=str(pid), label=f"{name} (PID: {pid})", color=node_color))
+        nodes.append(Node(id=graph["ids"][key], label=label, color=node_color, x=x, y=y))
 
-        # Add edge to the parent process if it exists
-        if ppid in process_map:
-            edges.append(Edge(source=str(ppid), target=str(pid)))
+        # Add edge to the parent process if it is shown
+        if graph["parents"].get(key) in shown:
+            edges.append(Edge(source=graph["ids"][graph["parents"][key]], target=graph["ids"][key]))
 
     return nodes, edges
 
-# Load JSON data
-try:
-    with open(file_path, 'r', encoding='utf-16') as file:
-        data = json.load(file)
-except (UnicodeError, json.JSONDecodeError):
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-    except Exception as e:
-        st.error(f"Error reading {file_path}: {e}")
-        st.stop()
-
-# Initialize session state for PID highlighting
+# Load the process hierarchy, built and laid out once per pslist output
+graph = load_graph(file_path)
+if graph is None:
+    st.error(f"Error reading {file_path}: no process data found.")
+    st.stop()
+
+# Initialize session state for PID highlighting and expanded processes (keyed on PID and CreateTime)
 if "highlight_pid" not in st.session_state:
     st.session_state["highlight_pid"] = None
+if "expanded_processes" not in st.session_state:
+    st.session_state["expanded_processes"] = []
 
 # User input for searching a specific PID
-search_pid = st.text_input("Enter PID to search and highlight (leave blank for full tree):")
+search_pid = st.text_input("Enter PID to search and highlight (leave blank for the top of the tree):")
+depth = st.slider("Levels of child processes:", min_value=1, max_value=10, value=2)
 
 # Update session state dynamically based on user input
 if search_pid.isdigit():
@@ -71,8 +74,19 @@ if search_pid.isdigit():
 else:
     st.session_state["highlight_pid"] = None
 
+if st.session_state["highlight_pid"] is not None and st.session_state["highlight_pid"] not in graph["instances"]:
+    st.warning(f"PID {search_pid} not found, showing the top of the tree.")
+
+if st.button("Collapse expanded processes"):
+    st.session_state["expanded_processes"] = []
+    st.session_state.pop("graph_clicked", None)  # A collapsed process can be expanded by the same click again
+
+# Only the neighbourhood of the searched PID is sent to the browser, not the whole hierarchy
+shown = neighbourhood(graph, st.session_state["highlight_pid"], depth, st.session_state["expanded_processes"])
+st.caption(f"Showing {len(shown)} of {len(graph['processes'])} processes. Click a process marked with [+n] to show its children.")
+
 # Generate nodes and edges for process tree visualization
-nodes, edges = build_process_tree(data, st.session_state["highlight_pid"])
+nodes, edges = build_process_tree(graph, shown, st.session_state["highlight_pid"])
 
 # Configure the graph visualization settings
 config = Config(
@@ -82,11 +96,17 @@ config = Config(
     nodeHighlightBehavior=True,
     collapsible=True,
     physics=False,
-    hierarchical=True,
-    direction="LR",
-    sortMethod="directed",
-    shakeTowards="Leaves",
+    hierarchical=False,  # Nodes are placed at the positions of the cached layout
 )
 
 # Display the interactive graph
-agraph(nodes=nodes, edges=edges, config=config)
+clicked = agraph(nodes=nodes, edges=edges, config=config)
+
+# Expand a newly clicked process, its children are shown on the next rerun. The graph keeps returning the last
+# click, so it is handled only once.
+if clicked and clicked != st.session_state.get("graph_clicked"):
+    st.session_state["graph_clicked"] = clicked
+    clicked_key = graph["keys"][int(clicked)] if clicked.isdigit() and int(clicked) < len(graph["keys"]) else None
+    if clicked_key is not None and clicked_key not in st.session_state["expanded_processes"]:
+        st.session_state["expanded_processes"].append(clicked_key)
+        st.rerun()
@@ -0,0 +1,60 @@
+import os
+import pandas as pd
+import streamlit as st
+
+from utils.artifact_loader import load_frame, load_rows
+from utils.paged_table import paged_dataframe
+from utils.search_index import update_index, search_all
+from utils.volatility_analysis import analyzed_volatility_output, data_extraction_output
+
+# Outputs of the analysis and the file scan are searched together
+output_dirs = [analyzed_volatility_output, data_extraction_output]
+
+# Streamlit page title and description
+st.title("Search")
+st.caption("Search all Volatility3 outputs at once. All terms have to match a row: `svchost` matches anywhere, `svc*` at the start of a word, `\"program files\"` as a phrase. Hits are grouped by plugin and PID.")
+
+# Index complete outputs that are new or changed, every output is indexed once
+progress_bar = st.progress(0.0)
+
+def show_progress(done, total, output_file):
+    """
+    Updates the progress while outputs are indexed.
+    """
+    progress_bar.progress(done / total, text=f"Indexed {os.path.basename(output_file)}")
+
+indexed = update_index(output_dirs, progress_callback=show_progress)
+progress_bar.empty()
+if not indexed:
+    st.info("No complete Volatility3 outputs to search yet. Run an analysis on the Data Input page.")
+    st.stop()
+
+query = st.text_input("Search term:")
+if not query:
+    st.stop()
+
+hits, counts = search_all(output_dirs, query)
+if not hits:
+    st.info(f"No rows match '{query}'.")
+    st.stop()
+
+df = pd.DataFrame(hits)
+df["PID"] = df["pid"].map(lambda pid: "-" if pd.isna(pid) else str(pid))
+st.write(f"### {sum(counts.values())} rows in {len(counts)} plugins match '{query}'")
+if sum(counts.values()) > len(hits):
+    st.caption("Only the first 1000 rows per plugin are shown.")
+
+# Overview of the hits by PID and plugin
+st.dataframe(
+    df.pivot_table(index="PID", columns="plugin", values="row", aggfunc="count", fill_value=0)
+    .sort_index(key=lambda pids: pd.to_numeric(pids, errors="coerce")),
+    use_container_width=True
+)
+
+# Matching rows per plugin, ordered by PID and paged on the server
+for plugin, plugin_hits in df.groupby("plugin", sort=False):
+    with st.expander(f"{plugin} ({counts[plugin]} rows)"):
+        output_file = plugin_hits["output_file"].iloc[0]
+        output_df = load_frame(output_file)
+        output_df = pd.DataFrame(load_rows(output_file)) if output_df is None else output_df
+        paged_dataframe(output_df, f"search-{plugin}", rows=plugin_hits.sort_values("pid", na_position="last")["row"].to_numpy())
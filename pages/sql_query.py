@@ -0,0 +1,50 @@
+import streamlit as st
+
+from utils.paged_table import paged_dataframe
+from utils.sql_engine import SAVED_QUERIES, describe_tables, reset_connection, run_query
+
+# Streamlit page title and description
+st.title("SQL Query")
+st.caption("Query all Volatility3 outputs with SQL. Every plugin output is a table named after the plugin without 'windows.', e.g. `pslist`, `netscan` or `malfind`, and can be joined with the others on PID.")
+
+# Register the outputs once, a query only runs against the tables
+try:
+    tables = describe_tables()
+except Exception as e:
+    st.error(f"Error registering the Volatility3 outputs: {e}")
+    st.stop()
+if not tables:
+    st.info("No Volatility3 outputs to query yet. Run an analysis on the Data Input page.")
+    st.stop()
+
+with st.expander(f"Tables ({len(tables)})"):
+    for name, columns in tables.items():
+        st.markdown(f"**{name}**: " + ", ".join(f"`{column}`" for column in columns))
+    if st.button("Reload tables"):
+        reset_connection()
+        st.rerun()
+
+# A saved query fills the query box, which stays editable
+saved_query = st.selectbox("Saved queries:", options=[None] + list(SAVED_QUERIES),
+                           format_func=lambda name: "Custom query" if name is None else name)
+if saved_query is not None and st.session_state.get("sql-saved-query") != saved_query:
+    st.session_state["sql-query"] = SAVED_QUERIES[saved_query].strip()
+st.session_state["sql-saved-query"] = saved_query
+
+query = st.text_area("SQL query:", key="sql-query", height=200, placeholder='SELECT "PID", "ImageFileName" FROM pslist')
+if not st.button("Run query", type="primary") and "sql-result" not in st.session_state:
+    st.stop()
+
+# The result is kept, so paging through it does not run the query again
+if st.session_state.get("sql-result", (None,))[0] != query:
+    try:
+        df, backend, duration = run_query(query)
+    except Exception as e:
+        st.error(f"Error running the query: {e}")
+        st.stop()
+    st.session_state["sql-result"] = (query, df, backend, duration)
+
+_, df, backend, duration = st.session_state["sql-result"]
+st.write(f"### {len(df)} rows")
+st.caption(f"Query ran in {duration * 1000:.0f} ms on {backend}.")
+paged_dataframe(df, "sql-table")
@@ -5,6 +5,7 @@ import streamlit as st
 # Import utility functions for file handling, tree selection, RAG building, and querying
 from utils.file_handler import handle_memory_upload
 from utils.select_tree import choose_basic_or_costume_tree
+from utils.artifact_loader import load_tree_data
 from utils.build_rag_from_books import build_standard_rag
 from utils.initialize_rag_chat import answer_query
 from config import llm_options
@@ -76,16 +77,15 @@ if api_key:
         if os.path.exists(vectorstore_dir):
             tree = choose_basic_or_costume_tree()
             if tree is not None:
-                with open(tree, 'r', encoding='utf-8') as file:
-                    # Read the entire contents of the file
-                    json_data = file.read()
-                    prompt = st.chat_input("Ask LLM about the analysis results or provide parameters:")
-                    if prompt:
-                        with st.spinner("Fetching response..."):
-                            formatted_prompt = f"{prompt} {json_data}"
-                            answer = answer_query(api_key, llm_option, embedding_option, "standard", formatted_prompt)
-                        st.write("**Context:**", answer["context"])
-                        st.write("**LLM says:**", answer["answer"])
+                # Compact encoding of the tree, cached until the tree changes
+                json_data = load_tree_data(tree)
+                prompt = st.chat_input("Ask LLM about the analysis results or provide parameters:")
+                if prompt:
+                    with st.spinner("Fetching response..."):
+                        formatted_prompt = f"{prompt} {json_data}"
+                        answer = answer_query(api_key, llm_option, embedding_option, "standard", formatted_prompt)
+                    st.write("**Context:**", answer["context"])
+                    st.write("**LLM says:**", answer["answer"])
         else:
             if pdf_files or malpedia_reference_name:
                 if st.button("Build RAG", use_container_width=True):
@@ -0,0 +1,54 @@
+import time
+import pandas as pd
+import streamlit as st
+
+from utils.run_manifest import load_manifests, plugin_rows, manifest_dir
+
+# Streamlit page title and description
+st.title("Run Telemetry")
+st.caption(f"Timing, memory and output size of every Volatility3 plugin run, read from the run manifests in `{manifest_dir}`. Compare runs to see which plugins dominate the analysis time on which memory dumps.")
+
+manifests = load_manifests()
+if not manifests:
+    st.info("No run manifests found yet. A manifest is written after every analysis on the Data Input page.")
+    st.stop()
+
+df = pd.DataFrame(plugin_rows(manifests))
+
+# Overview of all runs
+st.subheader("Runs")
+st.dataframe(pd.DataFrame([
+    {
+        "Run": manifest["run_id"],
+        "Memory Dump": manifest["dump"],
+        "Dump Size (GB)": round(manifest["dump_size"] / 1024 ** 3, 2),
+        "Engine": manifest.get("engine"),
+        "Workers": manifest.get("workers"),
+        "Started": time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest["started_at"])),
+        "Wall Time (s)": manifest["duration_s"],
+        "Plugins": len(manifest["plugins"]),
+        "Failed": sum(1 for result in manifest["plugins"] if result["status"] == "failed"),
+    }
+    for manifest in manifests
+]), use_container_width=True, hide_index=True)
+
+# Details of a single run
+st.subheader("Plugins of a Run")
+run_id = st.selectbox("Select a run:", options=[manifest["run_id"] for manifest in manifests])
+run_df = df[df["Run"] == run_id]
+st.bar_chart(run_df, x="Plugin", y=["Wall Time (s)", "CPU Time (s)"], stack=False)
+st.bar_chart(run_df, x="Plugin", y="Peak RSS (MB)")
+st.dataframe(run_df.drop(columns=["Run", "Memory Dump", "Dump Size (GB)", "Engine"]), use_container_width=True, hide_index=True)
+
+# Comparison across runs, cached results are left out as they do not reflect the cost of a plugin
+st.subheader("Across Runs")
+executed_df = df[df["Status"].isin(["done", "failed"])]
+if executed_df.empty:
+    st.info("All plugin results were loaded from the result cache.")
+else:
+    st.caption("Wall time of every executed plugin run by memory dump size.")
+    st.scatter_chart(executed_df, x="Dump Size (GB)", y="Wall Time (s)", color="Plugin")
+    st.caption("Mean cost per plugin over all runs.")
+    summary_df = executed_df.groupby("Plugin")[["Wall Time (s)", "CPU Time (s)", "Peak RSS (MB)", "Rows", "Output (MB)"]].mean().round(1)
+    st.bar_chart(summary_df, y="Wall Time (s)")
+    st.dataframe(summary_df.sort_values("Wall Time (s)", ascending=False), use_container_width=True)
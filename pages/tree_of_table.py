@@ -6,7 +6,8 @@ import streamlit as st
 
 # Import utility functions for Chat handling, and tree building
 from utils.chat_handler import handle_llm_chat
-from utils.tree_builder import build_hierarchical_tree, load_selected_files
+from utils.tree_builder import build_custom_tree
+from utils.artifact_loader import load_compression_stats
 from config import llm_options
 from utils.gemini_thinking import gemini_thinking, gemini_first_thinking
 
@@ -41,11 +42,26 @@ pid = right.number_input("Enter a specific Process ID if desired:", step=1)
 left, right = st.columns(2)
 if left.button("Build a custom Tree", use_container_width=True):
     with st.spinner("Building a specific Tree..."):
-        selected_filepaths = [os.path.join(volatility_output_dir, file) for file in selected_files]
-        selected_files = load_selected_files(selected_filepaths)
-        mode = "costume"
-        hierarchical_tree = build_hierarchical_tree(selected_files, mode, pid)
-        st.success("Custom tree built successfully!")
+        # Only plugins added, removed or changed since the last build are read and merged into the tree
+        hierarchical_tree, changes = build_custom_tree(volatility_output_dir, selected_files, pid)
+        if changes["rebuilt"]:
+            st.success("Custom tree built successfully!")
+        elif changes["added"] or changes["removed"] or changes["refreshed"]:
+            st.success("Custom tree updated successfully! " + " ".join(
+                f"{label}: {', '.join(changes[key])}." for key, label in
+                [("added", "Added"), ("removed", "Removed"), ("refreshed", "Refreshed")] if changes[key]))
+        else:
+            st.success("Custom tree is up to date.")
+
+# Size of the compact tree sent to the LLM compared to the human-readable tree
+if os.path.isfile(tree_file_path):
+    stats = load_compression_stats(tree_file_path)
+    if stats is None:
+        st.warning("The custom tree is no valid JSON after editing, the LLM receives it only whitespace-stripped.")
+    else:
+        st.caption(f"The LLM receives the compact tree: {stats['compact']['bytes']:,} bytes and about {stats['compact']['tokens']:,} tokens, "
+                   f"{1 - stats['compact']['tokens'] / max(1, stats['pretty']['tokens']):.0%} fewer tokens than the readable tree "
+                   f"and {1 - stats['compact']['tokens'] / max(1, stats['cleaned']['tokens']):.0%} fewer than the whitespace-stripped tree.")
 
 # Allow opening and modifying the generated tree file
 if os.path.isfile(tree_file_path):
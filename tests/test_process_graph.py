@@ -0,0 +1,47 @@
+from utils import process_graph
+from utils.process_graph import LEVEL_SPACING, ROW_SPACING, build_graph, compute_layout, neighbourhood
+
+def test_compute_layout_centers_parents_on_their_children():
+    children = {"root": ["a", "b"], "a": ["a1", "a2"]}
+    positions = compute_layout(["root", "other"], children)
+    assert positions["a1"] == (2 * LEVEL_SPACING, 0)
+    assert positions["a2"] == (2 * LEVEL_SPACING, ROW_SPACING)
+    assert positions["a"] == (LEVEL_SPACING, ROW_SPACING / 2)
+    assert positions["b"] == (LEVEL_SPACING, 2 * ROW_SPACING)
+    assert positions["root"] == (0, (ROW_SPACING / 2 + 2 * ROW_SPACING) / 2)
+    assert positions["other"] == (0, 3 * ROW_SPACING)
+
+def test_compute_layout_handles_deep_chains_and_cycles():
+    chain = {index: [index + 1] for index in range(20000)}
+    chain[20000] = [0]  # A cycle back to the root is not followed
+    positions = compute_layout([0], chain)
+    assert len(positions) == 20001
+    assert positions[20000] == (20000 * LEVEL_SPACING, 0)
+    assert positions[0] == (0, 0)
+
+def test_leaves_get_their_own_rows():
+    children = {root: [(root, leaf) for leaf in range(3)] for root in range(100)}
+    positions = compute_layout(list(range(100)), children)
+    rows = [y for key, (x, y) in positions.items() if x == LEVEL_SPACING]
+    assert sorted(rows) == [row * ROW_SPACING for row in range(300)]
+
+def rows():
+    return [
+        {"PID": 4, "PPID": 0, "ImageFileName": "System", "CreateTime": "2024-01-01T00:00:00", "ExitTime": None},
+        {"PID": 100, "PPID": 4, "ImageFileName": "smss.exe", "CreateTime": "2024-01-01T00:00:01", "ExitTime": None},
+        {"PID": 200, "PPID": 100, "ImageFileName": "csrss.exe", "CreateTime": "2024-01-01T00:00:02", "ExitTime": None},
+        {"PID": 300, "PPID": 200, "ImageFileName": "a.exe", "CreateTime": "2024-01-01T00:00:03", "ExitTime": None},
+        {"PID": 101, "PPID": 4, "ImageFileName": "b.exe", "CreateTime": "2024-01-01T00:00:04", "ExitTime": None},
+    ]
+
+def test_neighbourhood_of_a_pid(monkeypatch):
+    graph = build_graph(rows())
+    assert set(graph["positions"]) == set(graph["keys"])
+    key = graph["instances"][100][0]
+    shown = neighbourhood(graph, 100, depth=1)
+    assert {process[0] for process in shown} == {4, 100, 101, 200}
+
+    monkeypatch.setattr(process_graph, "FULL_GRAPH_NODES", 2)
+    assert {process[0] for process in neighbourhood(graph, depth=1)} == {4, 100, 101}
+    expanded = neighbourhood(graph, depth=1, expanded=[key, graph["instances"][200][0]])
+    assert {process[0] for process in expanded} == {4, 100, 101, 200, 300}
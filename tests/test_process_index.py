@@ -0,0 +1,62 @@
+import random
+
+from utils.process_index import ProcessIndex, time_order
+
+def process(pid, ppid, created, exited=None, name="process.exe"):
+    return {"PID": pid, "PPID": ppid, "ImageFileName": name, "CreateTime": created, "ExitTime": exited}
+
+ROWS = [
+    process(4, 0, "2024-01-01T00:00:00"),
+    process(500, 4, "2024-01-01T00:01:00", exited="2024-01-01T00:05:00", name="old.exe"),
+    process(600, 500, "2024-01-01T00:02:00"),
+    process(500, 4, "2024-01-01T00:10:00", name="new.exe"),
+    process(700, 500, "2024-01-01T00:11:00"),
+    process(800, 500, "2024-01-01T00:06:00"),  # Created after the first instance exited, before the second
+    process(900, 999, "2024-01-01T00:12:00"),  # Parent not in the list
+]
+
+def keys(index, pid):
+    return index.instances(pid)
+
+def test_reused_pids_are_kept_apart():
+    index = ProcessIndex(ROWS)
+    old, new = keys(index, 500)
+    assert (old[1], new[1]) == ("2024-01-01T00:01:00", "2024-01-01T00:10:00")
+    assert index.latest(500) == new
+    assert index.parents[keys(index, 600)[0]] == old
+    assert index.parents[keys(index, 700)[0]] == new
+    assert keys(index, 800)[0] not in index.parents
+    assert set(index.roots) == {keys(index, 4)[0], keys(index, 800)[0], keys(index, 900)[0]}
+
+def test_children_are_in_creation_order():
+    index = ProcessIndex(ROWS)
+    system = keys(index, 4)[0]
+    assert index.children[system] == keys(index, 500)
+
+def test_order_of_the_records_does_not_matter():
+    expected = ProcessIndex(ROWS)
+    for seed in range(5):
+        rows = list(ROWS)
+        random.Random(seed).shuffle(rows)
+        index = ProcessIndex(rows)
+        assert index.parents == expected.parents
+        assert dict(index.children) == dict(expected.children)
+        assert dict(index.by_pid) == dict(expected.by_pid)
+        assert set(index.roots) == set(expected.roots)
+
+def test_duplicate_records_are_kept_once():
+    index = ProcessIndex(ROWS + ROWS[:2])
+    assert len(index.records) == len(ROWS)
+
+def test_cycles_without_create_times_are_broken():
+    index = ProcessIndex([process(1, 2, None), process(2, 1, None), process(3, 3, None)])
+    assert index.roots
+    for key in index.records:
+        seen = set()
+        while key is not None:
+            assert key not in seen
+            seen.add(key)
+            key = index.parents.get(key)
+
+def test_time_order_sorts_missing_times_first():
+    assert sorted(["2024-01-02", None, "2024-01-01"], key=time_order) == [None, "2024-01-01", "2024-01-02"]
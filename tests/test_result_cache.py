@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from utils import fingerprint, result_cache
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """
+    Points the result cache and the case settings to a temporary directory.
+    """
+    monkeypatch.setattr(result_cache, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(result_cache, "index_file", str(tmp_path / "cache" / "index.json"))
+    monkeypatch.setattr(result_cache, "objects_dir", str(tmp_path / "cache" / "objects"))
+    monkeypatch.setattr(fingerprint, "settings_file", str(tmp_path / "settings.json"))
+    return tmp_path
+
+def write(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+def test_cache_key_depends_on_all_parts():
+    key = result_cache.cache_key("abc", "windows.pslist", None, "2.8.0")
+    assert key == result_cache.cache_key("abc", "windows.pslist", {}, "2.8.0")
+    assert key != result_cache.cache_key("abd", "windows.pslist", None, "2.8.0")
+    assert key != result_cache.cache_key("abc", "windows.pslist", {"pid": [4]}, "2.8.0")
+    assert key != result_cache.cache_key("abc", "windows.pslist", None, "2.7.0")
+
+def test_store_and_lookup(cache):
+    dump = write(cache / "memory.raw", b"dump" * 1000)
+    output = write(cache / "windows.pslist.json", b'{"PID": 4}\n')
+    result_cache.store_result(dump, "windows.pslist", None, "2.8.0", output)
+    result_cache.wait_for_pending_stores()
+
+    target = str(cache / "restored.json")
+    assert result_cache.has_result(dump, "windows.pslist", None, "2.8.0")
+    assert result_cache.lookup_result(dump, "windows.pslist", None, "2.8.0", target) == [target]
+    assert open(target, "rb").read() == b'{"PID": 4}\n'
+    assert result_cache.lookup_result(dump, "windows.pslist", {"pid": [4]}, "2.8.0", target) is None
+
+def test_has_result_restores_nothing(cache):
+    dump = write(cache / "memory.raw", b"dump" * 1000)
+    output = write(cache / "windows.pslist.json", b"[]")
+    result_cache.store_result(dump, "windows.pslist", None, "2.8.0", output)
+    result_cache.wait_for_pending_stores()
+
+    assert result_cache.has_result(dump, "windows.pslist", None, "2.8.0")
+    assert not (cache / "elsewhere.json").exists()
+    assert result_cache.list_cache_entries()[0]["hits"] == 0
+
+def test_same_fast_fingerprint_different_dump_misses(cache, monkeypatch):
+    # Two snapshots whose sampled pages are identical only differ in their full hash
+    monkeypatch.setattr(result_cache, "fast_fingerprint", lambda memory_file: "same-samples")
+    first = write(cache / "first.raw", b"snapshot one" * 100)
+    second = write(cache / "second.raw", b"snapshot two" * 100)
+    output = write(cache / "windows.pslist.json", b"[]")
+    result_cache.store_result(first, "windows.pslist", None, "2.8.0", output)
+    result_cache.wait_for_pending_stores()
+
+    assert result_cache.has_result(first, "windows.pslist", None, "2.8.0")
+    assert not result_cache.has_result(second, "windows.pslist", None, "2.8.0")
+    assert result_cache.lookup_result(second, "windows.pslist", None, "2.8.0", str(cache / "out.json")) is None
+
+def test_removed_objects_are_forgotten(cache):
+    dump = write(cache / "memory.raw", b"dump" * 1000)
+    output = write(cache / "windows.pslist.json", b"[]")
+    result_cache.store_result(dump, "windows.pslist", None, "2.8.0", output)
+    result_cache.wait_for_pending_stores()
+    result_cache.purge_cache(plugin="windows.pslist")
+
+    assert result_cache.lookup_result(dump, "windows.pslist", None, "2.8.0", str(cache / "out.json")) is None
+    assert result_cache.cache_size() == 0
+
+def test_store_does_not_wait_for_the_full_hash(cache, monkeypatch):
+    hashed = threading.Event()
+    real_full_fingerprint = fingerprint.full_fingerprint
+    monkeypatch.setattr(fingerprint, "full_fingerprint", lambda memory_file: hashed.wait() and real_full_fingerprint(memory_file))
+    dump = write(cache / "memory.raw", b"slow dump" * 1000)
+    output = write(cache / "windows.pslist.json", b"[]")
+    result_cache.store_result(dump, "windows.pslist", None, "2.8.0", output)
+
+    # Lookups miss instead of waiting while the dump is hashed, the output can change meanwhile
+    assert not result_cache.has_result(dump, "windows.pslist", None, "2.8.0")
+    write(cache / "windows.pslist.json", b"changed")
+    hashed.set()
+    result_cache.wait_for_pending_stores()
+    assert result_cache.lookup_result(dump, "windows.pslist", None, "2.8.0", str(cache / "out.json")) is not None
+    assert (cache / "out.json").read_bytes() == b"[]"
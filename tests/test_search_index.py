@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from utils import artifact_store, search_index
+from utils.output_provenance import record_outputs
+
+ROWS = [
+    {"PID": 4, "ImageFileName": "System", "Args": None},
+    {"PID": 612, "ImageFileName": "svchost.exe", "Args": "C:\\Windows\\system32\\svchost.exe -k netsvcs"},
+    {"PID": 700, "ImageFileName": "notsvchost.exe", "Args": "C:\\Program Files\\Tool\\notsvchost.exe"},
+    {"PID": 812, "ImageFileName": "explorer.exe", "Args": "C:\\Windows\\Explorer.EXE", "__children": [{"Path": "svc.dll"}]},
+]
+
+@pytest.fixture
+def output_file(tmp_path):
+    """
+    Writes a complete pslist output of a memory dump into a temporary output directory.
+    """
+    dump = tmp_path / "memory.raw"
+    dump.write_bytes(b"dump" * 1000)
+    output_dir = tmp_path / "02_volatility_output"
+    output_dir.mkdir()
+    path = output_dir / "windows.pslist.json"
+    path.write_text("\n".join(json.dumps(row) for row in ROWS) + "\n", encoding="utf-8")
+    record_outputs(str(dump), str(output_dir), ["windows.pslist"], "2.8.0")
+    return str(path)
+
+def test_parse_query():
+    assert search_index.parse_query('svc* "Program Files" EXE *') == [("svc", True), ("program files", False),
+                                                                       ("exe", False), ("*", False)]
+
+@pytest.mark.parametrize("query, rows", [
+    ("svchost", [1, 2]),
+    ("svchost* netsvcs", [1]),
+    ("svc*", [1, 3]),
+    ('"program files"', [2]),
+    ("explorer.exe", [3]),
+    ("12", [1, 3]),
+    ("missing", []),
+])
+def test_search_rows(output_file, query, rows):
+    assert search_index.search_rows(output_file, query) == rows
+
+def test_postings_are_stored_as_array(output_file):
+    partition = search_index.load_partition(output_file)
+    assert partition["dtype"] == "uint16"
+    with open(partition["path"], "rb") as f:
+        assert search_index.read_postings(partition, f, "svc").tolist() == [1, 2, 3]
+        assert search_index.read_postings(partition, f, "zzz").tolist() == []
+
+def test_rows_are_verified_on_the_output(output_file, monkeypatch):
+    # One row per row group, so only the groups of the candidates are read
+    monkeypatch.setattr(artifact_store, "BATCH_SIZE", 1)
+    partition = search_index.load_partition(output_file)
+    assert partition["rows"] == len(ROWS) and "docs" not in partition
+    with open(partition["path"], "rb") as f:
+        assert b"netsvcs" not in f.read()
+    assert search_index.search_rows(output_file, "svchost* netsvcs") == [1]
+    assert artifact_store.take_rows(output_file, [1, 3], ["PID"]) == [{"PID": 612}, {"PID": 812}]
+
+def test_search_all_skips_unindexed_outputs(output_file, tmp_path):
+    output_dir = str(tmp_path / "02_volatility_output")
+    assert search_index.search_all([output_dir], "svchost") == ([], {})
+    assert search_index.update_index([output_dir]) == 1
+    hits, counts = search_index.search_all([output_dir], "svchost")
+    assert counts == {"windows.pslist": 2}
+    assert [(hit["pid"], hit["row"]) for hit in hits] == [(612, 1), (700, 2)]
+
+def test_changed_output_is_indexed_again(output_file):
+    assert search_index.search_rows(output_file, "svchost") == [1, 2]
+    with open(output_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"PID": 900, "ImageFileName": "svchost.exe"}) + "\n")
+    assert search_index.search_rows(output_file, "svchost") is None
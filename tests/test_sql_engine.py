@@ -0,0 +1,35 @@
+import os
+import json
+
+import pytest
+
+from utils import sql_engine
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """
+    Writes a pslist output and drops the shared connection before and after the test.
+    """
+    sql_engine.reset_connection()
+    (tmp_path / "windows.pslist.json").write_text(json.dumps([{"PID": 4, "PPID": 0}, {"PID": 8, "PPID": 4}]))
+    yield str(tmp_path)
+    sql_engine.reset_connection()
+
+def test_run_query(output_dir):
+    df, backend, _ = sql_engine.run_query('SELECT "PID" FROM pslist WHERE "PPID" = 4', [output_dir])
+    assert df["PID"].tolist() == [8]
+    assert sql_engine.describe_tables([output_dir]) == {"pslist": ["PID", "PPID"]}
+
+def test_unchanged_outputs_keep_the_connection(output_dir):
+    assert sql_engine.connect([output_dir]) == sql_engine.connect([output_dir])
+
+def test_changed_output_does_not_close_a_connection_in_use(output_dir):
+    output_file = os.path.join(output_dir, "windows.pslist.json")
+    with sql_engine.use_connection([output_dir]) as (_, connection):
+        with open(output_file, "w") as f:
+            json.dump([{"PID": 4, "PPID": 0}], f)
+        os.utime(output_file, ns=(1, 1))
+        assert len(sql_engine.run_query("SELECT * FROM pslist", [output_dir])[0]) == 1
+        assert connection.execute("SELECT COUNT(*) FROM pslist").fetchall() == [(2,)]
+    with pytest.raises(Exception):
+        connection.execute("SELECT 1")
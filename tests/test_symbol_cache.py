@@ -0,0 +1,39 @@
+import os
+import json
+
+import pytest
+
+from utils import symbol_cache
+
+GUID = "3844DBB920174967BE7AA4A2C20430FA"
+
+@pytest.fixture
+def symbols(tmp_path, monkeypatch):
+    """
+    Points the symbol cache to a temporary directory holding one kernel symbol table.
+    """
+    monkeypatch.setattr(symbol_cache, "symbol_dir", str(tmp_path / "symbols"))
+    monkeypatch.setattr(symbol_cache, "volatility_cache_dir", str(tmp_path / "volatility_cache"))
+    monkeypatch.setattr(symbol_cache, "index_file", str(tmp_path / "symbols" / "index.json"))
+    isf_file = tmp_path / "symbols" / "windows" / "ntkrnlmp.pdb" / f"{GUID}-1.json.xz"
+    isf_file.parent.mkdir(parents=True)
+    isf_file.write_bytes(b"isf")
+    dump = tmp_path / "memory.raw"
+    dump.write_bytes(b"dump" * 1000)
+    return str(dump), isf_file
+
+def test_saved_config_records_the_kernel_symbols(symbols):
+    dump, isf_file = symbols
+    config_file = symbol_cache.saved_config_file(dump)
+    with open(config_file, "w", encoding="utf-8") as f:
+        json.dump({"plugins.PsList.kernel.symbol_table_name.isf_url": isf_file.as_uri()}, f)
+
+    symbol_cache.record_saved_config(dump, config_file)
+    assert not os.path.exists(config_file)
+    assert "--offline" in symbol_cache.symbol_flags(dump, offline=False)
+    assert symbol_cache.saved_config_file(dump) is None
+
+def test_listing_does_not_scan_the_symbol_directory(symbols):
+    assert symbol_cache.list_symbols() == []
+    symbol_cache.rebuild_index()
+    assert [entry["key"] for entry in symbol_cache.list_symbols()] == [f"ntkrnlmp.pdb/{GUID}-1"]
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from utils import table_query
+
+def frame():
+    return pd.DataFrame({
+        "PID": [4, 612, 700, 812, 900],
+        "ImageFileName": ["System", "svchost.exe", "SVCHOST.EXE", "explorer.exe", None],
+        "Mixed": [1, "a", 2.5, None, "b"],
+    })
+
+def test_search_matches_any_column_case_insensitive():
+    assert table_query.search_matches(frame(), "svchost").tolist() == [1, 2]
+    assert table_query.search_matches(frame(), "12").tolist() == [1, 3]
+    assert table_query.search_matches(frame(), "missing").tolist() == []
+
+def test_filter_view_applies_rows_filter_and_sort():
+    df = frame()
+    view = table_query.filter_view(df, rows=[0, 1, 2, 3], column="ImageFileName", column_filter="EXE",
+                                   sort_by="PID", descending=True)
+    assert view["PID"].tolist() == [812, 700, 612]
+    assert table_query.filter_view(df) is df
+
+def test_filter_view_sorts_mixed_columns_as_text():
+    view = table_query.filter_view(frame(), sort_by="Mixed")
+    assert view["Mixed"].tolist()[:4] == [1, 2.5, "a", "b"]
+
+def test_page_of_clamps_the_page():
+    view = frame()
+    rows, page, pages = table_query.page_of(view, 2, 2)
+    assert (rows["PID"].tolist(), page, pages) == ([700, 812], 2, 3)
+    assert table_query.page_of(view, 9, 2)[1:] == (3, 3)
+    assert table_query.page_of(view, 0, 2)[0]["PID"].tolist() == [4, 612]
+    assert table_query.page_of(view.iloc[:0], 1, 2)[1:] == (1, 1)
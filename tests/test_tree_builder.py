@@ -0,0 +1,91 @@
+import os
+import json
+import random
+
+import pytest
+
+from utils.tree_builder import build_custom_tree, build_hierarchical_tree, load_selected_files, update_tree
+
+def plugin_outputs(count, seed=1):
+    """
+    Generates pslist, cmdline, netscan and dlllist outputs, some netscan records without a process.
+    """
+    rng = random.Random(seed)
+    processes = [{"PID": 4, "PPID": 0, "ImageFileName": "System", "CreateTime": "2024-05-01T08:00:00+00:00", "ExitTime": None}]
+    for i in range(1, count):
+        processes.append({"PID": 4 + 4 * i, "PPID": rng.choice(processes)["PID"], "ImageFileName": f"p{i}.exe",
+                          "CreateTime": f"2024-05-01T{8 + i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+                          "ExitTime": None})
+    pids = [process["PID"] for process in processes]
+    return {
+        "windows.pslist.json": processes,
+        "windows.cmdline.json": [{"PID": pid, "Args": f"p{pid}.exe -k"} for pid in pids],
+        "windows.netscan.json": netscan(pids, rng),
+        "windows.dlllist.json": [{"PID": pid, "LoadTime": None, "Path": f"C:\\{pid}.dll"} for pid in pids[::3]],
+    }
+
+def netscan(pids, rng):
+    return [{"PID": pid, "Owner": "svchost.exe", "Proto": "TCPv4", "LocalAddr": "10.0.0.5", "LocalPort": rng.randint(1, 65535),
+             "ForeignAddr": "52.1.2.3", "ForeignPort": 443, "State": "ESTABLISHED"}
+            for pid in rng.sample(pids, len(pids) // 4) + [99999, 99998]]
+
+def write_output(output_dir, filename, rows):
+    path = os.path.join(output_dir, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f)
+    # Two writes within the resolution of the file system must still look different
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 10 ** 9,) * 2)
+
+def normalized(root):
+    """
+    Brings a tree into a comparable form, the file nodes of an incremental build may be in another order.
+    """
+    root = json.loads(json.dumps(root))
+    root["children"].sort(key=lambda node: node["name"])
+    return root
+
+def full_build(output_dir, filenames, pid=None, tree_dir=None):
+    files = load_selected_files([os.path.join(output_dir, filename) for filename in filenames])
+    return normalized(build_hierarchical_tree(files, "costume", pid, tree_dir=tree_dir))
+
+@pytest.fixture
+def dirs(tmp_path):
+    output_dir, tree_dir, full_dir = (str(tmp_path / name) for name in ("output", "trees", "full"))
+    os.makedirs(output_dir)
+    return output_dir, tree_dir, full_dir
+
+@pytest.mark.parametrize("count", [50, 3000])
+def test_custom_tree_changes_match_a_full_build(dirs, count):
+    output_dir, tree_dir, full_dir = dirs
+    outputs = plugin_outputs(count)
+    for filename, rows in outputs.items():
+        write_output(output_dir, filename, rows)
+
+    selection = ["windows.pslist.json", "windows.cmdline.json", "windows.netscan.json"]
+    root, changes = build_custom_tree(output_dir, selection, tree_dir=tree_dir)
+    assert changes["rebuilt"]
+
+    selection = ["windows.pslist.json", "windows.netscan.json", "windows.dlllist.json"]
+    root, changes = build_custom_tree(output_dir, selection, tree_dir=tree_dir)
+    assert (changes["added"], changes["removed"], changes["rebuilt"]) == (["windows.dlllist.json"], ["windows.cmdline.json"], False)
+    assert normalized(root) == full_build(output_dir, selection, tree_dir=full_dir)
+
+    write_output(output_dir, "windows.netscan.json", netscan([row["PID"] for row in outputs["windows.pslist.json"]], random.Random(2)))
+    root = update_tree(output_dir, ["windows.netscan", "windows.cmdline"], "costume", focus_pids=[4], tree_dir=tree_dir)
+    assert normalized(root) == full_build(output_dir, selection, tree_dir=full_dir)
+    assert any(node["name"] == "windows.netscan.json" for node in root["children"])
+
+    # The refreshed index lets the next custom build keep the tree
+    assert not build_custom_tree(output_dir, selection, tree_dir=tree_dir)[1]["refreshed"]
+
+def test_update_keeps_the_pid_filter_of_the_custom_tree(dirs):
+    output_dir, tree_dir, full_dir = dirs
+    outputs = plugin_outputs(50)
+    for filename, rows in outputs.items():
+        write_output(output_dir, filename, rows)
+
+    selection = ["windows.pslist.json", "windows.cmdline.json"]
+    build_custom_tree(output_dir, selection, pid=8, tree_dir=tree_dir)
+    write_output(output_dir, "windows.cmdline.json", [{"PID": row["PID"], "Args": "changed"} for row in outputs["windows.pslist.json"]])
+    root = update_tree(output_dir, ["windows.cmdline"], "costume", tree_dir=tree_dir)
+    assert normalized(root) == full_build(output_dir, selection, pid=8, tree_dir=full_dir)
@@ -0,0 +1,86 @@
+import os
+import json
+import random
+
+import pytest
+
+from utils.artifact_loader import load_compression_stats
+from utils.tree_builder import build_hierarchical_tree
+from utils.tree_codec import compression_stats, decode_tree, encode_tree, split_compact
+
+NAMES = ["svchost.exe", "explorer.exe", "chrome.exe", "RuntimeBroker.exe", "conhost.exe", "powershell.exe"]
+
+def plugin_outputs(count=200, seed=1):
+    """
+    Generates the outputs of a process list and five plugins, some records without a process.
+    """
+    rng = random.Random(seed)
+    processes = [{"PID": 4, "PPID": 0, "ImageFileName": "System", "CreateTime": "2024-05-01T08:00:00+00:00", "ExitTime": None}]
+    for i in range(1, count):
+        parent = rng.choice(processes)
+        processes.append({"PID": 4 + 4 * i, "PPID": parent["PID"], "ImageFileName": rng.choice(NAMES),
+                          "CreateTime": f"2024-05-01T08:{i // 60:02d}:{i % 60:02d}+00:00",
+                          "ExitTime": None if rng.random() < 0.8 else "2024-05-01T09:00:00+00:00"})
+    pids = [process["PID"] for process in processes]
+    return {
+        "windows.psscan.json": processes,
+        "windows.cmdline.json": [{"PID": pid, "Args": f"C:\\Windows\\System32\\{rng.choice(NAMES)} -k netsvcs"} for pid in pids],
+        "windows.getsids.json": [{"PID": pid, "SID": sid} for pid in pids for sid in ["S-1-5-18", "S-1-16-16384"]],
+        "windows.netscan.json": [{"PID": rng.choice(pids + [99999]), "Owner": "svchost.exe", "Proto": "TCPv4",
+                                  "LocalAddr": "10.0.0.5", "LocalPort": rng.randint(1, 65535), "ForeignAddr": "52.1.2.3",
+                                  "ForeignPort": 443, "State": "ESTABLISHED"} for _ in range(150)],
+        "windows.dlllist.json": [{"PID": pid, "Path": "C:\\Windows\\System32\\ntdll.dll"} for pid in pids],
+        "windows.malfind.json": [{"PID": pid, "Protection": "PAGE_EXECUTE_READWRITE", "Hexdump": "4d 5a 90 00",
+                                  "Notes": None} for pid in rng.sample(pids, 10)],
+    }
+
+@pytest.fixture
+def costume_tree(tmp_path):
+    root = build_hierarchical_tree(plugin_outputs(), "costume", tree_dir=str(tmp_path))
+    return root, os.path.join(str(tmp_path), "costume_system_analysis_tree.json")
+
+def test_round_trip(costume_tree):
+    root, _ = costume_tree
+    assert decode_tree(encode_tree(root)) == json.loads(json.dumps(root))
+
+def test_error_messages_and_empty_values_are_dropped():
+    root = {"name": "System Analysis", "children": [{"name": "Processes", "children": [
+        {"name": "a.exe", "pid": 8, "ppid": 4, "create_time": None, "children": [],
+         "malfind": {"Protection": "PAGE_READWRITE", "Notes": None},
+         "Args": ["Required memory at 0x7ffe0000 is not valid (process exited?)"]},
+    ]}]}
+    decoded = decode_tree(encode_tree(root))
+    node = decoded["children"][0]["children"][0]
+    assert node["malfind"] == {"Protection": "PAGE_READWRITE"}
+    assert node["Args"] == [""]
+
+def test_split_parts_decode_on_their_own(costume_tree):
+    root, _ = costume_tree
+    text = encode_tree(root)
+    parts = split_compact(text, 4)
+    assert len(parts) == 4
+    header, *rows = text.splitlines()
+    part_rows = []
+    for part in parts:
+        assert part.splitlines()[0] == header
+        decode_tree(part)
+        part_rows += [line for line in part.splitlines()[1:] if not line.startswith('"')]
+    assert part_rows == [line for line in rows if not line.startswith('"')]
+    with pytest.raises(ValueError):
+        split_compact(text, 0)
+
+def test_compact_tree_saves_tokens(costume_tree):
+    _, tree = costume_tree
+    stats = compression_stats(tree)
+    assert os.path.isfile(tree.replace(".json", ".compact.json"))
+    assert stats["compact"]["bytes"] < 0.8 * stats["cleaned"]["bytes"]
+    assert stats["compact"]["tokens"] < 0.9 * stats["cleaned"]["tokens"]
+    assert stats["cleaned"]["tokens"] < stats["pretty"]["tokens"]
+
+def test_stats_of_an_edited_tree(costume_tree):
+    _, tree = costume_tree
+    assert load_compression_stats(tree) is load_compression_stats(tree)
+    with open(tree, "a", encoding="utf-8") as f:
+        f.write(",")
+    assert compression_stats(tree) is None
+    assert load_compression_stats(tree) is None
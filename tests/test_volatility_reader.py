@@ -0,0 +1,51 @@
+import json
+
+from utils import volatility_reader
+
+ROWS = [{"PID": 4, "ImageFileName": "System", "__children": []},
+        {"PID": 2 ** 64 - 1, "ImageFileName": "größe.exe", "__children": [{"PID": 8}]}]
+
+def write(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+def test_json_document_in_utf8_and_utf16(tmp_path):
+    document = json.dumps(ROWS, indent=2, ensure_ascii=False)
+    for encoding in ("utf-8", "utf-16", "utf-16-le"):
+        path = write(tmp_path / f"{encoding}.json", document.encode(encoding))
+        assert not volatility_reader.is_json_lines(path)
+        assert volatility_reader.load_volatility_output(path) == ROWS
+        assert list(volatility_reader.iter_volatility_output(path)) == ROWS
+        assert volatility_reader.count_rows(path) == 2
+
+def test_json_array_is_streamed_across_chunks(tmp_path):
+    path = write(tmp_path / "rows.json", json.dumps(ROWS * 50).encode())
+    assert list(volatility_reader.iter_json_array(path, chunk_size=7)) == ROWS * 50
+
+def test_cut_off_json_document_keeps_complete_rows(tmp_path):
+    text = json.dumps(ROWS)
+    path = write(tmp_path / "cut.json", text[:text.index('{"PID": 18')].encode())
+    assert list(volatility_reader.iter_volatility_output(path)) == ROWS[:1]
+
+def test_json_lines_skip_damaged_and_incomplete_lines(tmp_path):
+    lines = [json.dumps(row) for row in ROWS]
+    path = write(tmp_path / "rows.json", ("\n".join([lines[0], "{damaged", lines[1]]) + '\n{"PID": 1').encode())
+    assert volatility_reader.is_json_lines(path)
+    assert volatility_reader.load_volatility_output(path) == ROWS
+    assert volatility_reader.count_rows(path) == 3
+
+def test_read_json_lines_resumes_at_offset(tmp_path):
+    path = tmp_path / "rows.json"
+    path.write_bytes((json.dumps(ROWS[0]) + "\n" + '{"PID"').encode())
+    records, offset = volatility_reader.read_json_lines(str(path))
+    assert records == ROWS[:1]
+
+    with open(path, "ab") as file:
+        file.write(f': {ROWS[1]["PID"]}}}\n'.encode())
+    records, offset = volatility_reader.read_json_lines(str(path), offset)
+    assert records == [{"PID": ROWS[1]["PID"]}]
+    assert offset == path.stat().st_size
+
+def test_missing_file_yields_nothing(tmp_path):
+    assert list(volatility_reader.iter_volatility_output(str(tmp_path / "missing.json"))) == []
+    assert volatility_reader.load_volatility_output(str(tmp_path / "missing.json")) == []
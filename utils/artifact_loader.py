@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import threading
+from itertools import islice
+from collections import OrderedDict
+
+import pandas as pd
+
+from config import artifact_cache_max_mb
+from utils import artifact_store
+from utils.tree_codec import clean_tree_data, compact_tree_path, compression_stats, encode_tree
+
+# Loaded artifacts by (kind, path, options), least recently used first, shared by all reruns and sessions
+_cache = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+
+def estimate_size(value):
+    """
+    Estimates the memory held by a loaded artifact, lists and dictionaries from a sample of their items.
+
+    :param value: DataFrame, list of rows, dictionary or text.
+    :return: Estimated size in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict) and value:
+        sample = list(islice(value.items(), 100))
+        sample_size = sum(sys.getsizeof(key) + estimate_size(item) for key, item in sample)
+        return sys.getsizeof(value) + sample_size * len(value) // len(sample)
+    if isinstance(value, list) and value:
+        sample = value[:100]
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in sample) * len(value) // len(sample)
+    return sys.getsizeof(value)
+
+def cached(kind, path, options, loader):
+    """
+    Returns an artifact from the cache if its file is unchanged, otherwise loads and caches it.
+    Results of None are not cached.
+
+    :param kind: Kind of the artifact, e.g. 'rows' or 'frame'.
+    :param path: Path of the file the artifact is loaded from.
+    :param options: Hashable loader options, e.g. the columns.
+    :param loader: Function loading the artifact.
+    :return: Loaded artifact, shared by all callers and not to be modified.
+    """
+    global _cache_bytes
+    key = (kind, os.path.normpath(path), options)
+    try:
+        stat = os.stat(path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+    except FileNotFoundError:
+        stamp = None
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry["stamp"] == stamp:
+            _cache.move_to_end(key)
+            return entry["value"]
+
+    value = loader()
+    if value is None or stamp is None:
+        return value
+
+    size = estimate_size(value)
+    with _lock:
+        if key in _cache:
+            _cache_bytes -= _cache.pop(key)["size"]
+        if size <= artifact_cache_max_mb * 1024 * 1024:
+            _cache[key] = {"stamp": stamp, "value": value, "size": size}
+            _cache_bytes += size
+        while _cache_bytes > artifact_cache_max_mb * 1024 * 1024:
+            _cache_bytes -= _cache.popitem(last=False)[1]["size"]
+    return value
+
+def load_rows(output_file, columns=None):
+    """
+    Loads the rows of a Volatility3 output file through the cache, see artifact_store.load_rows.
+
+    :param output_file: Path of the JSON output file.
+    :param columns: Optional list of columns, all columns by default.
+    :return: List of row dictionaries.
+    """
+    return cached("rows", output_file, tuple(columns) if columns else None,
+                  lambda: artifact_store.load_rows(output_file, columns))
+
+def load_frame(output_file, columns=None):
+    """
+    Loads a complete Volatility3 output file as a DataFrame through the cache, see artifact_store.load_frame.
+
+    :param output_file: Path of the JSON output file.
+    :param columns: Optional list of columns, all columns by default.
+    :return: DataFrame, or None if there is no up-to-date Parquet file.
+    """
+    return cached("frame", output_file, tuple(columns) if columns else None,
+                  lambda: artifact_store.load_frame(output_file, columns))
+
+def load_text(path):
+    """
+    Loads a UTF-8 text file such as a tree through the cache.
+
+    :param path: Path of the file.
+    :return: Content of the file.
+    """
+    def read():
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+    return cached("text", path, None, read)
+
+def load_tree_data(tree):
+    """
+    Loads the compact encoding of a tree for the LLM through the cache, encoding the tree if it is newer.
+    A tree that is no valid JSON after editing is only cleaned.
+
+    :param tree: Path of the tree.
+    :return: Compact tree data.
+    """
+    compact_path = compact_tree_path(tree)
+    if os.path.exists(compact_path) and os.path.getmtime(compact_path) >= os.path.getmtime(tree):
+        return load_text(compact_path)
+
+    def encode():
+        text = load_text(tree)
+        try:
+            return encode_tree(json.loads(text))
+        except (json.JSONDecodeError, AttributeError, TypeError):
+            return clean_tree_data(text)
+    return cached("tree", tree, None, encode)
+
+def load_compression_stats(tree):
+    """
+    Measures the compact encoding of a tree through the cache, so it is only measured again once the tree changed.
+
+    :param tree: Path of the tree.
+    :return: Dictionary of sizes, see tree_codec.compression_stats, or None if the tree is no valid JSON.
+    """
+    return cached("stats", tree, None, lambda: compression_stats(tree))
+
+def cache_info():
+    """
+    Returns the state of the artifact cache.
+
+    :return: Dictionary with the number of entries, the used and the maximum size in bytes.
+    """
+    with _lock:
+        return {"entries": len(_cache), "bytes": _cache_bytes, "max_bytes": artifact_cache_max_mb * 1024 * 1024}
+
+def clear_cache():
+    """
+    Empties the artifact cache, e.g. after the drive was renewed.
+    """
+    global _cache_bytes
+    with _lock:
+        _cache.clear()
+        _cache_bytes = 0
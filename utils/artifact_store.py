@@ -0,0 +1,298 @@
+import os
+import json
+import threading
+from bisect import bisect_left
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional, without pyarrow every consumer reads the JSON outputs
+    pa = pq = None
+
+from utils.output_provenance import load_provenance
+from utils.volatility_reader import load_volatility_output, RecordStream
+
+# Columns holding nested or mixed values are stored as JSON text and decoded when rows are loaded
+JSON_COLUMNS_KEY = b"json_columns"
+SOURCE_KEY = b"source"
+
+# Rows converted and streamed per batch
+BATCH_SIZE = 10000
+
+# Serializes conversions, a page rerun may load an output while the scheduler converts it
+_lock = threading.Lock()
+
+def columnar_dir(output_dir):
+    """
+    Returns the directory of the columnar files of an output directory. It is kept next to the directory, so pages
+    listing the Volatility3 outputs never see it, and it is removed together with the drive.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :return: Path of the columnar directory.
+    """
+    output_dir = os.path.normpath(output_dir)
+    return os.path.join(os.path.dirname(output_dir), f"{os.path.basename(output_dir)}_columnar")
+
+def columnar_file(output_file):
+    """
+    Returns the Parquet file of a Volatility3 output file.
+
+    :param output_file: Path of the JSON output file.
+    :return: Path of the Parquet file.
+    """
+    name = os.path.splitext(os.path.basename(output_file))[0]
+    return os.path.join(columnar_dir(os.path.dirname(output_file)), f"{name}.parquet")
+
+def source_stamp(output_file):
+    """
+    Returns size and modification time of an output file, stored with its Parquet file to recognize changes.
+    """
+    stat = os.stat(output_file)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def is_complete(output_file):
+    """
+    Checks whether an output file was recorded as complete and has not changed since, so a running or failed
+    plugin is never converted.
+
+    :param output_file: Path of the JSON output file.
+    :return: True if the output is complete.
+    """
+    plugin = os.path.splitext(os.path.basename(output_file))[0]
+    record = load_provenance(os.path.dirname(output_file)).get(plugin)
+    return record is not None and os.path.isfile(output_file) and \
+        source_stamp(output_file) == {"size": record["size"], "mtime_ns": record["mtime_ns"]}
+
+def column_type(types, minimum, maximum):
+    """
+    Determines the Arrow type of a column from the types of its values. Addresses above the signed 64-bit range
+    are common in kernel space, they get an unsigned column.
+
+    :param types: Set of the types of the non-null values of the column.
+    :param minimum: Smallest integer of the column.
+    :param maximum: Largest integer of the column.
+    :return: Tuple (Arrow type, whether the values are stored as JSON text).
+    """
+    if not types or types == {str}:
+        return pa.string(), False
+    if types == {bool}:
+        return pa.bool_(), False
+    if types == {int}:
+        if minimum >= 0 and maximum > 2 ** 63 - 1:
+            return (pa.uint64(), False) if maximum < 2 ** 64 else (pa.string(), True)
+        return (pa.int64(), False) if minimum >= -2 ** 63 and maximum < 2 ** 63 else (pa.string(), True)
+    if types <= {int, float}:
+        return pa.float64(), False
+    return pa.string(), True
+
+def infer_schema(rows, stamp):
+    """
+    Derives the explicit schema of a Volatility3 output in one pass over its rows, keeping only the value types
+    and integer range per column. The columns keep the order in which they first appear, nested rows
+    ('__children') and mixed values are stored as JSON text.
+
+    :param rows: Iterable of row dictionaries.
+    :param stamp: Size and modification time of the output file.
+    :return: Arrow schema.
+    """
+    columns = {}
+    for row in rows:
+        for column, value in row.items():
+            info = columns.setdefault(column, {"types": set(), "minimum": 0, "maximum": 0})
+            if value is None:
+                continue
+            info["types"].add(type(value))
+            if type(value) is int:
+                info["minimum"], info["maximum"] = min(info["minimum"], value), max(info["maximum"], value)
+
+    fields, json_columns = [], []
+    for column, info in columns.items():
+        arrow_type, as_json = column_type(info["types"], info["minimum"], info["maximum"])
+        fields.append(pa.field(column, arrow_type))
+        if as_json:
+            json_columns.append(column)
+    metadata = {JSON_COLUMNS_KEY: json.dumps(json_columns).encode(), SOURCE_KEY: json.dumps(stamp).encode()}
+    return pa.schema(fields, metadata=metadata)
+
+def rows_to_table(rows, schema):
+    """
+    Converts a batch of rows into an Arrow table of the given schema.
+
+    :param rows: List of row dictionaries.
+    :param schema: Arrow schema from infer_schema.
+    :return: Arrow table.
+    """
+    json_columns = json.loads(schema.metadata[JSON_COLUMNS_KEY])
+    arrays = []
+    for field in schema:
+        values = [row.get(field.name) for row in rows]
+        if field.name in json_columns:
+            values = [None if value is None else json.dumps(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def decode_json_columns(rows, json_columns):
+    """
+    Decodes the values stored as JSON text in rows read from a Parquet file.
+
+    :param rows: List of row dictionaries, changed in place.
+    :param json_columns: List of the JSON columns among the columns read.
+    :return: The rows.
+    """
+    for row in rows:
+        for column in json_columns:
+            if row[column] is not None:
+                row[column] = json.loads(row[column])
+    return rows
+
+def convert_output(output_file):
+    """
+    Converts a complete Volatility3 output file into its Parquet file, unless it is up to date.
+
+    :param output_file: Path of the JSON output file.
+    :return: Path of the Parquet file, or None if pyarrow is missing or the output is not complete.
+    """
+    if pq is None or not is_complete(output_file):
+        return None
+    target = columnar_file(output_file)
+    with _lock:
+        stamp = source_stamp(output_file)
+        if os.path.isfile(target) and read_metadata(target).get(SOURCE_KEY) == stamp:
+            return target
+        # Two streaming passes over the output, the first for the schema and the second for the batches
+        rows = RecordStream(output_file)
+        schema = infer_schema(rows, stamp)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with pq.ParquetWriter(f"{target}.tmp", schema) as writer:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == BATCH_SIZE:
+                    writer.write_table(rows_to_table(batch, schema))
+                    batch = []
+            writer.write_table(rows_to_table(batch, schema))
+        os.replace(f"{target}.tmp", target)
+    return target
+
+def convert_outputs(output_dir, plugins):
+    """
+    Converts the complete outputs of plugins into Parquet files, e.g. once an analysis has finished.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param plugins: List of plugins.
+    :return: List of Parquet files written or already up to date.
+    """
+    converted = [convert_output(os.path.join(output_dir, f"{plugin}.json")) for plugin in plugins]
+    return [path for path in converted if path]
+
+def read_metadata(path):
+    """
+    Reads the metadata of a Parquet file written by this module.
+
+    :param path: Path of the Parquet file.
+    :return: Dictionary with the JSON columns and the source stamp.
+    """
+    metadata = pq.read_schema(path).metadata or {}
+    return {key: json.loads(value) for key, value in metadata.items() if key in (JSON_COLUMNS_KEY, SOURCE_KEY)}
+
+def read_table(output_file, columns=None):
+    """
+    Reads the columns of an output from its Parquet file, converting a complete output on first use.
+
+    :param output_file: Path of the JSON output file.
+    :param columns: Optional list of columns, columns missing in the output are left out.
+    :return: Tuple (Arrow table, JSON columns), or None if there is no up-to-date Parquet file.
+    """
+    path = convert_output(output_file)
+    if path is None:
+        return None
+    metadata = read_metadata(path)
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [column for column in columns if column in available]
+    return pq.read_table(path, columns=columns), [column for column in metadata[JSON_COLUMNS_KEY] if columns is None or column in columns]
+
+def load_rows(output_file, columns=None):
+    """
+    Loads the rows of a Volatility3 output file, only with the given columns. Complete outputs are read from their
+    Parquet file, running or failed plugins and installations without pyarrow fall back to the JSON output.
+
+    :param output_file: Path of the JSON output file.
+    :param columns: Optional list of columns, all columns by default.
+    :return: List of row dictionaries.
+    """
+    result = read_table(output_file, columns)
+    if result is None:
+        rows = load_volatility_output(output_file)
+        if columns is None:
+            return rows
+        return [{column: row[column] for column in columns if column in row} for row in rows]
+
+    table, json_columns = result
+    return decode_json_columns(table.to_pylist(), json_columns)
+
+def load_frame(output_file, columns=None):
+    """
+    Loads a complete Volatility3 output file as a DataFrame straight from its Parquet file. Nested values stay
+    JSON text, which is how the tables show them anyway.
+
+    :param output_file: Path of the JSON output file.
+    :param columns: Optional list of columns, all columns by default.
+    :return: DataFrame, or None if there is no up-to-date Parquet file.
+    """
+    result = read_table(output_file, columns)
+    return None if result is None else result[0].to_pandas()
+
+def take_rows(output_file, rows, columns=None):
+    """
+    Loads only the given rows of a Volatility3 output file, e.g. the candidates of a search. Complete outputs read
+    just the row groups of their Parquet file holding one of the rows, all others stream the JSON output.
+
+    :param output_file: Path of the JSON output file.
+    :param rows: Sorted list of row numbers.
+    :param columns: Optional list of columns, all columns by default.
+    :return: List of row dictionaries in the order of the row numbers.
+    """
+    path = convert_output(output_file)
+    if path is None:
+        wanted, taken = set(rows), []
+        for number, row in enumerate(RecordStream(output_file, columns)):
+            if len(taken) == len(wanted):
+                break
+            if number in wanted:
+                taken.append(row)
+        return taken
+
+    parquet_file = pq.ParquetFile(path)
+    if columns is not None:
+        columns = [column for column in columns if column in parquet_file.schema_arrow.names]
+    json_columns = [column for column in read_metadata(path)[JSON_COLUMNS_KEY] if columns is None or column in columns]
+    taken, start = [], 0
+    for group in range(parquet_file.num_row_groups):
+        end = start + parquet_file.metadata.row_group(group).num_rows
+        first, last = bisect_left(rows, start), bisect_left(rows, end)
+        if first < last:
+            table = parquet_file.read_row_group(group, columns=columns)
+            taken += table.take([row - start for row in rows[first:last]]).to_pylist()
+        start = end
+    return decode_json_columns(taken, json_columns)
+
+class ArtifactStream(RecordStream):
+    """
+    Re-iterable stream of the rows of a Volatility3 output file. Complete outputs are read from their Parquet file
+    batch by batch, all others are streamed from the JSON output, so only one batch is held in memory.
+    """
+
+    def __iter__(self):
+        path = convert_output(self.filepath)
+        if path is None:
+            yield from super().__iter__()
+            return
+
+        parquet_file = pq.ParquetFile(path)
+        columns = self.columns
+        if columns is not None:
+            columns = [column for column in columns if column in parquet_file.schema_arrow.names]
+        json_columns = [column for column in read_metadata(path)[JSON_COLUMNS_KEY] if columns is None or column in columns]
+        for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE, columns=columns):
+            yield from decode_json_columns(batch.to_pylist(), json_columns)
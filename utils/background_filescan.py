@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import threading
+import psutil
+
+from config import volatility_engine, result_cache_enabled
+from utils.artifact_store import convert_output
+from utils.fingerprint import fast_fingerprint
+from utils.output_provenance import output_state, record_outputs
+from utils.plugin_results import PluginRunError, plugin_result
+from utils.volatility_analysis import run_file_search_analysis, wait_for_admission, data_extraction_output, \
+    volatility_version
+
+plugin = "windows.filescan"
+filescan_output = os.path.join(data_extraction_output, f"{plugin}.json")
+
+# A lock file next to the output marks a running scan, so neither reruns nor other processes start a second one
+lock_file = f"{filescan_output}.lock"
+
+# State of the scans started in this process, keyed by the fingerprint of the memory dump
+_scans = {}
+_lock = threading.RLock()
+
+def acquire_scan_lock(memory_file):
+    """
+    Takes the lock file of the filescan output. A lock left behind by a process that no longer runs is taken over.
+
+    :param memory_file: Path to the memory dump file.
+    :return: True if the lock was taken, False if another scan is running.
+    """
+    os.makedirs(data_extraction_output, exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            owner = scan_lock_owner()
+            if owner and psutil.pid_exists(owner.get("pid", -1)):
+                return False
+            try:
+                os.remove(lock_file)
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "dump": os.path.basename(memory_file), "started_at": time.time()}, f)
+        return True
+    return False
+
+def scan_lock_owner():
+    """
+    Reads the lock file of the filescan output.
+
+    :return: Dictionary with pid, dump and started_at, or None if no scan holds the lock.
+    """
+    try:
+        with open(lock_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def run_filescan_once(memory_file, engine=volatility_engine, use_cache=result_cache_enabled):
+    """
+    Runs 'windows.filescan' unless its output of the memory dump is up to date. At most one scan runs at a time,
+    it is admitted like every other plugin once enough memory is free.
+
+    :param memory_file: Path to the memory dump file.
+    :param engine: 'subprocess' to start vol.py, 'framework' to use the in-process engine.
+    :param use_cache: Whether to read from and write to the persistent result cache.
+    :return: Structured execution result.
+    :raises PluginRunError: If another scan is running or the plugin fails.
+    """
+    if output_state(memory_file, data_extraction_output, plugin, volatility_version)[0] == "current":
+        return plugin_result(plugin, "cached", f"{plugin} is up to date.", filescan_output)
+    if not acquire_scan_lock(memory_file):
+        raise PluginRunError("error", f"{plugin} is already running for {scan_lock_owner()['dump']}.")
+    try:
+        wait_for_admission()
+        result = run_file_search_analysis(memory_file, engine=engine, use_cache=use_cache)[0]
+        record_outputs(memory_file, data_extraction_output, [plugin], volatility_version)
+        convert_output(filescan_output)
+        return result
+    finally:
+        os.remove(lock_file)
+
+def start_background_filescan(memory_file, retry=False):
+    """
+    Starts 'windows.filescan' for a memory dump in a background thread. A scan of the dump is started once,
+    again only if its output was removed or a failed scan is retried.
+
+    :param memory_file: Path to the memory dump file.
+    :param retry: Whether to start a failed scan again.
+    :return: State dictionary of the scan.
+    """
+    key = fast_fingerprint(memory_file)
+
+    def job():
+        try:
+            result = run_filescan_once(memory_file)
+            state = {"status": "done", "message": result["message"]}
+        except Exception as e:
+            state = {"status": "failed", "message": f"Failure in {plugin}: {PluginRunError.from_exception(e).detail}"}
+        with _lock:
+            _scans[key].update(state, finished_at=time.time())
+
+    with _lock:
+        state = _scans.get(key)
+        if state is None and filescan_status(memory_file)["status"] == "running":
+            return filescan_status(memory_file)  # Started by another process
+        if state is None or (state["status"] == "failed" and retry) or (
+                state["status"] == "done" and output_state(memory_file, data_extraction_output, plugin, volatility_version)[0] != "current"):
+            _scans[key] = {"status": "running", "message": f"{plugin} is running in the background.",
+                           "started_at": time.time(), "finished_at": None}
+            threading.Thread(target=job, name=f"filescan-{os.path.basename(memory_file)}", daemon=True).start()
+        return dict(_scans[key])
+
+def filescan_status(memory_file):
+    """
+    Returns the state of the filescan of a memory dump.
+
+    :param memory_file: Path to the memory dump file.
+    :return: Dictionary with status ('idle', 'running', 'done' or 'failed'), message, started_at and finished_at.
+    """
+    with _lock:
+        state = _scans.get(fast_fingerprint(memory_file))
+    if state:
+        return dict(state)
+    owner = scan_lock_owner()
+    if owner and psutil.pid_exists(owner.get("pid", -1)):
+        return {"status": "running", "message": f"{plugin} is running in another process.",
+                "started_at": owner["started_at"], "finished_at": None}
+    return {"status": "idle", "message": None, "started_at": None, "finished_at": None}
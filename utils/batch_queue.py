@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import batch_parallel_dumps, volatility_workers, volatility_engine
+from utils.file_handler import find_all_memory_files
+from utils.fingerprint import fast_fingerprint, register_dump
+from utils.plugin_scheduler import schedule_analysis
+from utils.tree_builder import build_basic_tree
+from utils.volatility_analysis import GLOBAL_VOLATILITY
+from utils.volatility_engine import release_engine
+
+# Detect operating system
+os_name = platform.system()
+
+# Define the batch directory based on OS, every memory dump gets its own output and tree folders in it
+if os_name == "Windows":
+    batch_dir = "O:\\08_batch"
+else:  # Linux/macOS
+    batch_dir = "/tmp/MemoryInvestigator/08_batch"
+
+queue_file = os.path.join(batch_dir, "queue.json")
+
+# Serializes queue updates, several memory dumps are analyzed in parallel
+_lock = threading.RLock()
+_batch_thread = None
+
+def load_queue():
+    """
+    Loads the batch queue.
+
+    :return: List of job dictionaries in queue order.
+    """
+    try:
+        with open(queue_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+def save_queue(jobs):
+    """
+    Saves the batch queue atomically, so a restart always finds a consistent queue.
+
+    :param jobs: List of job dictionaries.
+    """
+    os.makedirs(batch_dir, exist_ok=True)
+    temp_file = f"{queue_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(jobs, f, indent=4)
+    os.replace(temp_file, queue_file)
+
+def update_job(memory_file, **fields):
+    """
+    Updates the fields of a queued job.
+
+    :param memory_file: Path to the memory dump file of the job.
+    :param fields: Fields to update.
+    """
+    with _lock:
+        jobs = load_queue()
+        for job in jobs:
+            if job["memory_file"] == memory_file:
+                job.update(fields)
+        save_queue(jobs)
+
+def dump_dirs(job):
+    """
+    Returns the output directories of a memory dump in batch mode, named after the dump and its fingerprint, so
+    dumps with the same file name from different folders are kept apart.
+
+    :param job: Job dictionary.
+    :return: Tuple (Volatility3 output directory, tree directory).
+    """
+    dump_dir = os.path.join(batch_dir, job.get("dir") or job["name"])
+    return os.path.join(dump_dir, "02_volatility_output"), os.path.join(dump_dir, "03_trees")
+
+def enqueue(memory_files=None):
+    """
+    Adds memory dumps to the batch queue, dumps already in the queue are skipped.
+
+    :param memory_files: List of memory dump paths, defaults to all dumps in the memory directory.
+    :return: Number of added jobs.
+    """
+    memory_files = find_all_memory_files() if memory_files is None else memory_files
+    with _lock:
+        jobs = load_queue()
+        queued = {job["memory_file"] for job in jobs}
+        added = [os.path.abspath(path) for path in memory_files if os.path.abspath(path) not in queued]
+        jobs += [
+            {
+                "memory_file": path, "name": os.path.basename(path), "size": os.path.getsize(path),
+                "dir": f"{os.path.basename(path)}_{fast_fingerprint(path)[:12]}",
+                "status": "queued", "added": time.time(), "started_at": None, "finished_at": None,
+                "finished_plugins": 0, "failed_plugins": [], "error": None,
+            }
+            for path in added
+        ]
+        save_queue(jobs)
+    return len(added)
+
+def requeue_failed():
+    """
+    Puts failed jobs back into the queue.
+
+    :return: Number of requeued jobs.
+    """
+    with _lock:
+        jobs = load_queue()
+        failed = [job for job in jobs if job["status"] == "failed"]
+        for job in failed:
+            job.update(status="queued", started_at=None, finished_at=None, error=None)
+        save_queue(jobs)
+    return len(failed)
+
+def clear_finished():
+    """
+    Removes finished jobs from the queue, their outputs are kept.
+
+    :return: Number of removed jobs.
+    """
+    with _lock:
+        jobs = load_queue()
+        remaining = [job for job in jobs if job["status"] not in ("done", "failed")]
+        save_queue(remaining)
+    return len(jobs) - len(remaining)
+
+def run_job(job, plugins, workers):
+    """
+    Analyzes one memory dump of the queue into its own output and tree folders.
+
+    :param job: Job dictionary.
+    :param plugins: List of Volatility3 plugins to execute.
+    :param workers: Number of plugins of this dump running in parallel.
+    """
+    memory_file = job["memory_file"]
+    output_dir, tree_dir = dump_dirs(job)
+    update_job(memory_file, status="running", started_at=time.time(), finished_plugins=0)
+
+    def count_plugin(plugin, status, message):
+        if status in ("done", "failed", "skipped"):
+            with _lock:
+                finished = next(job for job in load_queue() if job["memory_file"] == memory_file)["finished_plugins"]
+                update_job(memory_file, finished_plugins=finished + 1)
+
+    def update_tree(finished_plugins, flagged_pids):
+        build_basic_tree(output_dir, finished_plugins, flagged_pids, tree_dir)
+
+    try:
+        register_dump(memory_file)
+        results = schedule_analysis(memory_file, plugins, max_workers=workers, status_callback=count_plugin,
+                                    stage_callback=update_tree, output_dir=output_dir)
+        update_job(memory_file, status="done", finished_at=time.time(),
+                   failed_plugins=[result["plugin"] for result in results if result["status"] == "failed"])
+    except Exception as e:
+        update_job(memory_file, status="failed", finished_at=time.time(), error=str(e) or type(e).__name__)
+    finally:
+        # Free the layers and symbol tables of the in-process engine before the next dump
+        if volatility_engine == "framework":
+            release_engine(memory_file)
+
+def run_batch(max_parallel_dumps=batch_parallel_dumps, plugins=GLOBAL_VOLATILITY):
+    """
+    Analyzes all queued memory dumps. Jobs interrupted by a restart are queued again, plugins they already
+    finished are restored from the result cache. The plugin workers are shared by the dumps running in parallel,
+    so the global number of running plugins stays within volatility_workers.
+
+    :param max_parallel_dumps: Maximum number of memory dumps analyzed at the same time.
+    :param plugins: List of Volatility3 plugins to execute.
+    """
+    with _lock:
+        jobs = load_queue()
+        for job in jobs:
+            if job["status"] == "running":
+                job["status"] = "queued"
+        save_queue(jobs)
+    queued = [job for job in jobs if job["status"] == "queued"]
+    if not queued:
+        return
+
+    parallel_dumps = max(1, min(max_parallel_dumps, len(queued)))
+    workers = max(1, volatility_workers // parallel_dumps)
+    with ThreadPoolExecutor(max_workers=parallel_dumps, thread_name_prefix="batch") as executor:
+        list(executor.map(lambda job: run_job(job, plugins, workers), queued))
+
+def start_batch(max_parallel_dumps=batch_parallel_dumps):
+    """
+    Starts the batch analysis in a background thread, unless it is already running.
+
+    :param max_parallel_dumps: Maximum number of memory dumps analyzed at the same time.
+    :return: The background thread.
+    """
+    global _batch_thread
+    with _lock:
+        if not is_batch_running():
+            _batch_thread = threading.Thread(target=run_batch, args=(max_parallel_dumps,), name="batch-queue", daemon=True)
+            _batch_thread.start()
+        return _batch_thread
+
+def is_batch_running():
+    """
+    Checks whether the batch analysis is running in this process.
+
+    :return: True while the background thread is alive.
+    """
+    return _batch_thread is not None and _batch_thread.is_alive()
+
+def batch_progress(jobs):
+    """
+    Summarizes the progress of the batch queue.
+
+    :param jobs: List of job dictionaries.
+    :return: Dictionary with the number of jobs per status, the elapsed hours and the throughput in dumps per hour.
+    """
+    progress = {status: sum(1 for job in jobs if job["status"] == status) for status in ("queued", "running", "done", "failed")}
+    started = [job["started_at"] for job in jobs if job["started_at"]]
+    finished = [job["finished_at"] for job in jobs if job["finished_at"]]
+    end = time.time() if progress["running"] or not finished else max(finished)
+    hours = (end - min(started)) / 3600 if started else 0
+    progress["hours"] = round(hours, 2)
+    progress["dumps_per_hour"] = round((progress["done"] + progress["failed"]) / hours, 2) if hours else None
+    return progress
@@ -1,4 +1,5 @@
 import os
+import json
 import platform
 import shutil
 
@@ -8,6 +9,9 @@ from langchain_chroma import Chroma
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_openai import OpenAIEmbeddings
 
+from utils.artifact_store import ArtifactStream
+from utils.volatility_reader import is_json_lines
+
 # Detect operating system
 os_name = platform.system()
 
@@ -23,19 +27,24 @@ VECTORSTORE_DIR = os.path.join(rag_data_dir, "chroma_store")
 
 def convert_utf16_to_utf8_json(input_file_path, output_file_path):
     """
-    Converts a JSON file from UTF-16 encoding to UTF-8.
+    Converts a JSON file from UTF-16 encoding to UTF-8 JSON Lines. The rows are streamed from the columnar file
+    or the JSON document one at a time, so huge outputs are converted with bounded memory.
 
     :param input_file_path: Path to the input UTF-16 JSON file.
     :param output_file_path: Path to the output UTF-8 JSON file.
     """
-    try:
-        with open(input_file_path, 'r', encoding='utf-16') as infile:
-            content = infile.read()
-        with open(output_file_path, 'w', encoding='utf-8') as outfile:
-            outfile.write(content)
-    except UnicodeError:
-        # If file is already UTF-8, just copy it
+    # JSON Lines output is already UTF-8
+    if is_json_lines(input_file_path):
         shutil.copy(input_file_path, output_file_path)
+        return
+
+    rows = 0
+    with open(output_file_path, 'w', encoding='utf-8') as outfile:
+        for row in ArtifactStream(input_file_path):
+            outfile.write(json.dumps(row) + "\n")
+            rows += 1
+        if not rows:
+            outfile.write("[]")  # An empty array, JSON Lines need at least one row
 
 def build_experimental_forensic_rag(api_key, llm_option, embedding_option):
     """
@@ -80,7 +89,11 @@ def build_experimental_forensic_rag(api_key, llm_option, embedding_option):
                 pdf_loader = PyPDFLoader(file_path)
                 documents.extend(pdf_loader.load())
             elif file.endswith(".json"):
-                json_loader = JSONLoader(file_path=file_path, jq_schema=".[]", text_content=False)
+                # JSON Lines output is loaded line by line, one row per document as for JSON arrays
+                if is_json_lines(file_path):
+                    json_loader = JSONLoader(file_path=file_path, jq_schema=".", text_content=False, json_lines=True)
+                else:
+                    json_loader = JSONLoader(file_path=file_path, jq_schema=".[]", text_content=False)
                 documents.extend(json_loader.load())
 
         # Split documents into smaller chunks
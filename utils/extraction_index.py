@@ -0,0 +1,237 @@
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.volatility_analysis import data_extraction_output, analyzed_volatility_output
+from utils.artifact_loader import load_rows
+
+# Index of the extracted files and the content-addressed store holding one copy per distinct content
+index_file = os.path.join(data_extraction_output, "extraction_index.json")
+objects_dir = os.path.join(data_extraction_output, "objects")
+
+# Files written by windows.dumpfiles are named file.<FILE_OBJECT address>.<section address>.<section type>.<name>.<ext>,
+# the FILE_OBJECT address is the offset listed by windows.filescan
+DUMPFILES_PATTERN = re.compile(r"^file\.(0x[0-9a-fA-F]+)\.(0x[0-9a-fA-F]+)\.(\w+?)\.(.+)\.(dat|img|vacb)$")
+
+# Serializes index updates, extractions may finish while the index is updated
+_lock = threading.RLock()
+
+# Hash lookups of the loaded index, rebuilt whenever the index file changes
+_lookups = {"mtime_ns": None}
+
+def load_index():
+    """
+    Loads the extraction index.
+
+    :return: Dictionary with 'objects' (stored contents by SHA-256) and 'files' (extracted files by name).
+    """
+    try:
+        with open(index_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"objects": {}, "files": {}}
+
+def save_index(index):
+    """
+    Saves the extraction index atomically.
+
+    :param index: Extraction index dictionary.
+    """
+    os.makedirs(data_extraction_output, exist_ok=True)
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=4)
+    os.replace(temp_file, index_file)
+
+def hash_file(path, chunk_size=4 * 1024 * 1024):
+    """
+    Computes MD5, SHA-1 and SHA-256 of a file in one pass.
+
+    :param path: Path of the file.
+    :param chunk_size: Number of bytes read at once.
+    :return: Dictionary with md5, sha1, sha256 and size.
+    """
+    digests = {"md5": hashlib.md5(), "sha1": hashlib.sha1(), "sha256": hashlib.sha256()}
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            size += len(chunk)
+            for digest in digests.values():
+                digest.update(chunk)
+    return {**{name: digest.hexdigest() for name, digest in digests.items()}, "size": size}
+
+def store_object(path, hashes):
+    """
+    Keeps one copy of a content in the object store and links the extracted file to it, so duplicates take
+    no additional space. If the file system cannot link, the extracted file is kept as it is.
+
+    :param path: Path of the extracted file.
+    :param hashes: Hashes of the file.
+    :return: Path of the object relative to the data extraction directory.
+    """
+    object_path = os.path.join(objects_dir, hashes["sha256"][:2], hashes["sha256"])
+    relative_path = os.path.relpath(object_path, data_extraction_output)
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    if not os.path.exists(object_path):
+        os.replace(path, object_path)
+    elif os.path.samefile(path, object_path):
+        return relative_path
+    else:
+        os.remove(path)
+    try:
+        os.link(object_path, path)
+    except OSError:
+        shutil.copyfile(object_path, path)
+    return relative_path
+
+def filescan_paths(offsets):
+    """
+    Looks up the paths of FILE_OBJECT offsets in the windows.filescan output.
+
+    :param offsets: Set of offsets.
+    :return: Dictionary of paths by offset.
+    """
+    paths = {}
+    for record in load_rows(os.path.join(data_extraction_output, "windows.filescan.json"), ["Offset", "Name"]):
+        if record.get("Offset") in offsets:
+            paths[record["Offset"]] = record.get("Name")
+    return paths
+
+def owning_processes(offsets, names):
+    """
+    Determines the processes owning extracted files: processes holding a handle to the FILE_OBJECT according to
+    windows.handles, otherwise processes that loaded a module of the same name according to windows.dlllist.
+
+    :param offsets: Set of FILE_OBJECT offsets.
+    :param names: Set of lower-case file names.
+    :return: Tuple (PIDs by offset, PIDs by lower-case file name).
+    """
+    by_offset, by_name = {}, {}
+    for record in load_rows(os.path.join(analyzed_volatility_output, "windows.handles.json"), ["PID", "Type", "Offset"]):
+        if record.get("Type") == "File" and record.get("Offset") in offsets:
+            by_offset.setdefault(record["Offset"], set()).add(record.get("PID"))
+    for record in load_rows(os.path.join(analyzed_volatility_output, "windows.dlllist.json"), ["PID", "Path"]):
+        name = os.path.basename(str(record.get("Path") or "").replace("\\", "/")).lower()
+        if name in names:
+            by_name.setdefault(name, set()).add(record.get("PID"))
+    return by_offset, by_name
+
+def update_index(max_workers=None):
+    """
+    Adds all new or changed files extracted by windows.dumpfiles to the index. The files are hashed in parallel,
+    identical contents are collapsed into the object store, and every file is linked to its filescan offset,
+    its original path and the processes owning it.
+
+    :param max_workers: Number of files hashed in parallel, defaults to the number of CPUs.
+    :return: Number of indexed files.
+    """
+    with _lock:
+        index = load_index()
+        new_files = []
+        for name in sorted(os.listdir(data_extraction_output)) if os.path.isdir(data_extraction_output) else []:
+            path = os.path.join(data_extraction_output, name)
+            entry = index["files"].get(name)
+            if not DUMPFILES_PATTERN.match(name) or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            if entry is None or (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+                new_files.append(name)
+        if not new_files:
+            return 0
+
+        # Hashing releases the GIL, so threads hash several files at the same time
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            hashes = dict(zip(new_files, executor.map(lambda name: hash_file(os.path.join(data_extraction_output, name)), new_files)))
+
+        parsed = {name: DUMPFILES_PATTERN.match(name).groups() for name in new_files}
+        offsets = {int(groups[0], 16) for groups in parsed.values()}
+        paths = filescan_paths(offsets)
+        names = {os.path.basename(str(paths.get(int(groups[0], 16)) or groups[3]).replace("\\", "/")).lower()
+                 for groups in parsed.values()}
+        pids_by_offset, pids_by_name = owning_processes(offsets, names)
+
+        for name in new_files:
+            file_object, section, section_type, file_name, extension = parsed[name]
+            offset = int(file_object, 16)
+            digest = hashes[name]
+            source_path = paths.get(offset)
+            lookup_name = os.path.basename(str(source_path or file_name).replace("\\", "/")).lower()
+            if digest["sha256"] not in index["objects"]:
+                index["objects"][digest["sha256"]] = {**digest, "path": None, "added": time.time()}
+            index["objects"][digest["sha256"]]["path"] = store_object(os.path.join(data_extraction_output, name), digest)
+
+            stat = os.stat(os.path.join(data_extraction_output, name))
+            index["files"][name] = {
+                "sha256": digest["sha256"], "offset": offset, "section": section_type, "source_path": source_path,
+                "pids": sorted(pids_by_offset.get(offset) or pids_by_name.get(lookup_name) or []),
+                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "added": time.time(),
+            }
+        save_index(index)
+        return len(new_files)
+
+def lookups():
+    """
+    Returns the hash and path lookups of the current index, built once per version of the index file.
+
+    :return: Dictionary with 'index', 'hashes' (SHA-256 by MD5, SHA-1 and SHA-256), 'names' (file names by SHA-256)
+             and 'paths' (file names by lower-case file name and original path).
+    """
+    mtime_ns = os.stat(index_file).st_mtime_ns if os.path.exists(index_file) else None
+    with _lock:
+        if _lookups["mtime_ns"] != mtime_ns or "index" not in _lookups:
+            index = load_index()
+            hashes, names, paths = {}, {}, {}
+            for sha256, entry in index["objects"].items():
+                for algorithm in ("md5", "sha1", "sha256"):
+                    hashes[entry[algorithm]] = sha256
+            for name, entry in index["files"].items():
+                names.setdefault(entry["sha256"], []).append(name)
+                for key in {name.lower(), str(entry["source_path"] or "").lower()} - {""}:
+                    paths.setdefault(key, []).append(name)
+            _lookups.update(mtime_ns=mtime_ns, index=index, hashes=hashes, names=names, paths=paths)
+        return _lookups
+
+def find_by_hash(value):
+    """
+    Finds the extracted files with a given MD5, SHA-1 or SHA-256.
+
+    :param value: Hex digest.
+    :return: List of file entries including their name, empty if the hash is unknown.
+    """
+    current = lookups()
+    sha256 = current["hashes"].get(value.strip().lower())
+    return [{"name": name, **current["index"]["files"][name]} for name in current["names"].get(sha256, [])]
+
+def find_by_path(text):
+    """
+    Finds the extracted files by their name or original path. An exact match is looked up directly,
+    otherwise all files whose name or path contains the text are returned.
+
+    :param text: File name, path or a part of it, case-insensitive.
+    :return: List of file entries including their name.
+    """
+    current = lookups()
+    text = text.strip().lower()
+    names = current["paths"].get(text) or [name for key, key_names in current["paths"].items() if text in key for name in key_names]
+    return [{"name": name, **current["index"]["files"][name]} for name in dict.fromkeys(names)]
+
+def index_rows():
+    """
+    Lists all extracted files with their hashes for display.
+
+    :return: List of row dictionaries, one per extracted file.
+    """
+    current = lookups()
+    index = current["index"]
+    return [
+        {"File": name, "Offset": entry["offset"], "Section": entry["section"], "Path": entry["source_path"],
+         "PIDs": ", ".join(str(pid) for pid in entry["pids"]), "Size": entry["size"],
+         "MD5": index["objects"][entry["sha256"]]["md5"], "SHA-1": index["objects"][entry["sha256"]]["sha1"],
+         "SHA-256": entry["sha256"], "Duplicates": len(current["names"][entry["sha256"]]) - 1}
+        for name, entry in sorted(index["files"].items())
+    ]
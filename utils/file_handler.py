@@ -47,3 +47,16 @@ def find_memory_files(directory=memory_dump_dir, extensions=memory_extensions):
             return os.path.join(directory, file)
 
     return None  # Return None if no file is found
+
+def find_all_memory_files(directory=memory_dump_dir, extensions=memory_extensions):
+    """
+    Searches for all memory dump files in the specified folder.
+
+    :param directory: The folder to search for memory dump files.
+    :param extensions: A tuple of allowed file extensions.
+    :return: Sorted list of full paths of the found memory dump files.
+    """
+    if not os.path.exists(directory):
+        return []
+
+    return sorted(os.path.join(directory, file) for file in os.listdir(directory) if file.endswith(extensions))
@@ -0,0 +1,206 @@
+import os
+import json
+import mmap
+import hashlib
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Detect operating system
+os_name = platform.system()
+
+# Define the case settings file based on OS, fingerprints are stored with the case
+if os_name == "Windows":
+    settings_file = "O:\\settings.json"
+else:  # Linux/macOS
+    settings_file = "/tmp/MemoryInvestigator/settings.json"
+
+# Fingerprints already computed in this process, keyed by mode, path, size and modification time
+_fingerprints = {}
+
+# Running background hashes by memory file, so a dump is never hashed twice at the same time
+_background_jobs = {}
+_lock = threading.Lock()
+
+def _memo_key(mode, memory_file):
+    stat = os.stat(memory_file)
+    return (mode, os.path.abspath(memory_file), stat.st_size, stat.st_mtime_ns)
+
+def fast_fingerprint(memory_file, samples=256, sample_size=64 * 1024, header_size=1024 * 1024):
+    """
+    Computes a fast fingerprint of a memory dump by hashing its size, its header, strided samples and its tail
+    through a memory map. Only a few MB are read, independent of the size of the dump.
+
+    :param memory_file: Path to the memory dump file.
+    :param samples: Number of strided samples.
+    :param sample_size: Number of bytes per sample.
+    :param header_size: Number of bytes hashed at the start of the file.
+    :return: Hex digest identifying the memory dump.
+    """
+    memo_key = _memo_key("fast", memory_file)
+    if memo_key in _fingerprints:
+        return _fingerprints[memo_key]
+
+    size = memo_key[2]
+    digest = hashlib.sha256(f"{size}".encode())
+    if size:
+        with open(memory_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            digest.update(view[:header_size])
+            stride = max(sample_size, size // samples)
+            for offset in range(header_size, size, stride):
+                digest.update(view[offset:offset + sample_size])
+            digest.update(view[max(0, size - sample_size):])
+            view.release()
+
+    _fingerprints[memo_key] = digest.hexdigest()
+    return _fingerprints[memo_key]
+
+def full_fingerprint(memory_file, chunk_size=64 * 1024 * 1024, max_workers=None):
+    """
+    Computes a full hash of a memory dump. Fixed-size chunks are hashed in parallel and the chunk digests are
+    combined pairwise to a single root digest (hash tree), so the result does not depend on the worker count.
+
+    :param memory_file: Path to the memory dump file.
+    :param chunk_size: Number of bytes per chunk.
+    :param max_workers: Number of hashing threads, defaults to the number of CPUs.
+    :return: Hex digest of the hash tree root.
+    """
+    memo_key = _memo_key("full", memory_file)
+    if memo_key in _fingerprints:
+        return _fingerprints[memo_key]
+
+    size = memo_key[2]
+    if size == 0:
+        level = [hashlib.sha256(b"").digest()]
+    else:
+        with open(memory_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            def hash_chunk(offset):
+                # hashlib releases the GIL for large buffers, so the threads hash in parallel
+                with memoryview(mapped)[offset:offset + chunk_size] as chunk:
+                    return hashlib.sha256(chunk).digest()
+
+            with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+                level = list(executor.map(hash_chunk, range(0, size, chunk_size)))
+
+    # Combine the chunk digests pairwise until only the root is left
+    while len(level) > 1:
+        level = [hashlib.sha256(b"".join(level[i:i + 2])).digest() for i in range(0, len(level), 2)]
+
+    _fingerprints[memo_key] = hashlib.sha256(f"{size}:{chunk_size}:".encode() + level[0]).hexdigest()
+    return _fingerprints[memo_key]
+
+def load_case_fingerprints():
+    """
+    Loads the fingerprints stored with the case.
+
+    :return: Dictionary of fingerprints by memory dump name.
+    """
+    try:
+        with open(settings_file, "r") as json_file:
+            return json.load(json_file).get("memory_dumps", {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def store_case_fingerprint(memory_file, **fingerprints):
+    """
+    Stores fingerprints of a memory dump in the case settings, keeping all other settings.
+
+    :param memory_file: Path to the memory dump file.
+    :param fingerprints: Fingerprints to store, e.g. fast=... or full=...
+    """
+    with _lock:
+        try:
+            with open(settings_file, "r") as json_file:
+                settings_data = json.load(json_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            settings_data = {}
+
+        entry = settings_data.setdefault("memory_dumps", {}).setdefault(os.path.basename(memory_file), {})
+        entry["size"] = os.path.getsize(memory_file)
+        entry["mtime_ns"] = os.stat(memory_file).st_mtime_ns
+        entry.update({f"{mode}_fingerprint": value for mode, value in fingerprints.items()})
+
+        os.makedirs(os.path.dirname(settings_file), exist_ok=True)
+        with open(settings_file, "w") as json_file:
+            json.dump(settings_data, json_file, indent=4)
+
+def known_dump_hash(memory_file):
+    """
+    Returns the full hash of a memory dump if it was computed in this process or recorded with the case for the
+    unchanged file, without hashing anything.
+
+    :param memory_file: Path to the memory dump file.
+    :return: Hex digest of the full hash, or None if it is not known yet.
+    """
+    memo_key = _memo_key("full", memory_file)
+    if memo_key in _fingerprints:
+        return _fingerprints[memo_key]
+    stored = load_case_fingerprints().get(os.path.basename(memory_file), {})
+    if stored.get("full_fingerprint") and (stored.get("size"), stored.get("mtime_ns")) == memo_key[2:] \
+            and stored.get("fast_fingerprint") == fast_fingerprint(memory_file):
+        return stored["full_fingerprint"]
+    return None
+
+def dump_hash(memory_file):
+    """
+    Returns the full hash of a memory dump, computed in this process, recorded with the case for the unchanged
+    file, or computed now. A running background hash is awaited instead of hashing twice.
+
+    :param memory_file: Path to the memory dump file.
+    :return: Hex digest of the full hash.
+    """
+    with _lock:
+        job = _background_jobs.get(os.path.abspath(memory_file))
+    if job is not None:
+        job.join()
+    return known_dump_hash(memory_file) or full_fingerprint(memory_file)
+
+def start_background_fingerprint(memory_file):
+    """
+    Starts computing the full hash of a memory dump in a background thread and stores it with the case.
+
+    :param memory_file: Path to the memory dump file.
+    :return: The background thread, or the already running one for this memory dump.
+    """
+    key = os.path.abspath(memory_file)
+
+    def job():
+        try:
+            store_case_fingerprint(memory_file, fast=fast_fingerprint(memory_file), full=full_fingerprint(memory_file))
+        finally:
+            with _lock:
+                _background_jobs.pop(key, None)
+
+    with _lock:
+        if key not in _background_jobs:
+            _background_jobs[key] = threading.Thread(target=job, name=f"fingerprint-{os.path.basename(memory_file)}", daemon=True)
+            _background_jobs[key].start()
+        return _background_jobs[key]
+
+def is_fingerprint_running(memory_file):
+    """
+    Checks whether the full hash of a memory dump is currently computed in the background.
+
+    :param memory_file: Path to the memory dump file.
+    :return: True while the background hash is running.
+    """
+    with _lock:
+        return os.path.abspath(memory_file) in _background_jobs
+
+def register_dump(memory_file):
+    """
+    Registers a memory dump with the case: the fast fingerprint is computed and stored right away,
+    the full hash is started in the background unless it is already known.
+
+    :param memory_file: Path to the memory dump file.
+    :return: Fast fingerprint of the memory dump.
+    """
+    fingerprint = fast_fingerprint(memory_file)
+    stored = load_case_fingerprints().get(os.path.basename(memory_file), {})
+    if stored.get("fast_fingerprint") != fingerprint:
+        store_case_fingerprint(memory_file, fast=fingerprint, full=None)
+        stored = {}
+    if not stored.get("full_fingerprint"):
+        start_background_fingerprint(memory_file)
+    return fingerprint
@@ -20,6 +20,7 @@ SUBDIRECTORIES = [
     "05_standard_rag",
     "06_experimental_rag",
     "07_help",
+    "08_batch",
 ]
 
 # Global variable to store the temporary directory path
@@ -1,7 +1,7 @@
-import re
 import asyncio
 import streamlit as st
 from google import genai
+from utils.artifact_loader import load_tree_data
 from utils.select_tree import choose_basic_or_costume_tree
 
 
@@ -71,16 +71,10 @@ async def gemini_first_thinking(api_llm_key, prompt=None):
     if tree is None:
         return "Please build a tree first."
 
-    with open(tree, 'r', encoding='utf-8') as file:
-        json_data = file.read()
-        json_data = re.sub(r'"children": \[\]', ' ', json_data)
-        json_data = re.sub(r'Required memory at 0x[0-9a-fA-F]+ is not valid \(process exited\?\)', '', json_data)  # Remove error message
-        json_data = re.sub(r'Required memory at 0x[0-9a-fA-F]+ is inaccessible \(swapped\)', '', json_data)  # Remove error message
-
-        cleaned_json_data = re.sub(r'\s+', ' ', json_data).strip()
-        print("--START--")
-        print(cleaned_json_data)
-        print("--ENDE--")
+    cleaned_json_data = load_tree_data(tree)
+    print("--START--")
+    print(cleaned_json_data)
+    print("--ENDE--")
     # Prepare system context (memory structure)
     system_msg = (
         "Analyze the provided JSON memory structure and assist in identifying "
@@ -0,0 +1,95 @@
+import google.generativeai as genai
+from openai import OpenAI
+
+# Import utility functions to load and divide the compact tree and to select the basic or costume tree
+from utils.artifact_loader import load_tree_data
+from utils.tree_codec import split_compact
+from utils.select_tree import choose_basic_or_costume_tree
+
+# System instruction for the forensic analysis, the tree data is appended per request
+SYSTEM_INSTRUCTION = "You are a forensic RAM Analyst Assistant specializing in Windows memory analysis. Analyze the JSON tree of Windows memory artifacts to detect intrusions or malicious activities. Cross-check your findings with known threats and provide clear, specific reasons for flagging any anomalies (e.g., unusual parent-child relationships, code injection, execution from non-standard locations). If you're unsure, ask clarifying questions; if you don't know, say so. Generate a structured forensic report highlighting confirmed threats while minimizing noise."
+
+# OpenAI models taking a system message, the reasoning models only take user messages
+OPENAI_CHAT_MODELS = ["gpt-4o", "gpt-3.5-turbo"]
+OPENAI_REASONING_MODELS = ["o1-preview", "o1", "o1-2024-12-17"]
+
+def llm_name(llm_option):
+    """
+    Returns the display name of the LLM provider.
+    """
+    return "Gemini" if llm_option.startswith("gemini") else "ChatGPT"
+
+def ask_llm(llm_option, api_key, prompt, data=None):
+    """
+    Sends a prompt to an LLM (either Gemini or OpenAI models), optionally with tree data as context.
+
+    :param llm_option: The selected LLM model.
+    :param api_key: API key for authentication.
+    :param prompt: Prompt for the LLM.
+    :param data: Optional compact tree data.
+    :return: Response text.
+    :raises ValueError: If the LLM is not supported.
+    """
+    system_instruction = f"{SYSTEM_INSTRUCTION} Data: {data}" if data is not None else SYSTEM_INSTRUCTION
+
+    # Google LLM Options
+    if llm_option.startswith("gemini"):
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name=llm_option, system_instruction=system_instruction)
+        convo = model.start_chat(history=[])
+        convo.send_message(prompt)
+        return convo.last.text
+
+    # OpenAI LLM Options
+    if llm_option in OPENAI_CHAT_MODELS:
+        messages = [{"role": "system", "content": system_instruction}, {"role": "user", "content": prompt}]
+    elif llm_option in OPENAI_REASONING_MODELS:
+        messages = [{"role": "user", "content": f"{data}\n\n{prompt}" if data is not None else prompt}]
+    else:
+        raise ValueError("Select a valid LLM.")
+
+    completion = OpenAI(api_key=api_key).chat.completions.create(model=llm_option, messages=messages)
+    return completion.choices[0].message.content
+
+def analyze_tree(llm_option, api_key, number_of_divided_jsons, prompt, tree=None, response_callback=None):
+    """
+    Analyzes the system analysis tree with an LLM. A tree divided into several parts is analyzed part by part
+    and the answers are summarized.
+
+    :param llm_option: The selected LLM model.
+    :param api_key: API key for authentication.
+    :param number_of_divided_jsons: Number of parts the JSON should be divided into for processing.
+    :param prompt: User input prompt for guiding the LLM response.
+    :param tree: Path to the tree, defaults to the customized or basic tree.
+    :param response_callback: Optional function called as response_callback(label, text) for every response,
+                              with the label 'part <n>', 'summary' or None for an undivided tree.
+    :return: Dictionary with the responses of the parts and the summary.
+    :raises FileNotFoundError: If no tree was built.
+    :raises ValueError: If the LLM is not supported.
+    """
+    tree = tree or choose_basic_or_costume_tree()
+    if tree is None:
+        raise FileNotFoundError("Please build a tree first.")
+    if not (llm_option.startswith("gemini") or llm_option in OPENAI_CHAT_MODELS + OPENAI_REASONING_MODELS):
+        raise ValueError("Select a valid LLM.")
+
+    def respond(label, text):
+        if response_callback:
+            response_callback(label, text)
+        return text
+
+    analysis = {"parts": [], "summary": None}
+    if not prompt:
+        return analysis
+
+    if number_of_divided_jsons > 1:
+        # Every part repeats the keys of the compact tree, so it is understood on its own
+        for i, data in enumerate(split_compact(load_tree_data(tree), number_of_divided_jsons)):
+            analysis["parts"].append(respond(f"part {i + 1}", ask_llm(llm_option, api_key, prompt, data)))
+
+        summary_prompt = "Summarize the findings from all parts of the JSON data. " + " ".join(analysis["parts"])
+        analysis["summary"] = respond("summary", ask_llm(llm_option, api_key, summary_prompt))
+    else:
+        data = load_tree_data(tree)
+        analysis["parts"].append(respond(None, ask_llm(llm_option, api_key, prompt, data)))
+    return analysis
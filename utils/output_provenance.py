@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import threading
+
+from utils.fingerprint import fast_fingerprint
+
+# Serializes provenance updates, analyses of several memory dumps may run at the same time
+_lock = threading.RLock()
+
+def provenance_file(output_dir):
+    """
+    Returns the provenance file of an output directory. It is kept next to the directory, so pages and RAG
+    builders listing the Volatility3 outputs never see it, and it is removed together with the drive.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :return: Path of the provenance file.
+    """
+    output_dir = os.path.normpath(output_dir)
+    return os.path.join(os.path.dirname(output_dir), f"{os.path.basename(output_dir)}_provenance.json")
+
+def load_provenance(output_dir):
+    """
+    Loads the provenance of the outputs in a directory.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :return: Dictionary of provenance records by plugin.
+    """
+    try:
+        with open(provenance_file(output_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_provenance(output_dir, provenance):
+    """
+    Saves the provenance of the outputs in a directory atomically.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param provenance: Dictionary of provenance records by plugin.
+    """
+    path = provenance_file(output_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(provenance, f, indent=4)
+    os.replace(f"{path}.tmp", path)
+
+def record_outputs(memory_file, output_dir, plugins, version):
+    """
+    Records that the outputs of plugins are complete results of a memory dump. The size and modification time
+    of every output are kept, so an output overwritten afterwards is recognized.
+
+    :param memory_file: Path to the memory dump file.
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param plugins: List of plugins whose output is complete.
+    :param version: Volatility3 version.
+    """
+    fingerprint = fast_fingerprint(memory_file)
+    with _lock:
+        provenance = load_provenance(output_dir)
+        for plugin in plugins:
+            output_file = os.path.join(output_dir, f"{plugin}.json")
+            if os.path.isfile(output_file):
+                stat = os.stat(output_file)
+                provenance[plugin] = {
+                    "dump": os.path.basename(memory_file), "fingerprint": fingerprint, "version": version,
+                    "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "recorded_at": time.time(),
+                }
+        save_provenance(output_dir, provenance)
+
+def output_state(memory_file, output_dir, plugin, version, provenance=None):
+    """
+    Checks whether the output of a plugin is an up-to-date result of a memory dump.
+
+    :param memory_file: Path to the memory dump file.
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param plugin: Volatility3 plugin name.
+    :param version: Volatility3 version.
+    :param provenance: Optional provenance of the directory, loaded if not given.
+    :return: Tuple (state, reason) with the state 'current', 'missing' or 'stale'.
+    """
+    output_file = os.path.join(output_dir, f"{plugin}.json")
+    if not os.path.isfile(output_file):
+        return "missing", "no output"
+
+    record = (load_provenance(output_dir) if provenance is None else provenance).get(plugin)
+    if record is None:
+        return "stale", "unknown origin"
+    if record["fingerprint"] != fast_fingerprint(memory_file):
+        return "stale", f"output of {record['dump']}"
+    if record["version"] != version:
+        return "stale", f"Volatility3 {record['version']}"
+    stat = os.stat(output_file)
+    if (stat.st_size, stat.st_mtime_ns) != (record["size"], record["mtime_ns"]):
+        return "stale", "changed or incomplete since the last run"
+    return "current", "up to date"
+
+def plan_incremental(memory_file, plugins, output_dir, version):
+    """
+    Compares the requested plugins with the outputs already in the directory.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugins: List of requested Volatility3 plugins.
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param version: Volatility3 version.
+    :return: Dictionary of (state, reason) tuples by plugin, in the order of the requested plugins.
+    """
+    provenance = load_provenance(output_dir)
+    return {plugin: output_state(memory_file, output_dir, plugin, version, provenance) for plugin in plugins}
@@ -0,0 +1,44 @@
+import streamlit as st
+
+from utils.table_query import filter_view, page_of
+
+# Rows per page the user can choose from
+PAGE_SIZES = [100, 500, 1000, 5000]
+
+def paged_dataframe(df, key, rows=None, column=None, column_filter=None, selectable=False):
+    """
+    Shows a table page by page. Sorting, filtering and paging run on the server, only the rows of the current
+    page are sent to the browser.
+
+    :param df: Full DataFrame.
+    :param key: Unique key of the table on the page.
+    :param rows: Optional row positions of search results.
+    :param column: Optional column of the column filter.
+    :param column_filter: Optional text the column has to contain.
+    :param selectable: Whether rows can be selected.
+    :return: Tuple (rows of the shown page, selection event or None).
+    """
+    sort_column, order_column, size_column, page_column = st.columns(4)
+    sort_by = sort_column.selectbox("Sort by:", options=[None] + list(df.columns), key=f"{key}-sort",
+                                    format_func=lambda column: "Original order" if column is None else column)
+    descending = order_column.selectbox("Order:", options=["Ascending", "Descending"], key=f"{key}-order") == "Descending"
+    page_size = size_column.selectbox("Rows per page:", options=PAGE_SIZES, key=f"{key}-size")
+
+    view = filter_view(df, rows, column, column_filter, sort_by, descending)
+    _, _, pages = page_of(view, 1, page_size)
+
+    # A page beyond the end after filtering would be rejected by the widget
+    if st.session_state.get(f"{key}-page", 1) > pages:
+        st.session_state[f"{key}-page"] = pages
+    page = page_column.number_input("Page:", min_value=1, max_value=pages, step=1, key=f"{key}-page")
+    page_df, page, pages = page_of(view, page, page_size)
+
+    start = (page - 1) * page_size
+    st.caption(f"Page {page} of {pages}, rows {start + 1 if len(view) else 0}-{start + len(page_df)} of {len(view)}" +
+               (f" (filtered from {len(df)})" if len(view) != len(df) else ""))
+    if selectable:
+        # The key changes with the shown rows, so a selection never refers to rows of another page or order
+        table_key = f"{key}-{sort_by}-{descending}-{page_size}-{page}-{len(view)}"
+        return page_df, st.dataframe(page_df, on_select="rerun", selection_mode="multi-row", key=table_key)
+    st.dataframe(page_df)
+    return page_df, None
@@ -0,0 +1,97 @@
+import os
+import time
+
+from utils.volatility_reader import is_json_lines, iter_json_lines, count_rows
+
+class PluginRunError(Exception):
+    """
+    Failure of a single Volatility3 plugin run.
+    """
+
+    def __init__(self, kind, detail, returncode=None, **stats):
+        """
+        :param kind: 'timeout', 'memory' (resident memory limit exceeded), 'exit' (non-zero exit code) or 'error'.
+        :param detail: Description of the failure.
+        :param returncode: Exit code of the plugin process, if any.
+        :param stats: Measurements of the run until the failure, e.g. duration_s, cpu_s or peak_rss_mb.
+        """
+        super().__init__(detail)
+        self.kind = kind
+        self.detail = detail
+        self.returncode = returncode
+        self.stats = stats
+
+    @classmethod
+    def from_exception(cls, exception):
+        """
+        Wraps any exception raised by a plugin run.
+        """
+        if isinstance(exception, cls):
+            return exception
+        return cls("error", str(exception) or type(exception).__name__)
+
+class RunTimer:
+    """
+    Measures the wall-clock and CPU time of a plugin run in the calling thread, used by the in-process engine.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.start = time.monotonic()
+        self.cpu_start = time.thread_time()
+
+    def stats(self):
+        """
+        :return: Dictionary with started_at, finished_at, duration_s and cpu_s.
+        """
+        return {"started_at": self.started_at, "finished_at": time.time(),
+                "duration_s": round(time.monotonic() - self.start, 1),
+                "cpu_s": round(time.thread_time() - self.cpu_start, 1)}
+
+def plugin_result(plugin, status, message, output_file=None, **details):
+    """
+    Builds the structured result of a plugin run. The size and the number of rows of the output file are measured.
+
+    :param plugin: Volatility3 plugin name.
+    :param status: 'done', 'cached', 'failed' or 'skipped'.
+    :param message: Human-readable result shown in the UI.
+    :param output_file: Output file of the plugin, if any.
+    :param details: Further fields, e.g. attempts, started_at, finished_at, duration_s, cpu_s, peak_rss_mb or error.
+    :return: Result dictionary.
+    """
+    result = {"plugin": plugin, "status": status, "message": message, "attempts": 0, "started_at": None,
+              "finished_at": None, "duration_s": None, "cpu_s": None, "peak_rss_mb": None, "output_file": output_file,
+              "output_rows": None, "output_bytes": None, "error": None, **details}
+    if output_file and os.path.isfile(output_file):
+        result["output_bytes"] = os.path.getsize(output_file)
+        result["output_rows"] = count_rows(output_file)
+    return result
+
+def salvaged_rows(output_file):
+    """
+    Counts the rows kept in the JSON Lines output of a failed plugin.
+
+    :param output_file: Output file of the failed plugin.
+    :return: Number of rows, or None if the output is not JSON Lines.
+    """
+    if not output_file or not is_json_lines(output_file):
+        return None
+    return sum(1 for _ in iter_json_lines(output_file))
+
+def failure_result(plugin, error, output_file=None, attempts=1):
+    """
+    Builds the structured result of a failed plugin run.
+
+    :param plugin: Volatility3 plugin name.
+    :param error: PluginRunError of the last attempt.
+    :param output_file: Output file of the plugin, rows written before the failure are counted.
+    :param attempts: Number of attempts made.
+    :return: Result dictionary with status 'failed'.
+    """
+    rows_kept = salvaged_rows(output_file)
+    note = f" ({rows_kept} rows written before the failure are kept)" if rows_kept is not None else ""
+    return plugin_result(
+        plugin, "failed", f"Failure in {plugin}: {error.detail}{note}", output_file, attempts=attempts,
+        error={"kind": error.kind, "detail": error.detail, "returncode": error.returncode, "rows_kept": rows_kept},
+        **error.stats,
+    )
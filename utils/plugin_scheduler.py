@@ -0,0 +1,291 @@
+import os
+import time
+import platform
+from concurrent.futures import ThreadPoolExecutor
+
+from config import volatility_workers, volatility_engine, result_cache_enabled, scheduler_time_budget_s
+from utils.volatility_analysis import bounded_worker_count, run_analysis, run_plugin_with_args, volatility_version
+from utils.result_cache import has_result
+from utils.plugin_results import plugin_result
+from utils.run_manifest import write_manifest
+from utils.output_provenance import plan_incremental, record_outputs
+from utils.artifact_store import convert_outputs
+from utils.artifact_loader import load_rows
+
+# Detect operating system
+os_name = platform.system()
+
+# Define appropriate directories based on OS
+if os_name == "Windows":
+    volatility_output_dir = "O:\\02_volatility_output"
+else:  # Linux/macOS
+    volatility_output_dir = "/tmp/MemoryInvestigator/02_volatility_output"
+
+# Plugins whose output should exist before a plugin runs. The process lists come first, so the tree
+# can be built right away; the expensive plugins wait for the cheap detections flagging processes.
+PLUGIN_DEPENDENCIES = {
+    "windows.pslist": [],
+    "windows.psscan": [],
+    "windows.cmdline": ["windows.pslist"],
+    "windows.getsids": ["windows.pslist"],
+    "windows.netscan": ["windows.pslist"],
+    "windows.netstat": ["windows.pslist"],
+    "windows.svcscan": ["windows.pslist"],
+    "windows.svcdiff": ["windows.svcscan"],
+    "windows.hollowprocesses": ["windows.pslist"],
+    "windows.processghosting": ["windows.pslist"],
+    "windows.suspicious_threads": ["windows.pslist"],
+    "windows.malfind": ["windows.pslist", "windows.psscan", "windows.hollowprocesses", "windows.processghosting", "windows.suspicious_threads"],
+    "windows.ldrmodules": ["windows.pslist", "windows.psscan", "windows.hollowprocesses", "windows.processghosting", "windows.suspicious_threads"],
+    "windows.dlllist": ["windows.pslist", "windows.psscan", "windows.hollowprocesses", "windows.processghosting", "windows.suspicious_threads"],
+}
+
+# Order within a stage, lower values are started first
+PLUGIN_PRIORITIES = {
+    "windows.pslist": 0,
+    "windows.psscan": 1,
+    "windows.hollowprocesses": 2,
+    "windows.suspicious_threads": 2,
+    "windows.processghosting": 3,
+    "windows.cmdline": 3,
+    "windows.netscan": 3,
+    "windows.netstat": 3,
+    "windows.getsids": 4,
+    "windows.svcscan": 4,
+    "windows.svcdiff": 5,
+    "windows.malfind": 6,
+    "windows.ldrmodules": 7,
+    "windows.dlllist": 8,
+}
+
+# Defaults for plugins not listed above
+DEFAULT_DEPENDENCIES = ["windows.pslist"]
+DEFAULT_PRIORITY = 5
+
+# Expensive plugins that first run for the flagged processes only, using their --pid filter
+PID_SCOPED_PLUGINS = ["windows.malfind", "windows.ldrmodules", "windows.dlllist"]
+
+# Cheap plugins whose hits flag a process
+FLAGGING_PLUGINS = ["windows.hollowprocesses", "windows.processghosting", "windows.suspicious_threads"]
+
+# Binaries often abused by intruders
+SUSPICIOUS_IMAGE_NAMES = {
+    "powershell.exe", "pwsh.exe", "cmd.exe", "rundll32.exe", "regsvr32.exe", "mshta.exe", "wscript.exe",
+    "cscript.exe", "certutil.exe", "bitsadmin.exe", "wmic.exe", "msbuild.exe", "installutil.exe",
+}
+
+# Expected parent image names of core Windows processes
+EXPECTED_PARENTS = {
+    "svchost.exe": "services.exe",
+    "services.exe": "wininit.exe",
+    "lsass.exe": "wininit.exe",
+    "lsaiso.exe": "wininit.exe",
+    "taskhostw.exe": "svchost.exe",
+}
+
+def plan_stages(plugins):
+    """
+    Orders plugins into stages along their dependencies (levels of the DAG), each stage sorted by priority.
+    Dependencies on plugins that are not selected are ignored.
+
+    :param plugins: List of Volatility3 plugins.
+    :return: List of stages, each a list of plugins.
+    """
+    selected = set(plugins)
+    remaining = list(dict.fromkeys(plugins))
+    done = set()
+    stages = []
+
+    while remaining:
+        ready = [
+            plugin for plugin in remaining
+            if all(dependency in done or dependency not in selected or dependency == plugin
+                   for dependency in PLUGIN_DEPENDENCIES.get(plugin, DEFAULT_DEPENDENCIES))
+        ]
+        if not ready:
+            raise ValueError(f"Cyclic plugin dependencies between: {', '.join(remaining)}")
+
+        ready.sort(key=lambda plugin: PLUGIN_PRIORITIES.get(plugin, DEFAULT_PRIORITY))
+        stages.append(ready)
+        done.update(ready)
+        remaining = [plugin for plugin in remaining if plugin not in done]
+    return stages
+
+def record_pid(record):
+    """
+    Returns the process ID of a plugin row, whatever the spelling of the column.
+    """
+    return record.get("PID") or record.get("Pid") or record.get("pid")
+
+def flag_suspicious_pids(output_dir=volatility_output_dir):
+    """
+    Flags processes for a prioritised analysis based on the outputs of the cheap plugins: hits of the detection
+    plugins, processes hidden from the active process list, abused binaries and unexpected parent processes.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :return: Sorted list of flagged PIDs.
+    """
+    flagged = set()
+    processes = load_rows(os.path.join(output_dir, "windows.pslist.json"))
+    names = {process.get("PID"): str(process.get("ImageFileName", "")).lower() for process in processes}
+
+    for plugin in FLAGGING_PLUGINS:
+        flagged.update(record_pid(record) for record in load_rows(os.path.join(output_dir, f"{plugin}.json"), ["PID", "Pid", "pid"]))
+
+    # Processes found by the pool scan that are missing in the active process list and did not exit
+    for process in load_rows(os.path.join(output_dir, "windows.psscan.json"), ["PID", "ExitTime"]):
+        if process.get("PID") not in names and not process.get("ExitTime"):
+            flagged.add(process.get("PID"))
+
+    for process in processes:
+        name = names[process.get("PID")]
+        parent_name = names.get(process.get("PPID"))
+        if name in SUSPICIOUS_IMAGE_NAMES:
+            flagged.add(process.get("PID"))
+        elif name in EXPECTED_PARENTS and parent_name and parent_name != EXPECTED_PARENTS[name]:
+            flagged.add(process.get("PID"))
+
+    return sorted(pid for pid in flagged if isinstance(pid, int))
+
+def schedule_analysis(memory_file, plugins, max_workers=volatility_workers, status_callback=None, stage_callback=None,
+                      time_budget=scheduler_time_budget_s, engine=volatility_engine, use_cache=result_cache_enabled,
+                      output_dir=volatility_output_dir, incremental=False):
+    """
+    Runs Volatility3 plugins stage by stage along their dependencies, expensive plugins first for the flagged
+    processes. In incremental mode only plugins whose output is missing or stale are run.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugins: List of Volatility3 plugins to execute.
+    :param max_workers: Maximum number of plugins running in parallel.
+    :param status_callback: Optional function called as status_callback(plugin, status, message) with the status
+                            'queued', 'running', 'done', 'failed' or 'skipped'.
+    :param stage_callback: Optional function called as stage_callback(finished_plugins, flagged_pids) whenever
+                           a stage has landed, e.g. to update the tree.
+    :param time_budget: Optional time budget in seconds.
+    :param engine: 'subprocess' to start vol.py per plugin, 'framework' to use the in-process engine.
+    :param use_cache: Whether to read from and write to the persistent result cache.
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param incremental: Whether to keep the up-to-date outputs of the memory dump instead of running all plugins.
+    :return: List of structured execution results.
+    """
+    started_at = time.time()
+    deadline = time.monotonic() + time_budget if time_budget else None
+    results = []
+    finished = []
+    flagged = []
+
+    def notify(plugin, status, result):
+        # Track finished plugins for the stage callback
+        if status == "done" and plugin not in finished:
+            finished.append(plugin)
+        if status_callback:
+            status_callback(plugin, status, result)
+
+    def budget_left():
+        return deadline is None or time.monotonic() < deadline
+
+    if incremental:
+        plan = plan_incremental(memory_file, plugins, output_dir, volatility_version)
+        for plugin, (state, reason) in plan.items():
+            if state == "current":
+                results.append(plugin_result(plugin, "cached", f"{plugin} is up to date.", os.path.join(output_dir, f"{plugin}.json")))
+                notify(plugin, "done", results[-1]["message"])
+        plugins = [plugin for plugin, (state, reason) in plan.items() if state != "current"]
+
+    stages = plan_stages(plugins)
+    for index, stage in enumerate(stages):
+        if not budget_left():
+            for plugin in [plugin for later_stage in stages[index:] for plugin in later_stage]:
+                results.append(plugin_result(plugin, "skipped", f"{plugin} skipped, time budget exhausted."))
+                notify(plugin, "skipped", results[-1]["message"])
+            break
+
+        # Expensive plugins without a cached full result are split into flagged and remaining processes
+        scoped = []
+        if any(plugin in PID_SCOPED_PLUGINS for plugin in stage):
+            flagged = flag_suspicious_pids(output_dir)
+            scoped = [
+                plugin for plugin in stage
+                if plugin in PID_SCOPED_PLUGINS and flagged
+                and not (use_cache and has_result(memory_file, plugin, None, volatility_version))
+            ]
+
+        unscoped = [plugin for plugin in stage if plugin not in scoped]
+        if unscoped:
+            results += run_analysis(memory_file, unscoped, max_workers, notify, engine=engine, use_cache=use_cache,
+                                    output_dir=output_dir)
+
+        if scoped:
+            results += run_scoped_plugins(memory_file, scoped, flagged, max_workers, notify, stage_callback, finished,
+                                          budget_left, engine, use_cache, output_dir)
+
+        if stage_callback:
+            stage_callback(list(finished), flagged)
+
+    # Outputs of plugins that failed, were skipped or only ran for the flagged processes stay unrecorded, so they are stale
+    incomplete = {result["plugin"] for result in results if result["status"] in ("failed", "skipped") or result.get("partial")}
+    complete = [plugin for plugin in finished if plugin not in incomplete]
+    record_outputs(memory_file, output_dir, complete, volatility_version)
+    convert_outputs(output_dir, complete)
+    write_manifest(memory_file, results, started_at, engine=engine, workers=max_workers, time_budget_s=time_budget,
+                   flagged_pids=flagged, incremental=incremental)
+    return results
+
+def run_scoped_plugins(memory_file, plugins, flagged, max_workers, notify, stage_callback, finished, budget_left,
+                       engine, use_cache, output_dir):
+    """
+    Runs expensive plugins for the flagged processes first and for all processes afterwards. The second run
+    replaces the output of the flagged processes. Parameters as in schedule_analysis.
+
+    :return: List of structured execution results.
+    """
+    processes = load_rows(os.path.join(output_dir, "windows.pslist.json"), ["PID"])
+    remaining = sorted({process.get("PID") for process in processes} - set(flagged))
+    # The scoped runs share the worker budget of the analysis, e.g. the share of one dump in batch mode
+    workers = bounded_worker_count(min(max_workers, len(plugins)))
+
+    def run_flagged(plugin):
+        return run_plugin_with_args(memory_file, plugin, {"pid": flagged}, os.path.join(output_dir, f"{plugin}.json"),
+                                    engine, use_cache)
+
+    for plugin in plugins:
+        notify(plugin, "running", f"flagged processes {flagged}")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        flagged_results = dict(zip(plugins, executor.map(run_flagged, plugins)))
+    results = list(flagged_results.values())
+    succeeded = [plugin for plugin in plugins if flagged_results[plugin]["status"] != "failed"]
+    for plugin in plugins:
+        if plugin not in succeeded:
+            notify(plugin, "failed", flagged_results[plugin]["message"])
+
+    # The flagged processes have landed, update the tree before the remaining processes are analysed
+    if stage_callback and succeeded:
+        stage_callback(finished + succeeded, flagged)
+
+    def run_remaining(plugin):
+        output_file = os.path.join(output_dir, f"{plugin}.json")
+        part_file = f"{output_file}.part"
+        # An unscoped run instead of passing every remaining PID keeps the command line short and is cached as the
+        # regular full result. It repeats the few flagged processes, so it replaces their output instead of adding to it.
+        result = run_plugin_with_args(memory_file, plugin, None, part_file, engine, use_cache)
+        if result["status"] != "failed" and os.path.exists(part_file):
+            os.replace(part_file, output_file)
+        elif os.path.exists(part_file):
+            os.remove(part_file)
+        return result
+
+    if remaining and succeeded and budget_left():
+        for plugin in succeeded:
+            notify(plugin, "running", "all processes")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            remaining_results = dict(zip(succeeded, executor.map(run_remaining, succeeded)))
+        for plugin in succeeded:
+            results.append(remaining_results[plugin])
+            notify(plugin, "failed" if results[-1]["status"] == "failed" else "done", results[-1]["message"])
+    else:
+        for plugin in succeeded:
+            if remaining:
+                results.append(plugin_result(plugin, "done", f"{plugin} only analysed for flagged processes, time budget exhausted.",
+                                             partial=True))
+            notify(plugin, "done", results[-1]["message"] if remaining else flagged_results[plugin]["message"])
+    return results
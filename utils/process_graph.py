@@ -0,0 +1,125 @@
+from utils.artifact_loader import cached, load_rows
+from utils.process_index import ProcessIndex
+
+# Distance of the process levels and of neighbouring processes in the layout, in pixels
+LEVEL_SPACING = 250
+ROW_SPACING = 40
+
+# Hierarchies up to this size are shown completely when no PID is searched
+FULL_GRAPH_NODES = 500
+
+def compute_layout(roots, children):
+    """
+    Lays out the process hierarchy from left to right: every leaf gets its own row, a parent is centered on its
+    children. Runs in linear time without recursion.
+
+    :param roots: List of process keys without a known parent.
+    :param children: Dictionary of child key lists by process key.
+    :return: Dictionary of (x, y) positions by process key.
+    """
+    positions = {}
+    visited = set()
+    next_row = 0
+    for root in roots:
+        visited.add(root)
+        placed = {root: []}
+        stack = [(root, 0, iter(children.get(root, ())))]
+        while stack:
+            key, depth, remaining = stack[-1]
+            child = next((child for child in remaining if child not in visited), None)
+            if child is not None:
+                visited.add(child)
+                placed[key].append(child)
+                placed[child] = []
+                stack.append((child, depth + 1, iter(children.get(child, ()))))
+                continue
+            stack.pop()
+            placed_children = placed.pop(key)
+            if placed_children:
+                y = (positions[placed_children[0]][1] + positions[placed_children[-1]][1]) / 2
+            else:
+                y = next_row * ROW_SPACING
+                next_row += 1
+            positions[key] = (depth * LEVEL_SPACING, y)
+    return positions
+
+def build_graph(rows):
+    """
+    Builds the process hierarchy and its layout from pslist rows, keyed on (PID, CreateTime) as in ProcessIndex.
+
+    :param rows: List of process dictionaries with PID, PPID, ImageFileName, CreateTime and ExitTime.
+    :return: Dictionary with processes, instances by PID, parents, children, roots and positions by process key,
+             node IDs by process key and the list of keys.
+    """
+    index = ProcessIndex(rows)
+    children = dict(index.children)
+    return {
+        "processes": index.records,
+        "instances": dict(index.by_pid),
+        "parents": index.parents,
+        "children": children,
+        "roots": index.roots,
+        "positions": compute_layout(index.roots, children),
+        "ids": {key: str(position) for position, key in enumerate(index.records)},
+        "keys": list(index.records),
+    }
+
+def load_graph(file_path):
+    """
+    Loads the process hierarchy with its layout through the artifact cache.
+
+    :param file_path: Path of the pslist output.
+    :return: Graph dictionary, see build_graph, or None if there are no processes.
+    """
+    def build():
+        rows = load_rows(file_path, ["PID", "PPID", "ImageFileName", "CreateTime", "ExitTime"])
+        return build_graph(rows) if rows else None
+    return cached("graph", file_path, None, build)
+
+def descendants(graph, keys, depth):
+    """
+    Collects the descendants of processes down to a number of levels.
+
+    :param graph: Graph dictionary, see build_graph.
+    :param keys: Process keys to start from.
+    :param depth: Number of levels.
+    :return: Set of descendant keys.
+    """
+    found = set()
+    level = list(keys)
+    for _ in range(depth):
+        level = [child for key in level for child in graph["children"].get(key, ()) if child not in found]
+        found.update(level)
+    return found
+
+def neighbourhood(graph, pid=None, depth=2, expanded=()):
+    """
+    Selects the processes to show: the ancestors, siblings and descendants of every instance of a PID, or the top
+    levels of the hierarchy without a PID, plus the children of expanded processes.
+
+    :param graph: Graph dictionary, see build_graph.
+    :param pid: Optional PID in the center of the neighbourhood.
+    :param depth: Number of descendant levels.
+    :param expanded: Process keys whose children are shown as well, in the order they were expanded.
+    :return: Set of process keys to show.
+    """
+    parents = graph["parents"]
+    if pid in graph["instances"]:
+        shown = set(graph["instances"][pid])
+        for key in graph["instances"][pid]:
+            ancestor = parents.get(key)
+            while ancestor is not None and ancestor not in shown:
+                shown.add(ancestor)
+                ancestor = parents.get(ancestor)
+            if key in parents:
+                shown.update(graph["children"][parents[key]])
+        shown |= descendants(graph, graph["instances"][pid], depth)
+    elif len(graph["processes"]) <= FULL_GRAPH_NODES:
+        shown = set(graph["processes"])
+    else:
+        shown = set(graph["roots"]) | descendants(graph, graph["roots"], depth)
+
+    for expanded_key in expanded:
+        if expanded_key in shown:
+            shown.update(graph["children"].get(expanded_key, ()))
+    return shown
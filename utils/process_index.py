@@ -0,0 +1,117 @@
+from bisect import bisect_right
+from collections import defaultdict
+
+def time_order(timestamp):
+    """
+    Returns a sort key for a CreateTime or ExitTime of Volatility3. Times are ISO 8601 text in UTC and sort as text,
+    missing times sort first.
+
+    :param timestamp: Time text or None.
+    :return: Sort key.
+    """
+    return "" if timestamp is None else str(timestamp)
+
+class ProcessIndex:
+    """
+    Process records of pslist or psscan keyed on (PID, CreateTime), so a process reusing a PID is kept apart.
+    The parent is the instance of the PPID created last before the process and not exited at that time.
+    """
+
+    def __init__(self, rows):
+        """
+        :param rows: Iterable of process dictionaries with PID, PPID, CreateTime and ExitTime.
+        """
+        self.records = {}  # Process records by key, in the order of the output
+        for row in rows:
+            self.records.setdefault(self.key(row), row)
+
+        # Instances of every PID in creation order
+        self.by_pid = defaultdict(list)
+        for key in self.records:
+            self.by_pid[key[0]].append(key)
+        for keys in self.by_pid.values():
+            keys.sort(key=lambda key: time_order(key[1]))
+        self.create_times = {pid: [time_order(key[1]) for key in keys] for pid, keys in self.by_pid.items()}
+
+        self.parents = {}
+        self.children = defaultdict(list)
+        for key, row in self.records.items():
+            parent = self.resolve_parent(key, row.get("PPID"))
+            if parent is not None:
+                self.parents[key] = parent
+        self.break_cycles()
+        for key, parent in self.parents.items():
+            self.children[parent].append(key)
+        for keys in self.children.values():
+            keys.sort(key=lambda key: time_order(key[1]))
+        self.roots = [key for key in self.records if key not in self.parents]
+
+    @staticmethod
+    def key(row):
+        """
+        Returns the key of a process record.
+
+        :param row: Process dictionary.
+        :return: Tuple (PID, CreateTime).
+        """
+        return row.get("PID"), row.get("CreateTime")
+
+    def resolve_parent(self, key, ppid):
+        """
+        Finds the parent instance of a process.
+
+        :param key: Key of the process.
+        :param ppid: PPID of the process.
+        :return: Key of the parent, or None if it is not in the index.
+        """
+        candidates = self.by_pid.get(ppid)
+        if not candidates:
+            return None
+        created = time_order(key[1])
+        # Without a CreateTime the order is unknown, the latest instance is the best guess
+        position = bisect_right(self.create_times[ppid], created) if created else len(candidates)
+        while position > 0:
+            parent = candidates[position - 1]
+            exit_time = self.records[parent].get("ExitTime")
+            if parent != key and (not created or exit_time is None or time_order(exit_time) >= created):
+                return parent
+            position -= 1
+        return None
+
+    def break_cycles(self):
+        """
+        Breaks parent cycles, only possible with missing or equal CreateTimes, by turning one member of each into
+        a root.
+        """
+        state = {}  # 1 while a chain of parents is followed, 2 once it is known to end
+        for start in self.records:
+            chain = []
+            key = start
+            while key is not None and key not in state:
+                state[key] = 1
+                chain.append(key)
+                key = self.parents.get(key)
+            if key is not None and state[key] == 1:
+                del self.parents[key]
+            for member in chain:
+                state[member] = 2
+
+    def instances(self, pid):
+        """
+        Returns all instances of a PID in creation order.
+
+        :param pid: Process ID.
+        :return: List of keys.
+        """
+        return list(self.by_pid.get(pid, ()))
+
+    def latest(self, pid):
+        """
+        Returns the instance of a PID other plugins report on, the one created last. A PID is only reused after its
+        process exited, so a running instance is always the last one.
+
+        :param pid: Process ID.
+        :return: Key, or None if the PID is not in the index.
+        """
+        keys = self.by_pid.get(pid)
+        return keys[-1] if keys else None
@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import uuid
+import platform
+import threading
+
+from config import result_cache_max_size_mb
+from utils.fingerprint import dump_hash, fast_fingerprint, known_dump_hash, start_background_fingerprint
+
+# Detect operating system
+os_name = platform.system()
+
+# Define a persistent cache directory outside the session drive, so "Renew Environment" keeps the results
+if os_name == "Windows":
+    cache_dir = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "MemoryInvestigator", "result_cache")
+else:  # Linux/macOS
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "MemoryInvestigator", "result_cache")
+
+index_file = os.path.join(cache_dir, "index.json")
+objects_dir = os.path.join(cache_dir, "objects")
+
+# Serializes all index updates, plugins finish in parallel worker threads
+_lock = threading.RLock()
+
+# Stores waiting for the full hash of their dump
+_pending_stores = []
+
+def cache_key(fingerprint, plugin, args, version):
+    """
+    Builds the content address of a plugin result.
+
+    :param fingerprint: Fingerprint of the memory dump.
+    :param plugin: Volatility3 plugin name.
+    :param args: Plugin arguments (e.g. {"virtaddr": 1234}) or None.
+    :param version: Volatility3 version.
+    :return: Hex digest used as cache key.
+    """
+    payload = json.dumps([fingerprint, plugin, args or {}, version], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def load_index():
+    """
+    Loads the cache index.
+
+    :return: Dictionary of cache entries by key.
+    """
+    try:
+        with open(index_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_index(index):
+    """
+    Saves the cache index atomically.
+
+    :param index: Dictionary of cache entries by key.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=4)
+    os.replace(temp_file, index_file)
+
+def find_entry(memory_file, plugin, args, version):
+    """
+    Finds the cache entry of a plugin result. Entries are keyed on the full hash of the dump, the sampled fast
+    fingerprint only rules out misses. While the full hash is not known yet, it is started in the background and
+    the lookup misses instead of waiting.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin name.
+    :param args: Plugin arguments or None.
+    :param version: Volatility3 version.
+    :return: Tuple (key, entry), or None on a cache miss.
+    """
+    fingerprint = fast_fingerprint(memory_file)
+    stored_args = json.loads(json.dumps(args or {}))  # As stored in the index
+    with _lock:
+        index = load_index()
+    if not any(entry["fingerprint"] == fingerprint and entry["plugin"] == plugin and entry["args"] == stored_args
+               and entry["version"] == version for entry in index.values()):
+        return None
+
+    full = known_dump_hash(memory_file)
+    if full is None:
+        start_background_fingerprint(memory_file)
+        return None
+    key = cache_key(full, plugin, args, version)
+    entry = index.get(key)
+    if entry is None or entry.get("full_fingerprint") != full:
+        return None
+    return key, entry
+
+def has_result(memory_file, plugin, args, version):
+    """
+    Checks whether a plugin result is cached, without restoring it.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin name.
+    :param args: Plugin arguments or None.
+    :param version: Volatility3 version.
+    :return: True if the result is cached.
+    """
+    found = find_entry(memory_file, plugin, args, version)
+    return found is not None and all(os.path.exists(os.path.join(objects_dir, found[0], name)) for name in found[1]["files"])
+
+def lookup_result(memory_file, plugin, args, version, target):
+    """
+    Copies a cached plugin result to its target location.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin name.
+    :param args: Plugin arguments or None.
+    :param version: Volatility3 version.
+    :param target: Output file for a single result file, or output directory for plugins writing several files.
+    :return: List of restored file paths, or None on a cache miss.
+    """
+    found = find_entry(memory_file, plugin, args, version)
+    if found is None:
+        return None
+    key, entry = found
+
+    # Results can be several GB, they are copied without holding the lock
+    entry_dir = os.path.join(objects_dir, key)
+    restored = []
+    try:
+        for name in entry["files"]:
+            destination = target if entry["single_file"] else os.path.join(target, name)
+            os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+            # Replace instead of overwriting, the destination may be linked to the extraction index store
+            shutil.copyfile(os.path.join(entry_dir, name), f"{destination}.tmp")
+            os.replace(f"{destination}.tmp", destination)
+            restored.append(destination)
+    except FileNotFoundError:
+        # The stored files were evicted meanwhile or removed by hand, forget the entry
+        with _lock:
+            index = load_index()
+            if index.get(key, {}).get("created") == entry["created"]:
+                index.pop(key)
+                save_index(index)
+        return None
+
+    with _lock:
+        index = load_index()
+        if key in index:
+            index[key]["last_access"] = time.time()
+            index[key]["hits"] = index[key].get("hits", 0) + 1
+            save_index(index)
+    return restored
+
+def store_result(memory_file, plugin, args, version, source):
+    """
+    Stores a plugin result in the cache under the full hash of the dump and evicts the least recently used entries
+    if the cache is too large. The files are staged right away; if the full hash is still computed, the entry is
+    added by a background thread once it is known, so the caller does not wait for the dump to be hashed.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin name.
+    :param args: Plugin arguments or None.
+    :param version: Volatility3 version.
+    :param source: Output file of the plugin, or a list of files written by the plugin.
+    """
+    fingerprint = fast_fingerprint(memory_file)
+    single_file = isinstance(source, str)
+    files = [source] if single_file else list(source)
+
+    # Copy into a staging directory first, the outputs may be changed or moved before the hash is known
+    staging_dir = os.path.join(objects_dir, f"pending.{uuid.uuid4().hex}.tmp")
+    os.makedirs(staging_dir)
+    try:
+        for path in files:
+            shutil.copyfile(path, os.path.join(staging_dir, os.path.basename(path)))
+    except OSError:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    entry = {
+        "fingerprint": fingerprint,
+        "dump": os.path.basename(memory_file),
+        "plugin": plugin,
+        "args": args or {},
+        "version": version,
+        "single_file": single_file,
+        "files": [os.path.basename(path) for path in files],
+        "size": sum(os.path.getsize(os.path.join(staging_dir, os.path.basename(path))) for path in files),
+    }
+    full = known_dump_hash(memory_file)
+    if full is not None:
+        commit_entry(staging_dir, entry, full)
+        return
+
+    def wait_and_commit():
+        try:
+            start_background_fingerprint(memory_file).join()
+            # The dump was replaced while it was hashed, the result does not belong to it
+            if fast_fingerprint(memory_file) != fingerprint:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return
+            commit_entry(staging_dir, entry, dump_hash(memory_file))
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        finally:
+            with _lock:
+                _pending_stores.remove(thread)
+
+    thread = threading.Thread(target=wait_and_commit, name=f"cache-{plugin}", daemon=True)
+    with _lock:
+        _pending_stores.append(thread)
+    thread.start()
+
+def commit_entry(staging_dir, entry, full):
+    """
+    Moves staged result files into the cache and adds their entry to the index.
+
+    :param staging_dir: Directory holding the staged result files.
+    :param entry: Entry dictionary without its full hash and timestamps.
+    :param full: Full hash of the memory dump.
+    """
+    key = cache_key(full, entry["plugin"], entry["args"], entry["version"])
+    with _lock:
+        entry_dir = os.path.join(objects_dir, key)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(staging_dir, entry_dir)
+
+        index = load_index()
+        index[key] = {**entry, "full_fingerprint": full, "created": time.time(), "last_access": time.time(), "hits": 0}
+        evict(index)
+        save_index(index)
+
+def wait_for_pending_stores(timeout=None):
+    """
+    Waits until all stores waiting for the full hash of their dump are added to the cache.
+
+    :param timeout: Maximum number of seconds to wait per store, or None to wait until they are done.
+    """
+    with _lock:
+        threads = list(_pending_stores)
+    for thread in threads:
+        thread.join(timeout)
+
+def evict(index, max_size_mb=result_cache_max_size_mb):
+    """
+    Removes the least recently used entries until the cache fits into its size limit.
+
+    :param index: Dictionary of cache entries by key, modified in place.
+    :param max_size_mb: Maximum cache size in MB.
+    """
+    total_size = sum(entry["size"] for entry in index.values())
+    for key, entry in sorted(index.items(), key=lambda item: item[1]["last_access"]):
+        if total_size <= max_size_mb * 1024 * 1024:
+            break
+        shutil.rmtree(os.path.join(objects_dir, key), ignore_errors=True)
+        total_size -= entry["size"]
+        index.pop(key)
+
+def list_cache_entries():
+    """
+    Lists all cached plugin results, most recently used first.
+
+    :return: List of entry dictionaries including their key.
+    """
+    with _lock:
+        index = load_index()
+    entries = [{"key": key, **entry} for key, entry in index.items()]
+    return sorted(entries, key=lambda entry: entry["last_access"], reverse=True)
+
+def cache_size():
+    """
+    Returns the total size of all cached plugin results.
+
+    :return: Size in bytes.
+    """
+    with _lock:
+        return sum(entry["size"] for entry in load_index().values())
+
+def purge_cache(fingerprint=None, plugin=None):
+    """
+    Removes cached plugin results, optionally only those of one memory dump or one plugin.
+
+    :param fingerprint: Only purge entries of the memory dump with this fingerprint.
+    :param plugin: Only purge entries of this plugin.
+    :return: Number of removed entries.
+    """
+    with _lock:
+        index = load_index()
+        removed = [
+            key for key, entry in index.items()
+            if (fingerprint is None or entry["fingerprint"] == fingerprint) and (plugin is None or entry["plugin"] == plugin)
+        ]
+        for key in removed:
+            shutil.rmtree(os.path.join(objects_dir, key), ignore_errors=True)
+            index.pop(key)
+        save_index(index)
+    return len(removed)
@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import uuid
+import platform
+import psutil
+
+from config import volatility_output_format
+from utils.fingerprint import fast_fingerprint
+
+# Detect operating system
+os_name = platform.system()
+
+# Define a persistent manifest directory outside the session drive, so runs can be compared across cases
+if os_name == "Windows":
+    manifest_dir = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "MemoryInvestigator", "manifests")
+else:  # Linux/macOS
+    manifest_dir = os.path.join(os.path.expanduser("~"), ".cache", "MemoryInvestigator", "manifests")
+
+def write_manifest(memory_file, results, started_at, **settings):
+    """
+    Writes the manifest of an analysis run with the measurements of every plugin run.
+
+    :param memory_file: Path to the memory dump file.
+    :param results: List of structured plugin results.
+    :param started_at: Start time of the run as UNIX timestamp.
+    :param settings: Settings of the run, e.g. engine or workers.
+    :return: Path of the written manifest.
+    """
+    fingerprint = fast_fingerprint(memory_file)
+    finished_at = time.time()
+    # Milliseconds and a random suffix keep parallel runs of the same dump apart, e.g. in batch mode
+    started = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started_at))}-{int(started_at * 1000) % 1000:03d}"
+    manifest = {
+        "run_id": f"{started}-{fingerprint[:12]}-{uuid.uuid4().hex[:6]}",
+        "dump": os.path.basename(memory_file),
+        "dump_size": os.path.getsize(memory_file),
+        "fingerprint": fingerprint,
+        "output_format": volatility_output_format,
+        "host": {"cpus": os.cpu_count(), "memory_mb": psutil.virtual_memory().total // (1024 * 1024)},
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "duration_s": round(finished_at - started_at, 1),
+        **settings,
+        "plugins": results,
+    }
+
+    os.makedirs(manifest_dir, exist_ok=True)
+    manifest_file = os.path.join(manifest_dir, f"{manifest['run_id']}.json")
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest_file
+
+def load_manifests():
+    """
+    Loads all run manifests, newest first.
+
+    :return: List of manifest dictionaries.
+    """
+    manifests = []
+    if os.path.isdir(manifest_dir):
+        for name in os.listdir(manifest_dir):
+            try:
+                with open(os.path.join(manifest_dir, name), "r", encoding="utf-8") as f:
+                    manifests.append(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                continue  # Skip a manifest that is being written or was damaged
+    return sorted(manifests, key=lambda manifest: manifest["started_at"], reverse=True)
+
+def plugin_rows(manifests):
+    """
+    Flattens the plugin runs of several manifests into table rows.
+
+    :param manifests: List of manifest dictionaries.
+    :return: List of row dictionaries, one per plugin run.
+    """
+    rows = []
+    for manifest in manifests:
+        for result in manifest["plugins"]:
+            error = result.get("error") or {}
+            rows.append({
+                "Run": manifest["run_id"],
+                "Memory Dump": manifest["dump"],
+                "Dump Size (GB)": round(manifest["dump_size"] / 1024 ** 3, 2),
+                "Engine": manifest.get("engine"),
+                "Plugin": result["plugin"],
+                "Status": result["status"],
+                "Attempts": result.get("attempts"),
+                "Start": result.get("started_at"),
+                "End": result.get("finished_at"),
+                "Wall Time (s)": result.get("duration_s"),
+                "CPU Time (s)": result.get("cpu_s"),
+                "Peak RSS (MB)": result.get("peak_rss_mb"),
+                "Rows": result.get("output_rows"),
+                "Output (MB)": round(result["output_bytes"] / (1024 * 1024), 2) if result.get("output_bytes") is not None else None,
+                "Failure": error.get("kind"),
+            })
+    return rows
@@ -0,0 +1,275 @@
+import os
+import re
+import json
+import threading
+
+import numpy as np
+
+from utils.artifact_loader import cached
+from utils.artifact_store import ArtifactStream, is_complete, source_stamp, take_rows
+
+# Terms of a query: quoted phrases or words, a trailing '*' makes a word a prefix
+QUERY_TERMS = re.compile(r'"([^"]+)"|(\S+)')
+
+# Cells of a row are joined with a character no query contains, so no match spans two cells
+CELL_SEPARATOR = "\t"
+
+# Version of the partition format, partitions of another version are built again
+FORMAT = "search-partition/3"
+
+# Serializes builds of the same partitions by pages and reruns
+_lock = threading.Lock()
+
+def index_dir(output_dir):
+    """
+    Returns the directory of the search index of an output directory, next to it like the columnar files.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :return: Path of the index directory.
+    """
+    output_dir = os.path.normpath(output_dir)
+    return os.path.join(os.path.dirname(output_dir), f"{os.path.basename(output_dir)}_search")
+
+def partition_file(output_file):
+    """
+    Returns the index partition of a Volatility3 output file, every output is indexed on its own.
+
+    :param output_file: Path of the JSON output file.
+    :return: Path of the partition.
+    """
+    name = os.path.splitext(os.path.basename(output_file))[0]
+    return os.path.join(index_dir(os.path.dirname(output_file)), f"{name}.idx")
+
+def cell_values(value):
+    """
+    Collects the scalar values of a cell, nested rows ('__children') included.
+
+    :param value: Value of a cell.
+    :return: Generator of the values as text.
+    """
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from cell_values(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from cell_values(item)
+    elif value is not None:
+        yield str(value)
+
+def row_text(record):
+    """
+    Returns the searchable text of a row: all its values, lower-case.
+    """
+    return CELL_SEPARATOR.join(cell_values(record)).lower()
+
+def row_pid(record):
+    """
+    Returns the PID of a row, the plugins name the column differently.
+    """
+    return (record.get("PID") or record.get("Pid") or record.get("pid")) if isinstance(record, dict) else None
+
+def trigrams(text):
+    """
+    Returns the set of trigrams of a text.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def build_partition(output_file):
+    """
+    Indexes every row of an output file by the trigrams of its text. The rows are streamed, so only the index grows.
+    The text itself is not stored, candidates are verified on the rows of the output.
+
+    :param output_file: Path of the JSON output file.
+    :return: Tuple (header with the source stamp, the number of rows and the start and length of the postings of
+             every trigram, array of all postings).
+    """
+    count, postings = 0, {}
+    for row, record in enumerate(ArtifactStream(output_file)):
+        count += 1
+        for trigram in trigrams(row_text(record)):
+            postings.setdefault(trigram, []).append(row)
+
+    # Row numbers take two bytes up to 65536 rows, four beyond
+    dtype = np.dtype(np.uint16 if count <= 2 ** 16 else np.uint32)
+    table, start = {}, 0
+    for trigram, rows in postings.items():
+        table[trigram] = [start, len(rows)]
+        start += len(rows)
+    array = np.fromiter((row for rows in postings.values() for row in rows), dtype=dtype, count=start)
+    header = {"format": FORMAT, "stamp": source_stamp(output_file), "dtype": dtype.name, "rows": count, "trigrams": table}
+    return header, array
+
+def write_partition(path, header, array):
+    """
+    Writes a partition atomically: the header as one line of JSON, followed by the postings as raw array.
+
+    :param path: Path of the partition.
+    :param header: Header dictionary, see build_partition.
+    :param array: Array of all postings.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(array.tobytes())
+    os.replace(f"{path}.tmp", path)
+
+def read_partition(path):
+    """
+    Reads the header of a partition, the postings stay on disk and are read per trigram.
+
+    :param path: Path of the partition.
+    :return: Partition dictionary with the path and the file offset of the postings, or None if it is missing or
+             of another format.
+    """
+    try:
+        with open(path, "rb") as f:
+            partition = json.loads(f.readline())
+            partition.update(path=path, offset=f.tell())
+    except (FileNotFoundError, ValueError):
+        return None
+    return partition if partition.get("format") == FORMAT else None
+
+def read_postings(partition, file, trigram):
+    """
+    Reads the sorted row numbers of a trigram from an open partition file.
+
+    :param partition: Partition dictionary.
+    :param file: Partition file opened in binary mode.
+    :param trigram: Trigram to look up.
+    :return: Array of row numbers.
+    """
+    dtype = np.dtype(partition["dtype"])
+    start, length = partition["trigrams"].get(trigram, (0, 0))
+    file.seek(partition["offset"] + start * dtype.itemsize)
+    return np.frombuffer(file.read(length * dtype.itemsize), dtype=dtype)
+
+def load_partition(output_file, build=True):
+    """
+    Loads the index partition of an output file, building it first if the complete output changed since.
+
+    :param output_file: Path of the JSON output file.
+    :param build: Whether a missing or outdated partition is built.
+    :return: Partition dictionary, or None for incomplete outputs or if building is not allowed.
+    """
+    if not is_complete(output_file):
+        return None
+    path = partition_file(output_file)
+    partition = cached("search", path, None, lambda: read_partition(path))
+    if partition is not None and partition["stamp"] == source_stamp(output_file):
+        return partition
+    if not build:
+        return None
+
+    with _lock:
+        write_partition(path, *build_partition(output_file))
+    return cached("search", path, None, lambda: read_partition(path))
+
+def parse_query(query):
+    """
+    Splits a query into terms, a term ending in '*' is a prefix and a quoted phrase one term.
+
+    :param query: Query text.
+    :return: List of tuples (lower-case term, whether it is a prefix).
+    """
+    terms = []
+    for phrase, word in QUERY_TERMS.findall(query):
+        term = (phrase or word).lower()
+        prefix = not phrase and term.endswith("*") and len(term) > 1
+        terms.append((term[:-1] if prefix else term, prefix))
+    return [(term, prefix) for term, prefix in terms if term]
+
+def match_partition(partition, output_file, terms):
+    """
+    Finds the rows of a partition matching all terms, the candidates of the trigrams are verified on the rows of
+    the output.
+
+    :param partition: Partition dictionary.
+    :param output_file: Path of the JSON output file of the partition.
+    :param terms: Parsed query terms.
+    :return: List of tuples (row number, row dictionary) of the matching rows, sorted by row number.
+    """
+    candidates = None
+    query_trigrams = {trigram for term, _ in terms for trigram in trigrams(term)}
+    if query_trigrams:
+        # The rarest trigrams first, so the candidates shrink early
+        with open(partition["path"], "rb") as f:
+            for trigram in sorted(query_trigrams, key=lambda trigram: partition["trigrams"].get(trigram, (0, 0))[1]):
+                rows = read_postings(partition, f, trigram)
+                candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+                if not len(candidates):
+                    return []
+    candidates = list(range(partition["rows"])) if candidates is None else candidates.tolist()
+
+    patterns = [re.compile(r"(?<![0-9a-z_])" + re.escape(term)) if prefix else None for term, prefix in terms]
+    matches = []
+    for row, record in zip(candidates, take_rows(output_file, candidates)):
+        text = row_text(record)
+        if all(pattern.search(text) if pattern else term in text for (term, _), pattern in zip(terms, patterns)):
+            matches.append((row, record))
+    return matches
+
+def search_rows(output_file, query):
+    """
+    Searches the rows of one output file, e.g. to filter its table.
+
+    :param output_file: Path of the JSON output file.
+    :param query: Query text.
+    :return: Sorted list of matching row numbers, or None if the output is not complete and cannot be indexed.
+    """
+    partition = load_partition(output_file)
+    if partition is None:
+        return None
+    terms = parse_query(query)
+    if not terms:
+        return list(range(partition["rows"]))
+    return [row for row, _ in match_partition(partition, output_file, terms)]
+
+def indexable_outputs(output_dirs):
+    """
+    Lists the output files of the given directories.
+
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :return: List of output file paths.
+    """
+    return [os.path.join(output_dir, name) for output_dir in output_dirs if os.path.isdir(output_dir)
+            for name in sorted(os.listdir(output_dir)) if name.endswith(".json")]
+
+def update_index(output_dirs, progress_callback=None):
+    """
+    Builds the partitions of all complete outputs that are not indexed yet or changed since.
+
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :param progress_callback: Optional function called as progress_callback(done, total, output_file).
+    :return: Number of indexed outputs.
+    """
+    outputs = [output_file for output_file in indexable_outputs(output_dirs) if is_complete(output_file)]
+    for done, output_file in enumerate(outputs, start=1):
+        load_partition(output_file)
+        if progress_callback:
+            progress_callback(done, len(outputs), output_file)
+    return len(outputs)
+
+def search_all(output_dirs, query, limit=1000):
+    """
+    Searches all indexed outputs. Outputs that are not indexed yet are left out, see update_index.
+
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :param query: Query text.
+    :param limit: Maximum number of hits per output.
+    :return: Tuple (list of hits with plugin, output file, PID and row, matches by plugin).
+    """
+    terms = parse_query(query)
+    hits, counts = [], {}
+    if not terms:
+        return hits, counts
+    for output_file in indexable_outputs(output_dirs):
+        partition = load_partition(output_file, build=False)
+        if partition is None:
+            continue
+        plugin = os.path.splitext(os.path.basename(output_file))[0]
+        matches = match_partition(partition, output_file, terms)
+        if matches:
+            counts[plugin] = len(matches)
+        hits += [{"plugin": plugin, "output_file": output_file, "pid": row_pid(record), "row": row}
+                 for row, record in matches[:limit]]
+    return hits, counts
@@ -10,18 +10,19 @@ if os_name == "Windows":
 else:  # Linux/macOS
     tree_directory = "/tmp/MemoryInvestigator/03_trees"
 
-def choose_basic_or_costume_tree():
+def choose_basic_or_costume_tree(directory=tree_directory):
     """
     Determines which system analysis tree file to use, prioritizing the customized tree if available.
 
+    :param directory: Directory of the tree files.
     :return: The path to the selected JSON tree file, or None if no tree exists.
     """
     file1 = "basic_system_analysis_tree.json"
     file2 = "costume_system_analysis_tree.json"
 
     # Construct full file paths
-    file1_tree = os.path.join(tree_directory, file1)
-    file2_tree = os.path.join(tree_directory, file2)
+    file1_tree = os.path.join(directory, file1)
+    file2_tree = os.path.join(directory, file2)
 
     # Check if the files exist
     file1_exists = os.path.isfile(file1_tree)
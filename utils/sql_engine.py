@@ -0,0 +1,231 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # Optional, SQLite from the standard library is used without it
+    duckdb = None
+
+from utils.artifact_loader import load_frame, load_rows
+from utils.artifact_store import columnar_file, convert_output
+from utils.volatility_analysis import analyzed_volatility_output, data_extraction_output
+
+# Outputs of the analysis and the file scan are queried together
+OUTPUT_DIRS = [analyzed_volatility_output, data_extraction_output]
+
+# Common forensic pivots across plugins, table names are the plugin names without 'windows.'
+SAVED_QUERIES = {
+    "Network connections with the command line of their owner": """
+SELECT n."PID", n."Owner", n."Proto", n."LocalAddr", n."LocalPort", n."ForeignAddr", n."ForeignPort", n."State", c."Args"
+FROM netscan n
+LEFT JOIN cmdline c ON c."PID" = n."PID"
+ORDER BY n."PID"
+""",
+    "Malfind hits with the loader module lists of the region": """
+SELECT m."PID", m."Process", m."Start VPN", m."Protection", l."InLoad", l."InInit", l."InMem", l."MappedPath"
+FROM malfind m
+LEFT JOIN ldrmodules l ON l."Pid" = m."PID" AND l."Base" = m."Start VPN"
+ORDER BY m."PID"
+""",
+    "Services with the SIDs of their process": """
+SELECT s."PID", s."Name" AS "Service", s."State", s."Binary", g."SID", g."Name" AS "Account"
+FROM svcscan s
+JOIN getsids g ON g."PID" = s."PID"
+WHERE s."PID" IS NOT NULL
+ORDER BY s."PID"
+""",
+    "Processes by number of loaded DLLs": """
+SELECT p."PID", p."ImageFileName", COUNT(d."Path") AS "DLLs"
+FROM pslist p
+LEFT JOIN dlllist d ON d."PID" = p."PID"
+GROUP BY p."PID", p."ImageFileName"
+ORDER BY "DLLs" DESC
+""",
+    "Start order of the children of every parent process": """
+SELECT "PPID", "PID", "ImageFileName", "CreateTime",
+       ROW_NUMBER() OVER (PARTITION BY "PPID" ORDER BY "CreateTime") AS "Child"
+FROM pslist
+ORDER BY "PPID", "Child"
+""",
+}
+
+# Connection with the registered outputs, rebuilt whenever an output changes
+_engine = {"stamps": None, "backend": None, "connection": None}
+_lock = threading.RLock()
+
+# Connections in use by running queries with their number of users, a replaced connection is closed by its last user
+_users = {}
+
+def table_name(output_file):
+    """
+    Returns the table name of an output file: the plugin name without 'windows.', dots replaced by underscores.
+
+    :param output_file: Path of the JSON output file.
+    :return: Table name.
+    """
+    plugin = os.path.splitext(os.path.basename(output_file))[0]
+    plugin = plugin[len("windows."):] if plugin.startswith("windows.") else plugin
+    return re.sub(r"\W", "_", plugin)
+
+def output_tables(output_dirs=OUTPUT_DIRS):
+    """
+    Lists the Volatility3 outputs of the case by table name.
+
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :return: Dictionary of output files by table name.
+    """
+    return {table_name(name): os.path.join(output_dir, name) for output_dir in output_dirs if os.path.isdir(output_dir)
+            for name in sorted(os.listdir(output_dir)) if name.endswith(".json") and name != "extraction_index.json"}
+
+def sql_frame(output_file):
+    """
+    Loads an output as a DataFrame SQLite can store: nested values become JSON text, and integers beyond the
+    signed 64-bit range (kernel addresses) become text.
+
+    :param output_file: Path of the JSON output file.
+    :return: DataFrame.
+    """
+    df = load_frame(output_file)
+    df = pd.DataFrame(load_rows(output_file)) if df is None else df.copy()
+    for column in df.columns:
+        if df[column].dtype == "uint64":
+            df[column] = df[column].astype(str) if (df[column] > 2 ** 63 - 1).any() else df[column].astype("int64")
+        elif df[column].dtype == object:
+            df[column] = df[column].map(lambda value: json.dumps(value) if isinstance(value, (list, dict)) else
+                                        str(value) if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63 else value)
+    return df
+
+def build_connection(tables):
+    """
+    Registers all outputs as tables. DuckDB reads complete outputs straight from their Parquet files, all other
+    outputs are loaded once into the in-memory database.
+
+    :param tables: Dictionary of output files by table name.
+    :return: Tuple (backend name, connection).
+    """
+    if duckdb is not None:
+        connection = duckdb.connect(":memory:")
+        for name, output_file in tables.items():
+            parquet_file = convert_output(output_file)
+            if parquet_file:
+                connection.execute(f"CREATE VIEW \"{name}\" AS SELECT * FROM read_parquet('{parquet_file.replace(chr(39), chr(39) * 2)}')")
+            else:
+                connection.register("output_frame", sql_frame(output_file))
+                connection.execute(f"CREATE TABLE \"{name}\" AS SELECT * FROM output_frame")
+                connection.unregister("output_frame")
+        return "DuckDB", connection
+
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    for name, output_file in tables.items():
+        sql_frame(output_file).to_sql(name, connection, index=False)
+    return "SQLite", connection
+
+def file_stamp(path):
+    """
+    Returns size and modification time of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def retire_connection():
+    """
+    Replaces the current connection by none. It is closed at once if no query uses it, otherwise by its last query.
+    """
+    connection = _engine["connection"]
+    if connection is not None and id(connection) not in _users:
+        connection.close()
+    _engine.update(stamps=None, backend=None, connection=None)
+
+def connect(output_dirs=OUTPUT_DIRS):
+    """
+    Returns the connection with all outputs of the case registered as tables, built once per version of the outputs.
+    The version is taken from the stats of the outputs and their Parquet files, nothing is read.
+
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :return: Tuple (backend name, connection).
+    """
+    tables = output_tables(output_dirs)
+    stamps = [(name, file_stamp(output_file), file_stamp(columnar_file(output_file))) for name, output_file in tables.items()]
+    with _lock:
+        if _engine["stamps"] != stamps:
+            retire_connection()
+            backend, connection = build_connection(tables)
+            _engine.update(stamps=stamps, backend=backend, connection=connection)
+        return _engine["backend"], _engine["connection"]
+
+@contextmanager
+def use_connection(output_dirs=OUTPUT_DIRS):
+    """
+    Holds the current connection while queries run on it, so rebuilding it for changed outputs never closes it
+    under the cursors of other sessions.
+
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :return: Context manager yielding a tuple (backend name, connection).
+    """
+    with _lock:
+        backend, connection = connect(output_dirs)
+        _users[id(connection)] = _users.get(id(connection), 0) + 1
+    try:
+        yield backend, connection
+    finally:
+        with _lock:
+            _users[id(connection)] -= 1
+            if not _users[id(connection)]:
+                del _users[id(connection)]
+                if connection is not _engine["connection"]:
+                    connection.close()
+
+def reset_connection():
+    """
+    Drops the connection, the tables are registered again by the next query, e.g. after a query changed them.
+    """
+    with _lock:
+        retire_connection()
+
+def run_query(sql, output_dirs=OUTPUT_DIRS):
+    """
+    Runs a SQL query over the outputs of the case. Joins, aggregates and window functions are supported.
+
+    :param sql: SQL query.
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :return: Tuple (result DataFrame, backend name, duration in seconds).
+    :raises Exception: The error of the database if the query fails.
+    """
+    with use_connection(output_dirs) as (backend, connection):
+        started_at = time.perf_counter()
+        if backend == "DuckDB":
+            # Every query runs on its own cursor, so sessions can query in parallel
+            with connection.cursor() as cursor:
+                result = cursor.execute(sql).df()
+        else:
+            with _lock:
+                result = pd.read_sql_query(sql, connection)
+    return result, backend, time.perf_counter() - started_at
+
+def describe_tables(output_dirs=OUTPUT_DIRS):
+    """
+    Lists the columns of every table.
+
+    :param output_dirs: List of directories of Volatility3 outputs.
+    :return: Dictionary of column name lists by table name.
+    """
+    columns = {}
+    with use_connection(output_dirs) as (backend, connection):
+        for name in output_tables(output_dirs):
+            if backend == "DuckDB":
+                with connection.cursor() as cursor:
+                    columns[name] = [row[0] for row in cursor.execute(f"DESCRIBE \"{name}\"").fetchall()]
+            else:
+                with _lock:
+                    columns[name] = [row[1] for row in connection.execute(f"PRAGMA table_info(\"{name}\")").fetchall()]
+    return columns
@@ -0,0 +1,300 @@
+import os
+import re
+import bz2
+import gzip
+import json
+import lzma
+import time
+import uuid
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import platform
+import threading
+
+from config import symbol_offline
+from utils.fingerprint import fast_fingerprint
+
+# Detect operating system
+os_name = platform.system()
+
+# Define persistent directories outside the session drive, so "Renew Environment" keeps the symbol tables
+if os_name == "Windows":
+    base_dir = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "MemoryInvestigator")
+else:  # Linux/macOS
+    base_dir = os.path.join(os.path.expanduser("~"), ".cache", "MemoryInvestigator")
+
+# Symbol directory passed to Volatility3, downloaded and generated ISF files are written to its 'windows' folder
+symbol_dir = os.path.join(base_dir, "symbols")
+
+# Volatility3 cache directory, holds the identifier cache mapping kernel GUIDs to ISF files
+volatility_cache_dir = os.path.join(base_dir, "volatility_cache")
+
+index_file = os.path.join(symbol_dir, "index.json")
+
+# File extensions of Intermediate Symbol Format (ISF) files
+ISF_EXTENSIONS = (".json", ".json.xz", ".json.gz", ".json.bz2")
+
+# Windows symbol tables are stored as windows/<pdb name>/<GUID>-<age>.json.xz
+ISF_PATTERN = re.compile(r"([^/\\!]+\.pdb)[/\\]([0-9A-Fa-f]{32,})-(\d+)\.json")
+
+# Serializes index updates, imports and analyses may record symbols at the same time
+_lock = threading.RLock()
+
+def symbol_flags(memory_file=None, offline=symbol_offline):
+    """
+    Builds the Volatility3 command line flags using the persistent symbol and cache directories. They have to be
+    placed before the plugin name. Volatility3 is also run offline once the kernel symbols of the memory dump
+    are cached, so no remote symbol lookup is attempted.
+
+    :param memory_file: Optional path to the memory dump file.
+    :param offline: Never download symbols, e.g. on air-gapped machines.
+    :return: List of command line arguments.
+    """
+    os.makedirs(os.path.join(symbol_dir, "windows"), exist_ok=True)
+    os.makedirs(volatility_cache_dir, exist_ok=True)
+    flags = ["-s", symbol_dir, "--cache-path", volatility_cache_dir]
+    if offline or (memory_file and dump_symbols_cached(memory_file)):
+        flags.append("--offline")
+    return flags
+
+def symbol_settings(memory_file=None, offline=symbol_offline):
+    """
+    Returns the symbol settings for the in-process engine, equal to the flags of symbol_flags.
+
+    :param memory_file: Optional path to the memory dump file.
+    :param offline: Never download symbols.
+    :return: Dictionary with symbol_dir, cache_path and offline.
+    """
+    os.makedirs(os.path.join(symbol_dir, "windows"), exist_ok=True)
+    os.makedirs(volatility_cache_dir, exist_ok=True)
+    return {"symbol_dir": symbol_dir, "cache_path": volatility_cache_dir,
+            "offline": bool(offline or (memory_file and dump_symbols_cached(memory_file)))}
+
+def load_index():
+    """
+    Loads the symbol index.
+
+    :return: Dictionary with 'symbols' (by '<pdb name>/<GUID>-<age>') and 'dumps' (symbol keys by fingerprint).
+    """
+    try:
+        with open(index_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"symbols": {}, "dumps": {}}
+
+def save_index(index):
+    """
+    Saves the symbol index atomically.
+
+    :param index: Symbol index dictionary.
+    """
+    os.makedirs(symbol_dir, exist_ok=True)
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=4)
+    os.replace(temp_file, index_file)
+
+def symbol_key(path):
+    """
+    Derives the index key '<pdb name>/<GUID>-<age>' from the path or URL of a Windows ISF file.
+
+    :param path: Path or URL of the ISF file.
+    :return: Index key, or None if the path does not follow the Volatility3 layout.
+    """
+    match = ISF_PATTERN.search(path)
+    if not match:
+        return None
+    return f"{match.group(1).lower()}/{match.group(2).upper()}-{match.group(3)}"
+
+def rebuild_index(source="found"):
+    """
+    Scans the symbol directory and adds all Windows ISF files to the index, e.g. those downloaded
+    and converted by Volatility3 during an analysis.
+
+    :param source: Source recorded for newly found files.
+    :return: Updated symbol index.
+    """
+    windows_dir = os.path.join(symbol_dir, "windows")
+    with _lock:
+        index = load_index()
+        found = set()
+        for directory, _, files in os.walk(windows_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                key = symbol_key(path)
+                if not key or not name.endswith(ISF_EXTENSIONS):
+                    continue
+                found.add(key)
+                if key not in index["symbols"]:
+                    pdb_name, identifier = key.split("/")
+                    guid, age = identifier.rsplit("-", 1)
+                    index["symbols"][key] = {
+                        "pdb": pdb_name, "guid": guid, "age": int(age),
+                        "path": os.path.relpath(path, symbol_dir), "size": os.path.getsize(path),
+                        "source": source, "added": time.time(),
+                    }
+
+        # Forget files removed by hand
+        for key in [key for key in index["symbols"] if key not in found]:
+            index["symbols"].pop(key)
+        save_index(index)
+        return index
+
+def open_isf(path):
+    """
+    Opens a possibly compressed ISF file for reading.
+    """
+    if path.endswith(".xz"):
+        return lzma.open(path, "rb")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+def isf_identity(path):
+    """
+    Reads the PDB name, GUID and age from the metadata of a Windows ISF file.
+
+    :param path: Path of the ISF file.
+    :return: Index key, or None if the file holds no Windows kernel metadata.
+    """
+    try:
+        with open_isf(path) as f:
+            pdb = json.load(f).get("metadata", {}).get("windows", {}).get("pdb", {})
+    except (OSError, EOFError, ValueError):
+        return None
+    if not pdb.get("database") or not pdb.get("GUID"):
+        return None
+    return f"{pdb['database'].lower()}/{pdb['GUID'].upper()}-{pdb.get('age', 1)}"
+
+def store_isf(source_path, key):
+    """
+    Stores an ISF file at its place in the Volatility3 layout, compressed with xz.
+    """
+    pdb_name, identifier = key.split("/")
+    destination = os.path.join(symbol_dir, "windows", pdb_name, f"{identifier}.json.xz")
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    with open_isf(source_path) as source, lzma.open(f"{destination}.tmp", "wb") as target:
+        shutil.copyfileobj(source, target)
+    os.replace(f"{destination}.tmp", destination)
+
+def import_symbol_pack(archive_path):
+    """
+    Pre-loads symbol tables from a local archive, e.g. the Windows symbol pack of the Volatility Foundation
+    (zip or tar) or single ISF files. Windows ISF files are placed into the symbol directory by their PDB name,
+    GUID and age, so Volatility3 finds them without network access.
+
+    :param archive_path: Path of a zip or tar archive or of a single ISF file.
+    :return: Number of imported symbol tables.
+    """
+    name = os.path.basename(archive_path)
+    with tempfile.TemporaryDirectory() as extract_dir:
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path) as archive:
+                members = [member for member in archive.namelist() if member.endswith(ISF_EXTENSIONS)]
+                for member in members:
+                    target = os.path.realpath(os.path.join(extract_dir, member))
+                    if target.startswith(os.path.realpath(extract_dir) + os.sep):  # Skip paths leaving the directory
+                        archive.extract(member, extract_dir)
+        elif tarfile.is_tarfile(archive_path):
+            with tarfile.open(archive_path) as archive:
+                members = [member for member in archive.getmembers() if member.isfile() and member.name.endswith(ISF_EXTENSIONS)]
+                if hasattr(tarfile, "data_filter"):
+                    archive.extractall(extract_dir, members=members, filter="data")
+                else:  # Python before 3.11.4, only regular files inside the directory are extracted
+                    for member in members:
+                        target = os.path.realpath(os.path.join(extract_dir, member.name))
+                        if target.startswith(os.path.realpath(extract_dir) + os.sep):
+                            member.mode = 0o644
+                            archive.extract(member, extract_dir)
+        elif name.endswith(ISF_EXTENSIONS):
+            shutil.copyfile(archive_path, os.path.join(extract_dir, name))
+        else:
+            raise ValueError(f"Unsupported symbol pack: {name}")
+
+        imported = 0
+        with _lock:
+            for directory, _, files in os.walk(extract_dir):
+                for file_name in files:
+                    path = os.path.join(directory, file_name)
+                    # Packs in the Volatility3 layout carry the identity in the path, single files in the metadata
+                    key = symbol_key(path) or isf_identity(path)
+                    if key:
+                        store_isf(path, key)
+                        imported += 1
+            rebuild_index(source=f"pack:{name}")
+    return imported
+
+def record_dump_symbols(memory_file, isf_url):
+    """
+    Records which kernel symbol table a memory dump uses, so later analyses of the dump run offline.
+
+    :param memory_file: Path to the memory dump file.
+    :param isf_url: URL of the ISF file found by Volatility3.
+    """
+    key = symbol_key(isf_url or "")
+    if not key:
+        return
+    with _lock:
+        index = rebuild_index(source="downloaded")
+        if key in index["symbols"]:
+            index["dumps"][fast_fingerprint(memory_file)] = key
+            save_index(index)
+
+def saved_config_file(memory_file):
+    """
+    Returns a path for vol.py to save its configuration to with --save-config, as long as the kernel symbol table
+    of the memory dump is not recorded yet. vol.py refuses to overwrite a file, so the path is new for every run.
+
+    :param memory_file: Path to the memory dump file.
+    :return: Path of the configuration file, or None if the symbol table is already recorded.
+    """
+    if dump_symbols_cached(memory_file):
+        return None
+    return os.path.join(tempfile.gettempdir(), f"volatility_config_{uuid.uuid4().hex}.json")
+
+def record_saved_config(memory_file, config_file):
+    """
+    Records the kernel symbol table found in a configuration saved by vol.py and removes the file.
+
+    :param memory_file: Path to the memory dump file.
+    :param config_file: Path of the configuration file, or None.
+    """
+    if not config_file or not os.path.exists(config_file):
+        return
+    try:
+        with open(config_file, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        config = {}
+    finally:
+        os.remove(config_file)
+    # The kernel requirement is nested below the plugin, e.g. plugins.PsList.kernel.symbol_table_name.isf_url
+    for key, value in config.items():
+        if key.endswith("symbol_table_name.isf_url") and isinstance(value, str):
+            record_dump_symbols(memory_file, value)
+            return
+
+def dump_symbols_cached(memory_file):
+    """
+    Checks whether the kernel symbol table of a memory dump is known and cached.
+
+    :param memory_file: Path to the memory dump file.
+    :return: True if the symbol table is in the symbol directory.
+    """
+    index = load_index()
+    key = index["dumps"].get(fast_fingerprint(memory_file))
+    return bool(key and key in index["symbols"]
+                and os.path.exists(os.path.join(symbol_dir, index["symbols"][key]["path"])))
+
+def list_symbols():
+    """
+    Lists all cached Windows symbol tables as recorded in the index, which is updated by imports and analyses.
+
+    :return: List of entry dictionaries including their key.
+    """
+    index = load_index()
+    return [{"key": key, **entry} for key, entry in sorted(index["symbols"].items())]
@@ -0,0 +1,53 @@
+import math
+import numpy as np
+
+def search_matches(df, term):
+    """
+    Finds the rows of a DataFrame containing a term in any column, one vectorized string match per column
+    instead of a Python call per row.
+
+    :param df: DataFrame to search.
+    :param term: Search term, case-insensitive.
+    :return: Array of matching row positions.
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    for column in df.columns:
+        mask |= df[column].astype(str).str.contains(term, case=False, na=False, regex=False).to_numpy()
+    return np.flatnonzero(mask)
+
+def filter_view(df, rows=None, column=None, column_filter=None, sort_by=None, descending=False):
+    """
+    Applies search results, a column filter and the sort order to a table on the server. Only row positions and
+    views are computed, the rows are copied when a page is taken.
+
+    :param df: Full DataFrame.
+    :param rows: Optional row positions of search results.
+    :param column: Optional column of the column filter.
+    :param column_filter: Optional text the column has to contain, case-insensitive.
+    :param sort_by: Optional column to sort by.
+    :param descending: Whether to sort in descending order.
+    :return: Filtered and sorted DataFrame.
+    """
+    view = df if rows is None else df.iloc[rows]
+    if column in view.columns and column_filter:
+        view = view[view[column].astype(str).str.contains(column_filter, case=False, na=False, regex=False)]
+    if sort_by in view.columns:
+        try:
+            view = view.sort_values(sort_by, ascending=not descending, na_position="last", kind="stable")
+        except TypeError:  # Mixed types in the column are sorted as text
+            view = view.sort_values(sort_by, ascending=not descending, na_position="last", kind="stable",
+                                    key=lambda values: values.astype(str))
+    return view
+
+def page_of(view, page, page_size):
+    """
+    Takes one page of a filtered and sorted table, the only rows sent to the browser.
+
+    :param view: Filtered and sorted DataFrame.
+    :param page: Page number starting at 1, clamped to the existing pages.
+    :param page_size: Number of rows per page.
+    :return: Tuple (rows of the page, number of the page, number of pages).
+    """
+    pages = max(1, math.ceil(len(view) / page_size))
+    page = min(max(1, page), pages)
+    return view.iloc[(page - 1) * page_size:page * page_size], page, pages
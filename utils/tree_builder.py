@@ -2,6 +2,10 @@ import json
 import os
 import platform
 
+from utils.artifact_store import load_rows, source_stamp, ArtifactStream
+from utils.process_index import ProcessIndex, time_order
+from utils.tree_codec import save_compact_tree
+
 # Detect operating system
 os_name = platform.system()
 
@@ -11,36 +15,33 @@ if os_name == "Windows":
 else:  # Linux/macOS
     tree_output_path = "/tmp/MemoryInvestigator/03_trees"
 
-def load_json_utf16(filepath):
+def load_json_utf16(filepath, columns=None):
     """
-    Loads a JSON file encoded in UTF-16. Falls back to UTF-8 if UTF-16 fails.
+    Loads a Volatility3 output file from its columnar file, or for incomplete outputs either a JSON document
+    encoded in UTF-16 or UTF-8, or JSON Lines. Rows of JSON Lines output are kept even if the plugin failed halfway.
 
     :param filepath: Path to the JSON file.
+    :param columns: Optional list of columns, all columns by default.
     :return: Parsed JSON data or an empty list if an error occurs.
     """
-    try:
-        with open(filepath, "r", encoding="utf-16") as file:
-            return json.load(file)
-    except (UnicodeError, json.JSONDecodeError):
-        try:
-            with open(filepath, "r", encoding="utf-8") as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+    return load_rows(filepath, columns)
 
-def build_hierarchical_tree(selected_files, mode, pid=None):
+def build_hierarchical_tree(selected_files, mode, pid=None, focus_pids=None, tree_dir=tree_output_path):
     """
     Dynamically builds a hierarchical tree, starting with process data from windows.pslist.json.
     Appends data from other selected files to corresponding PID nodes.
     Processes only the specified PID if provided.
 
-    :param selected_files: Dictionary containing filenames and corresponding JSON data.
+    :param selected_files: Dictionary containing filenames and corresponding JSON data or record streams.
     :param mode: Specifies the tree type ('costume' or 'basic').
     :param pid: Optional specific Process ID to filter data.
+    :param focus_pids: Optional list of PIDs, data of other files is only appended for these processes
+                       while the whole process hierarchy is kept.
+    :param tree_dir: Directory the tree is saved to.
     :return: Generated hierarchical tree structure.
     """
     root = {"name": "System Analysis", "children": []}
-    process_nodes = {}  # To hold processes by PID
+    process_nodes = {}  # To hold the latest instance of every process by PID
 
     # Determine which process list to use: prefer psscan else pslist
     process_list_file = "windows.psscan.json" if "windows.psscan.json" in selected_files else "windows.pslist.json"
@@ -48,34 +49,56 @@ def build_hierarchical_tree(selected_files, mode, pid=None):
     # Step 1: Build the base process tree using process_list_file
     if process_list_file in selected_files:
         processes_tree = {"name": "Processes", "children": []}
-        for process in selected_files[process_list_file]:
-            current_pid = process.get("PID")
-            if pid and current_pid != pid:  # Skip if PID does not match
-                continue
-
-            ppid = process.get("PPID")
-            name = process.get("ImageFileName", "Unknown Process")
 
-            node = {
-                "name": name,
-                "pid": current_pid,
-                "ppid": ppid,
+        # Processes are keyed on (PID, CreateTime), so exited processes of psscan and processes reusing their PID
+        # stay apart, and children are attached to their parent wherever it is listed
+        index = ProcessIndex(process for process in selected_files[process_list_file]
+                             if not pid or process.get("PID") == pid)  # Skip if PID does not match
+        nodes = {}
+        for key, process in index.records.items():
+            nodes[key] = {
+                "name": process.get("ImageFileName", "Unknown Process"),
+                "pid": key[0],
+                "ppid": process.get("PPID"),
+                "create_time": key[1],
                 "children": []
             }
-            process_nodes[current_pid] = node
+            # The exit time of psscan belongs to its own instance, not to the latest process with the PID. The other
+            # fields of psscan are already part of the node.
+            if process_list_file != "windows.pslist.json" and process.get("ExitTime") not in (None, ""):
+                nodes[key][file_data_key(process_list_file)] = {"ExitTime": process["ExitTime"]}
 
-            # Attach to parent or root
-            if ppid in process_nodes:
-                process_nodes[ppid]["children"].append(node)
-            else:
-                processes_tree["children"].append(node)
+        # Attach to parent or root
+        for key, node in nodes.items():
+            parent = index.parents.get(key)
+            (nodes[parent]["children"] if parent is not None else processes_tree["children"]).append(node)
         root["children"].append(processes_tree)
 
+        # Other plugins report on the latest instance of a PID
+        process_nodes = {current_pid: nodes[index.latest(current_pid)] for current_pid in index.by_pid}
+
     # Step 2: Append data from other selected files to the process tree
-    for filename, records in selected_files.items():
-        if filename == "windows.pslist.json":
-            continue  # Skip as we already processed this
+    append_file_data(root, process_nodes, {
+        filename: records for filename, records in selected_files.items()
+        if filename not in ("windows.pslist.json", process_list_file)  # Skip as we already processed this
+    }, pid, focus_pids)
+
+    # Step 3: Save the output to the correct directory
+    save_tree(root, mode, tree_dir)
+    return root
+
+def append_file_data(root, process_nodes, selected_files, pid=None, focus_pids=None):
+    """
+    Appends the data of plugin output files to the PID nodes of a tree, records without a matching process
+    are collected in a top-level node per file.
 
+    :param root: Root node of the tree.
+    :param process_nodes: Dictionary of the process nodes by PID.
+    :param selected_files: Dictionary containing filenames and corresponding JSON data.
+    :param pid: Optional specific Process ID to filter data.
+    :param focus_pids: Optional list of PIDs, data is only appended for these processes.
+    """
+    for filename, records in selected_files.items():
         file_node = {"name": filename, "children": []}
         fields = field_mapping.get(filename, [])  # Retrieve predefined fields for the file
 
@@ -83,6 +106,8 @@ def build_hierarchical_tree(selected_files, mode, pid=None):
             current_pid = record.get("PID") or record.get("Pid") or record.get("pid")
             if pid and current_pid != pid:  # Skip if PID does not match
                 continue
+            if focus_pids is not None and current_pid not in focus_pids:  # Skip processes out of focus
+                continue
 
             # Prepare only the values from specific fields
             specific_data = {}
@@ -111,7 +136,14 @@ def build_hierarchical_tree(selected_files, mode, pid=None):
         if file_node["children"]:
             root["children"].append(file_node)
 
-    # Step 3: Save the output to the correct directory
+def tree_path(mode, tree_dir=tree_output_path):
+    """
+    Returns the path of the basic or customized tree.
+
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param tree_dir: Directory of the trees.
+    :return: Path of the tree file.
+    """
     mode_to_path = {
         "costume": "costume_system_analysis_tree.json",
         "basic": "basic_system_analysis_tree.json"
@@ -119,17 +151,275 @@ def build_hierarchical_tree(selected_files, mode, pid=None):
     safe_path = mode_to_path.get(mode, None)
     if not safe_path:
         raise ValueError("Invalid mode. Use 'costume' or 'basic'.")
+    return os.path.join(tree_dir, safe_path)
+
+def save_tree(root, mode, tree_dir=tree_output_path):
+    """
+    Saves a tree to the directory of the trees, with its compact encoding for the LLM next to it.
 
-    output_path = os.path.join(tree_output_path, safe_path)
+    :param root: Root node of the tree.
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param tree_dir: Directory the tree is saved to.
+    """
+    output_path = tree_path(mode, tree_dir)
     try:
-        os.makedirs(tree_output_path, exist_ok=True)  # Ensure directory exists
+        os.makedirs(tree_dir, exist_ok=True)  # Ensure directory exists
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(root, f, indent=4)
+        save_compact_tree(root, output_path)
     except Exception as e:
         print(f"Error saving tree: {e}")
 
+def file_data_key(filename):
+    """
+    Returns the key under which the data of an output file is stored in the process nodes.
+    """
+    if filename == "windows.getsids.json":
+        return "SID"
+    if filename == "windows.cmdline.json":
+        return "Args"
+    return filename.split('.')[1]
+
+def index_process_nodes(root):
+    """
+    Collects the process nodes of a tree by PID, the latest instance of a reused PID.
+
+    :param root: Root node of the tree.
+    :return: Dictionary of the process nodes by PID.
+    """
+    process_nodes = {}
+    stack = [child for node in root["children"] if node["name"] == "Processes" for child in node["children"]]
+    while stack:
+        node = stack.pop()
+        current = process_nodes.get(node.get("pid"))
+        if current is None or time_order(node.get("create_time")) >= time_order(current.get("create_time")):
+            process_nodes[node.get("pid")] = node
+        stack.extend(node.get("children", []))
+    return process_nodes
+
+def files_in_tree(root, process_nodes):
+    """
+    Determines which output files contributed data to a tree.
+
+    :param root: Root node of the tree.
+    :param process_nodes: Dictionary of the process nodes by PID.
+    :return: Set of filenames.
+    """
+    keys = {key for node in process_nodes.values() for key in node}
+    filenames = {filename for filename in field_mapping if file_data_key(filename) in keys}
+    return filenames | {node["name"] for node in root["children"] if node["name"] != "Processes"}
+
+def detach_file_data(root, process_nodes, filenames):
+    """
+    Removes the data of output files from a tree, e.g. before their new version is appended.
+
+    :param root: Root node of the tree.
+    :param process_nodes: Dictionary of the process nodes by PID.
+    :param filenames: Filenames whose data is removed.
+    """
+    keys = {file_data_key(filename) for filename in filenames}
+    for node in process_nodes.values():
+        for key in keys & set(node):
+            del node[key]
+    root["children"] = [node for node in root["children"] if node["name"] not in filenames]
+
+def update_tree(output_dir, plugins, mode, focus_pids=None, tree_dir=tree_output_path):
+    """
+    Updates an existing tree with the new or re-run outputs of plugins, without rebuilding it from all files.
+    The basic tree receives every given plugin for the focused processes. The customized tree only refreshes
+    the files it was built from, for all processes or its PID filter. The process list is never updated here.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param plugins: List of plugins with a new output.
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param focus_pids: Optional list of PIDs the data of the basic tree is appended for, not used for the
+                       customized tree.
+    :param tree_dir: Directory of the trees.
+    :return: Updated tree, or None if the tree does not exist.
+    """
+    try:
+        with open(tree_path(mode, tree_dir), "r", encoding="utf-8") as f:
+            root = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    process_nodes = index_process_nodes(root)
+    filenames = [f"{plugin}.json" for plugin in plugins if plugin not in ("windows.pslist", "windows.psscan")]
+    pid = None
+    if mode == "costume":
+        # Records without a process node are kept as in a full build, only the PID filter of the tree applies
+        index = load_tree_index(mode, tree_dir)
+        attached = files_in_tree(root, process_nodes) | set(index["plugins"] if index else ())
+        filenames = [filename for filename in filenames if filename in attached]
+        pid = index.get("pid") if index else None
+        focus_pids = None
+    filenames = [filename for filename in filenames if os.path.exists(os.path.join(output_dir, filename))]
+    if not filenames:
+        return root
+
+    detach_file_data(root, process_nodes, filenames)
+    append_file_data(root, process_nodes, load_selected_files([os.path.join(output_dir, filename) for filename in filenames]),
+                     pid, focus_pids)
+    save_tree(root, mode, tree_dir)
+    refresh_tree_index(output_dir, filenames, mode, tree_dir)
     return root
 
+def tree_index_path(mode, tree_dir=tree_output_path):
+    """
+    Returns the path of the index of a tree, next to the tree.
+
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param tree_dir: Directory of the trees.
+    :return: Path of the tree index.
+    """
+    return os.path.splitext(tree_path(mode, tree_dir))[0] + ".index.json"
+
+def load_tree_index(mode, tree_dir=tree_output_path):
+    """
+    Loads the index of a tree: the process list, PID filter and the version of every attached output file the
+    tree was built from, and the version of the tree itself.
+
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param tree_dir: Directory of the trees.
+    :return: Tree index dictionary, or None if there is none.
+    """
+    try:
+        with open(tree_index_path(mode, tree_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def save_tree_index(index, mode, tree_dir=tree_output_path):
+    """
+    Saves the index of a tree atomically, with the version of the tree just saved.
+
+    :param index: Tree index dictionary.
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param tree_dir: Directory of the trees.
+    """
+    index["tree_stamp"] = source_stamp(tree_path(mode, tree_dir))
+    temp_file = f"{tree_index_path(mode, tree_dir)}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=4)
+    os.replace(temp_file, tree_index_path(mode, tree_dir))
+
+def refresh_tree_index(output_dir, filenames, mode, tree_dir=tree_output_path):
+    """
+    Records new versions of output files in the index of a tree after they were attached again, so the next
+    custom build does not attach them once more.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param filenames: Filenames that were attached again.
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param tree_dir: Directory of the trees.
+    """
+    index = load_tree_index(mode, tree_dir)
+    if index is None or index.get("output_dir") != output_dir:
+        return
+    for filename in filenames:
+        if filename in index["plugins"]:
+            index["plugins"][filename] = source_stamp(os.path.join(output_dir, filename))
+    save_tree_index(index, mode, tree_dir)
+
+def build_custom_tree(output_dir, filenames, pid=None, mode="costume", tree_dir=tree_output_path):
+    """
+    Builds a tree from output files incrementally: only files added, removed or changed since the last build are
+    attached or detached. A different process list, PID filter or an edited tree requires a full build.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param filenames: List of selected filenames.
+    :param pid: Optional specific Process ID to filter data.
+    :param mode: Specifies the tree type ('costume' or 'basic').
+    :param tree_dir: Directory of the trees.
+    :return: Tuple (tree, dictionary of the 'added', 'removed' and 'refreshed' filenames and whether the tree was
+             'rebuilt').
+    """
+    # The process list is chosen as in build_hierarchical_tree, windows.pslist is never attached
+    process_list = next((filename for filename in ("windows.psscan.json", "windows.pslist.json") if filename in filenames), None)
+    stamps = {filename: source_stamp(os.path.join(output_dir, filename)) for filename in filenames
+              if filename not in ("windows.pslist.json", process_list)}
+    index = {
+        "output_dir": output_dir,
+        "process_list": process_list,
+        "process_stamp": source_stamp(os.path.join(output_dir, process_list)) if process_list else None,
+        "pid": pid or None,
+        "plugins": stamps,
+    }
+
+    root = None
+    previous = load_tree_index(mode, tree_dir)
+    if previous is not None and all(previous.get(key) == index[key] for key in ("output_dir", "process_list", "process_stamp", "pid")):
+        try:
+            if previous.get("tree_stamp") == source_stamp(tree_path(mode, tree_dir)):
+                with open(tree_path(mode, tree_dir), "r", encoding="utf-8") as f:
+                    root = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            root = None
+
+    if root is None:
+        root = build_hierarchical_tree(load_selected_files([os.path.join(output_dir, filename) for filename in filenames]),
+                                       mode, pid, tree_dir=tree_dir)
+        save_tree_index(index, mode, tree_dir)
+        return root, {"added": list(stamps), "removed": [], "refreshed": [], "rebuilt": True}
+
+    changes = {
+        "added": [filename for filename in stamps if filename not in previous["plugins"]],
+        "removed": [filename for filename in previous["plugins"] if filename not in stamps],
+        "refreshed": [filename for filename, stamp in stamps.items()
+                      if filename in previous["plugins"] and previous["plugins"][filename] != stamp],
+        "rebuilt": False,
+    }
+    if changes["added"] or changes["removed"] or changes["refreshed"]:
+        process_nodes = index_process_nodes(root)
+        detach_file_data(root, process_nodes, changes["removed"] + changes["refreshed"])
+        attached = changes["added"] + changes["refreshed"]
+        append_file_data(root, process_nodes, load_selected_files([os.path.join(output_dir, filename) for filename in attached]),
+                         pid or None)
+        save_tree(root, mode, tree_dir)
+        save_tree_index(index, mode, tree_dir)
+    return root, changes
+
+def update_trees(output_dir, plugins, flagged_pids, tree_dir=tree_output_path):
+    """
+    Brings the basic and the customized tree up to date after plugins were added or re-run. A new process list
+    requires a new basic tree, it is then rebuilt from all outputs.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param plugins: List of plugins with a new output.
+    :param flagged_pids: List of flagged PIDs.
+    :param tree_dir: Directory of the trees.
+    :return: Updated basic tree, or None if there is none.
+    """
+    if "windows.pslist" in plugins:
+        outputs = [name[:-len(".json")] for name in sorted(os.listdir(output_dir)) if name.endswith(".json")]
+        basic_tree = build_basic_tree(output_dir, outputs, flagged_pids, tree_dir)
+    else:
+        basic_tree = update_tree(output_dir, plugins, "basic", flagged_pids, tree_dir)
+    update_tree(output_dir, plugins, "costume", tree_dir=tree_dir)
+    return basic_tree
+
+def build_basic_tree(output_dir, finished_plugins, flagged_pids, tree_dir=tree_output_path):
+    """
+    Builds the basic tree from windows.pslist and the outputs of finished plugins. The data of the plugins is
+    only appended for the flagged processes, so the tree stays small while it shows the findings.
+
+    :param output_dir: Directory of the Volatility3 outputs.
+    :param finished_plugins: List of plugins whose output is complete.
+    :param flagged_pids: List of flagged PIDs.
+    :param tree_dir: Directory the tree is saved to.
+    :return: Generated tree, or None if there is no windows.pslist output yet.
+    """
+    pslist_path = os.path.join(output_dir, "windows.pslist.json")
+    if "windows.pslist" not in finished_plugins or not os.path.exists(pslist_path):
+        return None
+
+    selected_filepaths = [pslist_path] + [
+        os.path.join(output_dir, f"{plugin}.json") for plugin in finished_plugins
+        if plugin not in ("windows.pslist", "windows.psscan")
+    ]
+    return build_hierarchical_tree(load_selected_files(selected_filepaths), "basic", pid=None,
+                                   focus_pids=flagged_pids, tree_dir=tree_dir)
+
 # Predefined field mappings for each JSON file
 field_mapping = {
     "windows.cmdline.json": ["Args"],
@@ -146,17 +436,21 @@ field_mapping = {
     "windows.svcdiff.json": ["Binary", "Binary (Registry)", "Order", "Start", "State", "Dll"],
     "windows.svcscan.json": ["Binary", "Binary (Registry)", "Order", "Start", "State", "Dll"],
     "windows.suspicious_threads": ["TID", "Process", "Context", "Address", "Note"],
+    "windows.handles.json": ["Type", "Name"],
+    "windows.vadinfo.json": ["Start VPN", "End VPN", "Tag", "Protection", "File"],
 }
 
 def load_selected_files(filepaths):
     """
-    Load multiple JSON files using UTF-16 format where necessary.
+    Opens multiple Volatility3 output files as record streams, so a tree is built while reading one row at a
+    time instead of loading whole files. Files with predefined fields are read with these fields and the PID only.
 
     :param filepaths: List of file paths.
-    :return: Dictionary with filenames as keys and parsed JSON data as values.
+    :return: Dictionary with filenames as keys and re-iterable record streams as values.
     """
     selected_files = {}
     for path in filepaths:
         filename = os.path.basename(path)
-        selected_files[filename] = load_json_utf16(path)
+        columns = ["PID", "Pid", "pid"] + field_mapping[filename] if filename in field_mapping else None
+        selected_files[filename] = ArtifactStream(path, columns)
     return selected_files
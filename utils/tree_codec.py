@@ -0,0 +1,239 @@
+import os
+import re
+import json
+
+try:
+    import tiktoken
+except ImportError:  # Optional, tokens are estimated without it
+    tiktoken = None
+
+# Version of the compact format, written to the header
+FORMAT = "compact-tree/1"
+
+# Columns of the process rows and of the records without a matching process
+PROCESS_KEYS = ["depth", "name", "pid", "ppid", "create_time"]
+RECORD_KEYS = ["pid"]
+
+# How the LLM reads the rows, sent once with the header
+LEGEND = ("Each line after a section name is one row, its values in the order of the keys of the section. "
+          "A process belongs to the closest previous process with depth - 1. A trailing object holds plugin data, "
+          "lists of values in the order of the keys of the plugin.")
+
+# Volatility3 error messages that carry no information for the LLM
+ERROR_MESSAGES = re.compile(r"Required memory at 0x[0-9a-fA-F]+ is (not valid \(process exited\?\)|inaccessible \(swapped\))")
+
+def clean_tree_data(json_data):
+    """
+    Compacts tree data for the LLM: empty children, Volatility3 error messages and whitespace are removed.
+
+    :param json_data: JSON text of a tree or of a part of it.
+    :return: Cleaned text.
+    """
+    json_data = re.sub(r'"children": \[\]', ' ', json_data)  # Replace empty children with a space
+    json_data = ERROR_MESSAGES.sub('', json_data)  # Remove error messages
+    return re.sub(r'\s+', ' ', json_data).strip()  # Replace all whitespace (newlines, tabs, spaces) with a single space
+
+def compact_tree_path(tree):
+    """
+    Returns the path of the compact encoding of a tree, next to the tree.
+
+    :param tree: Path of the tree.
+    :return: Path of the compact tree.
+    """
+    return os.path.splitext(tree)[0] + ".compact.json"
+
+def dumps(value):
+    """
+    Serialises a value as JSON without whitespace.
+    """
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+def clean_value(value):
+    """
+    Removes Volatility3 error messages from text values.
+    """
+    return ERROR_MESSAGES.sub("", value).strip() if isinstance(value, str) else value
+
+def iter_sections(root):
+    """
+    Walks the sections of a tree with their nodes in document order.
+
+    :param root: Root node of the tree.
+    :return: Generator of (section name, is process section, list of (depth, node)).
+    """
+    for section in root.get("children", []):
+        nodes = []
+        is_processes = section.get("name") == "Processes"
+        stack = [(0, child) for child in reversed(section.get("children", []))]
+        while stack:
+            depth, node = stack.pop()
+            nodes.append((depth, node))
+            if is_processes:
+                stack.extend((depth + 1, child) for child in reversed(node.get("children", [])))
+        yield section.get("name"), is_processes, nodes
+
+def node_data(node, is_process):
+    """
+    Returns the plugin data of a node, everything but its columns and children.
+    """
+    columns = PROCESS_KEYS if is_process else ["name"] + RECORD_KEYS
+    return {key: value for key, value in node.items() if key not in columns and key != "children"}
+
+def encode_tree(root):
+    """
+    Encodes a tree compactly for the LLM: the keys of processes and of every plugin are declared once in a header,
+    nodes become one line of values each, nesting becomes a depth, and empty children and Volatility3 error
+    messages are left out.
+
+    :param root: Root node of the tree.
+    :return: Compact tree text.
+    """
+    sections = list(iter_sections(root))
+
+    # Keys of the plugin data in the order they first appear
+    plugin_keys = {}
+    for _, is_processes, nodes in sections:
+        for _, node in nodes:
+            for key, value in node_data(node, is_processes).items():
+                if isinstance(value, dict):
+                    keys = plugin_keys.setdefault(key, [])
+                    keys.extend(field for field in value if field not in keys)
+
+    header = {"format": FORMAT, "tree": root.get("name"), "legend": LEGEND,
+              "keys": {"Processes": PROCESS_KEYS, "records": RECORD_KEYS, **plugin_keys}}
+    lines = [dumps(header)]
+    for name, is_processes, nodes in sections:
+        lines.append(dumps(name))
+        for depth, node in nodes:
+            row = [depth, node.get("name"), node.get("pid"), node.get("ppid"), node.get("create_time")] \
+                if is_processes else [node.get("pid")]
+            data = {}
+            for key, value in node_data(node, is_processes).items():
+                if isinstance(value, dict):
+                    values = [clean_value(value.get(field)) for field in plugin_keys[key]]
+                    while values and values[-1] is None:
+                        values.pop()
+                    data[key] = values
+                elif isinstance(value, list):
+                    data[key] = [clean_value(item) for item in value]
+                else:
+                    data[key] = clean_value(value)
+            lines.append(dumps(row + [data] if data else row))
+    return "\n".join(lines)
+
+def decode_tree(text):
+    """
+    Decodes a compact tree back into the nested tree. Error messages removed by the encoding stay removed.
+
+    :param text: Compact tree text.
+    :return: Root node of the tree.
+    """
+    lines = text.splitlines()
+    header = json.loads(lines[0])
+    plugin_keys = {key: fields for key, fields in header["keys"].items() if key not in ("Processes", "records")}
+    root = {"name": header["tree"], "children": []}
+    section = None
+    is_processes = False
+    ancestors = []
+    for line in lines[1:]:
+        row = json.loads(line)
+        if isinstance(row, str):
+            section = {"name": row, "children": []}
+            root["children"].append(section)
+            is_processes = row == "Processes"
+            ancestors = []
+            continue
+
+        data = row.pop() if row and isinstance(row[-1], dict) else {}
+        if is_processes:
+            depth, name, pid, ppid, create_time = row
+            node = {"name": name, "pid": pid, "ppid": ppid, "create_time": create_time, "children": []}
+        else:
+            depth = 0
+            node = {"name": section["name"], "pid": row[0]}
+        for key, value in data.items():
+            if key in plugin_keys:
+                value = {field: item for field, item in zip(plugin_keys[key], value) if item is not None}
+            node[key] = value
+
+        del ancestors[depth:]
+        (ancestors[-1]["children"] if ancestors else section["children"]).append(node)
+        ancestors.append(node)
+    return root
+
+def split_compact(text, num_parts):
+    """
+    Splits a compact tree into parts for separate requests. Every part repeats the header and the name of its
+    section, so it can be read on its own.
+
+    :param text: Compact tree text.
+    :param num_parts: Number of parts.
+    :return: List of compact tree texts.
+    :raises ValueError: If the number of parts is not greater than zero.
+    """
+    if num_parts <= 0:
+        raise ValueError("Number of parts must be greater than zero.")
+    header, *lines = text.splitlines()
+    rows = []
+    section = None
+    for line in lines:
+        if line.startswith('"'):
+            section = line
+        else:
+            rows.append((section, line))
+
+    chunk_size = max(1, -(-len(rows) // num_parts))
+    parts = []
+    for start in range(0, len(rows), chunk_size):
+        part = [header]
+        current = None
+        for row_section, line in rows[start:start + chunk_size]:
+            if row_section != current:
+                part.append(row_section)
+                current = row_section
+            part.append(line)
+        parts.append("\n".join(part))
+    return parts or [header]
+
+def save_compact_tree(root, tree):
+    """
+    Writes the compact encoding of a tree next to it.
+
+    :param root: Root node of the tree.
+    :param tree: Path of the tree.
+    :return: Path of the compact tree.
+    """
+    compact_path = compact_tree_path(tree)
+    with open(compact_path, "w", encoding="utf-8") as f:
+        f.write(encode_tree(root))
+    return compact_path
+
+def count_tokens(text):
+    """
+    Counts the tokens of a text with the cl100k_base encoding if tiktoken is installed, otherwise estimates them
+    from words, numbers and punctuation.
+
+    :param text: Text to count.
+    :return: Number of tokens.
+    """
+    if tiktoken is not None:
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+def compression_stats(tree):
+    """
+    Measures the compact encoding of a tree against the pretty-printed tree and against the whitespace-stripped
+    text sent to the LLM before.
+
+    :param tree: Path of the tree.
+    :return: Dictionary with bytes and tokens of the 'pretty', 'cleaned' and 'compact' texts, or None if the tree
+             is no valid JSON after editing.
+    """
+    with open(tree, "r", encoding="utf-8") as f:
+        pretty = f.read()
+    try:
+        compact = encode_tree(json.loads(pretty))
+    except (json.JSONDecodeError, AttributeError, TypeError):
+        return None
+    texts = {"pretty": pretty, "cleaned": clean_tree_data(pretty), "compact": compact}
+    return {name: {"bytes": len(text.encode("utf-8")), "tokens": count_tokens(text)} for name, text in texts.items()}
@@ -1,6 +1,22 @@
 import subprocess
 import platform
 import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import psutil
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config import volatility_workers, volatility_plugin_memory_mb, volatility_min_free_memory_mb, volatility_engine, \
+    result_cache_enabled, volatility_output_format, volatility_plugin_timeout_s, volatility_plugin_max_memory_mb, \
+    volatility_plugin_address_space_mb, volatility_plugin_retries, volatility_retry_backoff_s
+from utils.volatility_engine import get_engine, run_analysis_in_process
+from utils.result_cache import lookup_result, store_result
+from utils.plugin_results import PluginRunError, RunTimer, plugin_result, failure_result
+from utils.symbol_cache import record_saved_config, saved_config_file, symbol_flags
+from utils.volatility_reader import read_json_lines
 
 # Detect operating system
 os_name = platform.system()
@@ -15,69 +31,545 @@ else:  # Linux/macOS
     data_extraction_output = "//tmp/MemoryInvestigator/04_data_extraction"
     volatility_path = "/tmp/MemoryInvestigator/00_tools/volatility3-2.8.0/vol.py"
 
-def run_analysis(memory_file, plugins):
+# Volatility3 release in use, part of every result cache key
+volatility_version = "2.8.0"
+
+# Script running a single plugin with streamed JSON Lines output
+engine_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "volatility_engine.py")
+
+# Admits one plugin at a time across all running analyses, so parallel starts cannot overcommit the free memory
+_admission_lock = threading.Lock()
+
+# Python interpreter used for Volatility3
+python_executable = "python.exe" if os_name == "Windows" else "python3"
+
+def plugin_flags(args):
+    """
+    Converts plugin arguments to Volatility3 command line flags, e.g. {"pid": [4, 8]} to ['--pid', '4', '8'].
+
+    :param args: Dictionary of plugin arguments or None.
+    :return: List of command line arguments.
+    """
+    flags = []
+    for key, value in (args or {}).items():
+        if value is True:
+            flags.append(f"--{key}")
+        elif isinstance(value, (list, tuple)):
+            flags += [f"--{key}"] + [str(item) for item in value]
+        elif value not in (None, False):
+            flags += [f"--{key}", str(value)]
+    return flags
+
+def build_volatility_command(memory_file, plugin, output_file, output_format=volatility_output_format, args=None,
+                             config_file=None):
+    """
+    Builds the command to run a single Volatility3 plugin. JSON output of vol.py is written to stdout,
+    JSON Lines output is streamed to the file by the engine script while the plugin runs.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin to execute.
+    :param output_file: Path of the output file.
+    :param output_format: 'json' or 'jsonl'.
+    :param args: Optional dictionary of plugin arguments, e.g. {"pid": [4, 8]}.
+    :param config_file: Optional file vol.py saves its configuration to, see saved_config_file.
+    :return: Command as list of arguments.
+    """
+    if output_format == "jsonl":
+        command = [python_executable, engine_script, memory_file, plugin, output_file] + symbol_flags(memory_file)
+        if args:
+            command += ["--args", json.dumps(args)]
+        return command
+    save_config = ["--save-config", config_file] if config_file else []
+    return [python_executable, volatility_path] + symbol_flags(memory_file) + save_config + \
+        ["-r", "json", "-f", memory_file, plugin] + plugin_flags(args)
+
+def execute_volatility(memory_file, plugin, output_file, output_format=volatility_output_format, args=None):
+    """
+    Runs a single Volatility3 plugin as a child process and writes its output file. The engine script records
+    the kernel symbols of the dump itself, vol.py saves its configuration to record them afterwards.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin to execute.
+    :param output_file: Path of the output file.
+    :param output_format: 'json' or 'jsonl'.
+    :param args: Optional dictionary of plugin arguments.
+    :return: Dictionary with the measurements of the run, see run_monitored.
+    :raises PluginRunError: If the plugin fails, times out or exceeds its memory limit.
+    """
+    if output_format == "jsonl":
+        return run_monitored(build_volatility_command(memory_file, plugin, output_file, output_format, args))
+    config_file = saved_config_file(memory_file)
+    try:
+        with open(output_file, "wb") as f:
+            return run_monitored(build_volatility_command(memory_file, plugin, output_file, output_format, args, config_file),
+                                 stdout=f)
+    finally:
+        record_saved_config(memory_file, config_file)
+
+def address_space_limit(limit_mb):
+    """
+    Creates a function limiting the address space of a child process before it starts (Linux/macOS only).
+
+    :param limit_mb: Address space limit in MB.
+    :return: Function to pass as preexec_fn.
+    """
+    def apply_limit():
+        import resource
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    return apply_limit
+
+def sample_process_tree(process, cpu_times):
+    """
+    Samples the resident memory and the CPU time of a process and all of its children.
+
+    :param process: psutil.Process of the tree root.
+    :param cpu_times: Dictionary of the last CPU time by PID, updated in place.
+    :return: Resident memory of the tree in bytes.
+    """
+    rss = 0
+    try:
+        members = [process] + process.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return rss
+    for member in members:
+        try:
+            rss += member.memory_info().rss
+            times = member.cpu_times()
+            cpu_times[member.pid] = times.user + times.system
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rss
+
+def kill_process_tree(process):
+    """
+    Kills a process and all of its children.
+    """
+    try:
+        members = process.children(recursive=True) + [process]
+    except psutil.NoSuchProcess:
+        return
+    for member in members:
+        try:
+            member.kill()
+        except psutil.NoSuchProcess:
+            continue
+    psutil.wait_procs(members, timeout=10)
+
+def run_monitored(command, stdout=None, timeout=volatility_plugin_timeout_s, max_memory_mb=volatility_plugin_max_memory_mb,
+                  address_space_mb=volatility_plugin_address_space_mb, poll_interval=0.5):
+    """
+    Runs a command as a child process and watches its wall-clock time and the resident memory of its process tree.
+    The process tree is killed once a limit is exceeded, so a runaway plugin can neither block the analysis
+    nor push the host into swap.
+
+    :param command: Command as list of arguments.
+    :param stdout: Optional file receiving the standard output.
+    :param timeout: Wall-clock limit in seconds or None.
+    :param max_memory_mb: Resident memory limit in MB or None.
+    :param address_space_mb: Address space limit in MB or None, ignored on Windows.
+    :param poll_interval: Seconds between two checks.
+    :return: Dictionary with started_at, finished_at, duration_s, cpu_s (sampled) and peak_rss_mb of the run.
+    :raises PluginRunError: If the command fails or exceeds a limit.
+    """
+    preexec_fn = address_space_limit(address_space_mb) if address_space_mb and os_name != "Windows" else None
+    started_at = time.time()
+    start = time.monotonic()
+    peak_rss = 0
+    cpu_times = {}
+
+    def stats():
+        return {"started_at": started_at, "finished_at": time.time(), "duration_s": round(time.monotonic() - start, 1),
+                "cpu_s": round(sum(cpu_times.values()), 1), "peak_rss_mb": peak_rss // (1024 * 1024)}
+
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=stdout, stderr=stderr, preexec_fn=preexec_fn)
+        watched = psutil.Process(process.pid)
+        while True:
+            try:
+                process.wait(timeout=poll_interval)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+
+            rss = sample_process_tree(watched, cpu_times)
+            peak_rss = max(peak_rss, rss)
+            if timeout and time.monotonic() - start > timeout:
+                kill_process_tree(watched)
+                raise PluginRunError("timeout", f"killed after exceeding the time limit of {timeout} s", **stats())
+            if max_memory_mb and rss > max_memory_mb * 1024 * 1024:
+                kill_process_tree(watched)
+                raise PluginRunError("memory", f"killed after exceeding the memory limit of {max_memory_mb} MB", **stats())
+
+        if process.returncode != 0:
+            stderr.seek(0)
+            lines = stderr.read().decode("utf-8", errors="replace").strip().splitlines()
+            detail = lines[-1] if lines else f"exit code {process.returncode}"
+            raise PluginRunError("exit", detail, returncode=process.returncode, **stats())
+    return stats()
+
+def wait_for_free_memory(min_free_memory_mb, poll_interval=2):
+    """
+    Blocks until at least the given amount of physical memory is available.
+
+    :param min_free_memory_mb: Required free memory in MB.
+    :param poll_interval: Seconds between two memory checks.
+    """
+    while psutil.virtual_memory().available < min_free_memory_mb * 1024 * 1024:
+        time.sleep(poll_interval)
+
+def wait_for_admission(min_free_memory_mb=volatility_min_free_memory_mb):
+    """
+    Waits until a plugin may start. One plugin is admitted at a time across all running analyses.
+
+    :param min_free_memory_mb: Free memory in MB required before the plugin is started.
+    """
+    with _admission_lock:
+        wait_for_free_memory(min_free_memory_mb)
+
+def check_engine_limits(engine, timeout=volatility_plugin_timeout_s, max_memory_mb=volatility_plugin_max_memory_mb):
+    """
+    Refuses the 'framework' engine while limits per plugin run are set, a plugin running in-process cannot be stopped.
+
+    :param engine: 'subprocess' or 'framework'.
+    :param timeout: Configured wall-clock limit in seconds or None.
+    :param max_memory_mb: Configured resident memory limit in MB or None.
+    :raises ValueError: If the 'framework' engine is used with a limit.
+    """
+    if engine == "framework" and (timeout is not None or max_memory_mb is not None):
+        raise ValueError("The framework engine cannot enforce volatility_plugin_timeout_s or "
+                         "volatility_plugin_max_memory_mb, set both to None or use the subprocess engine.")
+
+def bounded_worker_count(max_workers, plugin_memory_mb=volatility_plugin_memory_mb):
+    """
+    Limits the degree of parallelism so that the estimated memory of all running plugins fits into the available memory.
+
+    :param max_workers: Requested number of parallel plugins.
+    :param plugin_memory_mb: Estimated peak memory of one plugin run in MB.
+    :return: Number of workers to use, at least 1.
+    """
+    available_mb = psutil.virtual_memory().available // (1024 * 1024)
+    return max(1, min(max_workers, available_mb // max(1, plugin_memory_mb)))
+
+def run_plugin(memory_file, plugin, output_dir=analyzed_volatility_output, args=None, output_file=None,
+               retries=volatility_plugin_retries, backoff_s=volatility_retry_backoff_s):
+    """
+    Executes a single Volatility3 plugin on a memory dump and stores the result in JSON format.
+    A failed run is retried with exponential backoff; after a memory failure the retry waits for free memory.
+    Timeouts are not retried, a plugin hanging once would hang again.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin to execute.
+    :param output_dir: Directory for the JSON output file.
+    :param args: Optional dictionary of plugin arguments, e.g. {"pid": [4, 8]}.
+    :param output_file: Path of the output file, defaults to <plugin>.json in the output directory.
+    :param retries: Number of retries after a failed run.
+    :param backoff_s: Seconds to wait before the first retry, doubled for every further retry.
+    :return: Structured execution result.
+    """
+    output_file = output_file or os.path.join(output_dir, f"{plugin}.json")
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            stats = execute_volatility(memory_file, plugin, output_file, args=args)
+            return plugin_result(plugin, "done", f"{plugin} successfully executed.", output_file, attempts=attempts, **stats)
+        except Exception as e:
+            error = PluginRunError.from_exception(e)
+            if error.kind == "timeout" or attempts > retries:
+                return failure_result(plugin, error, output_file, attempts)
+
+        time.sleep(backoff_s * 2 ** (attempts - 1))
+        if error.kind == "memory":
+            wait_for_free_memory(volatility_min_free_memory_mb)
+
+def run_analysis(memory_file, plugins, max_workers=volatility_workers, status_callback=None,
+                 min_free_memory_mb=volatility_min_free_memory_mb, engine=volatility_engine, use_cache=result_cache_enabled,
+                 output_dir=analyzed_volatility_output):
     """
     Executes a list of Volatility3 plugins on a given memory dump file and stores the results in JSON format.
+    Plugins run in a memory-bounded worker pool, or in-process on one shared context with the 'framework' engine.
 
     :param memory_file: Path to the memory dump file.
     :param plugins: List of Volatility3 plugins to execute.
-    :return: List of execution results.
+    :param max_workers: Maximum number of plugins running in parallel (1 = sequential).
+    :param status_callback: Optional function called as status_callback(plugin, status, message) with the status
+                            'queued', 'running', 'done' or 'failed'. It is always called from the calling thread.
+    :param min_free_memory_mb: Free memory in MB required before another plugin is started.
+    :param engine: 'subprocess' to start vol.py per plugin, 'framework' to use the in-process engine.
+    :param use_cache: Whether to read from and write to the persistent result cache.
+    :param output_dir: Directory for the JSON output files.
+    :return: List of structured execution results in order of completion.
+    :raises ValueError: If the 'framework' engine is used with limits per plugin run.
     """
+    check_engine_limits(engine)
+    os.makedirs(output_dir, exist_ok=True)
     results = []
+    uncached_plugins = []
     for plugin in plugins:
+        output_file = os.path.join(output_dir, f"{plugin}.json")
+        if use_cache and lookup_result(memory_file, plugin, None, volatility_version, output_file):
+            results.append(plugin_result(plugin, "cached", f"{plugin} loaded from cache.", output_file))
+            if status_callback:
+                status_callback(plugin, "done", results[-1]["message"])
+        else:
+            uncached_plugins.append(plugin)
+
+    def notify(plugin, status, result):
+        # Keep every successful output in the result cache before reporting it
+        if status == "done" and use_cache:
+            store_result(memory_file, plugin, None, volatility_version,
+                         os.path.join(output_dir, f"{plugin}.json"))
+        if status_callback:
+            status_callback(plugin, status, result)
+
+    if engine == "framework":
+        return results + run_analysis_in_process(memory_file, uncached_plugins, output_dir, notify,
+                                                 volatility_output_format)
+
+    states = {plugin: "queued" for plugin in uncached_plugins}
+    reported = {}
+
+    def report():
+        # Forward state changes made by the workers to the callback in the calling thread
+        for plugin, state in list(states.items()):
+            if reported.get(plugin) != state and state in ("queued", "running"):
+                reported[plugin] = state
+                notify(plugin, state, None)
+
+    def worker(plugin):
+        with _admission_lock:
+            wait_for_free_memory(min_free_memory_mb)
+            states[plugin] = "running"
+        return run_plugin(memory_file, plugin, output_dir)
+
+    with ThreadPoolExecutor(max_workers=bounded_worker_count(max_workers)) as executor:
+        futures = {executor.submit(worker, plugin): plugin for plugin in uncached_plugins}
+        pending = set(futures)
+        while pending:
+            report()
+            done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            for future in done:
+                plugin = futures[future]
+                result = future.result()
+                states[plugin] = result["status"]
+                results.append(result)
+                report()
+                notify(plugin, states[plugin], result["message"])
+    return results
+
+def run_plugin_with_args(memory_file, plugin, args, output_file, engine=volatility_engine, use_cache=result_cache_enabled):
+    """
+    Executes a single Volatility3 plugin with arguments, e.g. restricted to some processes with {"pid": [4, 8]}.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugin: Volatility3 plugin to execute.
+    :param args: Dictionary of plugin arguments.
+    :param output_file: Path of the output file.
+    :param engine: 'subprocess' to start vol.py, 'framework' to use the in-process engine.
+    :param use_cache: Whether to read from and write to the persistent result cache.
+    :return: Structured execution result.
+    :raises ValueError: If the 'framework' engine is used with limits per plugin run.
+    """
+    check_engine_limits(engine)
+    if use_cache and lookup_result(memory_file, plugin, args, volatility_version, output_file):
+        return plugin_result(plugin, "cached", f"{plugin} loaded from cache.", output_file)
+
+    if engine == "framework":
+        timer = RunTimer()
         try:
-            output_file = os.path.join(analyzed_volatility_output, f"{plugin}.json")
-            if os_name == "Windows":
-                command = f"powershell -command \"python.exe {volatility_path} -r json -f {memory_file} {plugin} > {output_file}\""
-            else:  # Linux/macOS
-                command = f"python3 {volatility_path} -r json -f {memory_file} {plugin} > {output_file}"
-
-            subprocess.run(command, shell=True, check=True)
-            results.append(f"{plugin} successfully executed.")
+            get_engine(memory_file).run_plugin(plugin, output_file, args=args, output_format=volatility_output_format)
+            result = plugin_result(plugin, "done", f"{plugin} successfully executed.", output_file, attempts=1, **timer.stats())
         except Exception as e:
-            results.append(f"Failure in {plugin}: {str(e)}")
-    return results
+            error = PluginRunError.from_exception(e)
+            error.stats.update(timer.stats())
+            return failure_result(plugin, error, output_file)
+    else:
+        wait_for_admission()
+        result = run_plugin(memory_file, plugin, args=args, output_file=output_file)
+
+    if use_cache and result["status"] == "done":
+        store_result(memory_file, plugin, args, volatility_version, output_file)
+    return result
 
-def run_file_search_analysis(memory_file):
+def run_file_search_analysis(memory_file, engine=volatility_engine, use_cache=result_cache_enabled):
     """
     Runs the 'windows.filescan' plugin to identify files in memory and stores results in JSON format.
 
     :param memory_file: Path to the memory dump file.
-    :return: List containing execution status.
+    :param engine: 'subprocess' to start vol.py, 'framework' to use the in-process engine.
+    :param use_cache: Whether to read from and write to the persistent result cache.
+    :return: List containing the structured execution result.
+    :raises PluginRunError: If the plugin fails, times out or exceeds its memory limit.
     """
+    check_engine_limits(engine)
     results = []
     plugin = "windows.filescan"
     output_file = os.path.join(data_extraction_output, f"{plugin}.json")
 
-    if os_name == "Windows":
-        command = f"powershell -command \"python.exe {volatility_path} -r json -f {memory_file} {plugin} > {output_file}\""
-    else:  # Linux/macOS
-        command = f"python3 {volatility_path} -r json -f {memory_file} {plugin} > {output_file}"
+    if use_cache and lookup_result(memory_file, plugin, None, volatility_version, output_file):
+        results.append(plugin_result(plugin, "cached", f"{plugin} loaded from cache.", output_file))
+        return results
 
-    subprocess.run(command, shell=True, check=True)
-    results.append(f"{plugin} successfully executed.")
+    if engine == "framework":
+        timer = RunTimer()
+        get_engine(memory_file).run_plugin(plugin, output_file, output_format=volatility_output_format)
+        stats = timer.stats()
+    else:
+        stats = execute_volatility(memory_file, plugin, output_file)
+    if use_cache:
+        store_result(memory_file, plugin, None, volatility_version, output_file)
+    results.append(plugin_result(plugin, "done", f"{plugin} successfully executed.", output_file, attempts=1, **stats))
     return results
 
-def run_file_extraction(memory_file, offset):
+def run_file_extraction(memory_file, offset, engine=volatility_engine, use_cache=result_cache_enabled):
     """
     Extracts a file from memory at a given virtual offset using the 'windows.dumpfiles' plugin.
 
     :param memory_file: Path to the memory dump file.
     :param offset: Virtual memory address for file extraction.
-    :return: List containing execution status.
+    :param engine: 'subprocess' to start vol.py, 'framework' to use the in-process engine.
+    :param use_cache: Whether to read from and write to the persistent result cache.
+    :return: List containing the structured execution result.
+    :raises PluginRunError: If the plugin fails, times out or exceeds its memory limit.
     """
+    check_engine_limits(engine)
     results = []
     plugin = "windows.dumpfiles"
+    args = {"virtaddr": int(offset)}
+
+    if use_cache and lookup_result(memory_file, plugin, args, volatility_version, data_extraction_output) is not None:
+        results.append(plugin_result(plugin, "cached", f"{plugin} loaded from cache."))
+        return results
 
-    if os_name == "Windows":
-        command = f"powershell -command \"python.exe {volatility_path} -f {memory_file} -o {data_extraction_output} {plugin} --virtaddr {offset}\""
-    else:  # Linux/macOS
-        command = f"python3 {volatility_path} -f {memory_file} -o {data_extraction_output} {plugin} --virtaddr {offset}"
+    # Extract into a separate directory first, so the written files are known for the cache
+    os.makedirs(data_extraction_output, exist_ok=True)
+    extraction_dir = tempfile.mkdtemp(prefix="dumpfiles_", dir=data_extraction_output)
+    try:
+        if engine == "framework":
+            timer = RunTimer()
+            get_engine(memory_file).run_plugin(plugin, args=args, output_dir=extraction_dir)
+            stats = timer.stats()
+        else:
+            config_file = saved_config_file(memory_file)
+            command = [python_executable, volatility_path] + symbol_flags(memory_file) + \
+                (["--save-config", config_file] if config_file else []) + \
+                ["-f", memory_file, "-o", extraction_dir, plugin] + plugin_flags(args)
+            wait_for_admission()
+            try:
+                stats = run_monitored(command)
+            finally:
+                record_saved_config(memory_file, config_file)
 
-    subprocess.run(command, shell=True, check=True)
-    results.append(f"{plugin} successfully executed.")
+        extracted_files = [os.path.join(extraction_dir, name) for name in os.listdir(extraction_dir)]
+        stats["output_bytes"] = sum(os.path.getsize(path) for path in extracted_files)
+        if use_cache:
+            store_result(memory_file, plugin, args, volatility_version, extracted_files)
+        for path in extracted_files:
+            os.replace(path, os.path.join(data_extraction_output, os.path.basename(path)))
+    finally:
+        shutil.rmtree(extraction_dir, ignore_errors=True)
+
+    results.append(plugin_result(plugin, "done", f"{plugin} successfully executed.", attempts=1, **stats))
     return results
 
+def run_batch_extraction(memory_file, offsets, max_workers=volatility_workers, result_callback=None,
+                         engine=volatility_engine, use_cache=result_cache_enabled):
+    """
+    Extracts the files at many virtual offsets using the 'windows.dumpfiles' plugin, split over a small pool of
+    workers that each extract all their offsets on one context.
+
+    :param memory_file: Path to the memory dump file.
+    :param offsets: List of virtual memory addresses.
+    :param max_workers: Maximum number of Volatility3 processes running in parallel.
+    :param result_callback: Optional function called with the report of every offset. It is always called from the
+                            calling thread.
+    :param engine: 'subprocess' to start the engine script, 'framework' to use the in-process engine.
+    :param use_cache: Whether to read from and write to the persistent result cache.
+    :return: List of reports, one per offset, with offset, status ('done', 'cached' or 'failed'), files and message.
+    :raises ValueError: If the 'framework' engine is used with limits per plugin run.
+    """
+    check_engine_limits(engine)
+    plugin = "windows.dumpfiles"
+    offsets = list(dict.fromkeys(int(offset) for offset in offsets))
+    reports = []
+
+    def report(offset, status, files, message):
+        reports.append({"offset": offset, "status": status, "files": [os.path.basename(path) for path in files],
+                        "message": message})
+        if result_callback:
+            result_callback(reports[-1])
+
+    def finish_run(args, files, rows, error):
+        if error:
+            report(args["virtaddr"], "failed", files, f"Failure in {plugin}: {error}")
+            return
+        if use_cache:
+            store_result(memory_file, plugin, args, volatility_version, files)
+        report(args["virtaddr"], "done", files, f"{len(files)} files extracted." if files else "No file found at this offset.")
+
+    remaining = []
+    for offset in offsets:
+        restored = lookup_result(memory_file, plugin, {"virtaddr": offset}, volatility_version, data_extraction_output) if use_cache else None
+        if restored is not None:
+            report(offset, "cached", restored, f"{len(restored)} files loaded from cache.")
+        else:
+            remaining.append(offset)
+    if not remaining:
+        return reports
+
+    os.makedirs(data_extraction_output, exist_ok=True)
+    args_list = [{"virtaddr": offset} for offset in remaining]
+    if engine == "framework":
+        get_engine(memory_file).run_each(plugin, args_list, data_extraction_output, finish_run)
+        return reports
+
+    # Every worker runs its share of the offsets in one engine process, reporting each offset as one JSON line
+    workers = max(1, min(bounded_worker_count(max_workers), len(args_list)))
+    chunks = [args_list[index::workers] for index in range(workers)]
+    report_dir = tempfile.mkdtemp(prefix="dumpfiles_")
+    report_files = [os.path.join(report_dir, f"worker_{index}.jsonl") for index in range(workers)]
+    read_offsets = [0] * workers
+    reported = set()
+
+    def worker(index):
+        open(report_files[index], "w").close()
+        wait_for_admission()
+        command = [python_executable, engine_script, memory_file, plugin, report_files[index]] + symbol_flags(memory_file) + \
+            ["--each-args", json.dumps(chunks[index]), "--output-dir", data_extraction_output]
+        run_monitored(command)
+
+    def collect(index):
+        # Forward the offsets finished by a worker to the callback in the calling thread
+        if not os.path.exists(report_files[index]):
+            return
+        records, read_offsets[index] = read_json_lines(report_files[index], read_offsets[index])
+        for record in records:
+            reported.add(record["args"]["virtaddr"])
+            finish_run(record["args"], record["files"], record["rows"], record["error"])
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(worker, index): index for index in range(workers)}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                for index in range(workers):
+                    collect(index)
+                for future in done:
+                    index = futures[future]
+                    collect(index)
+                    error = future.exception()
+                    if error is not None:
+                        # Offsets not reached by a failed worker are reported with the failure of the process
+                        detail = PluginRunError.from_exception(error).detail
+                        for args in chunks[index]:
+                            if args["virtaddr"] not in reported:
+                                report(args["virtaddr"], "failed", [], f"Failure in {plugin}: {detail}")
+    finally:
+        shutil.rmtree(report_dir, ignore_errors=True)
+    return reports
+
 # List of commonly used Volatility3 plugins for memory analysis, add more if needed
 GLOBAL_VOLATILITY = [
     "windows.pslist",
@@ -96,8 +588,29 @@ GLOBAL_VOLATILITY = [
     "windows.psscan"
 ]
 
-def modify_global_var():
+# Further Volatility3 plugins that can be added to an existing analysis
+OPTIONAL_VOLATILITY = [
+    "windows.handles",
+    "windows.vadinfo",
+    "windows.privileges",
+    "windows.envars",
+    "windows.modules",
+    "windows.driverscan",
+    "windows.mutantscan",
+    "windows.ssdt",
+    "windows.callbacks",
+]
+
+def modify_global_var(plugins=None, add=None, remove=None):
     """
-    Placeholder function for modifying the global plugin list.
+    Returns a copy of a plugin list with plugins added and removed. The global plugin list is shared by all
+    sessions and stays unchanged, a session keeps its own list.
+
+    :param plugins: Plugin list to start from, defaults to the global plugin list.
+    :param add: Optional list of plugins to append.
+    :param remove: Optional list of plugins to remove.
+    :return: New plugin list.
     """
-    global GLOBAL_VOLATILITY
+    plugins = list(GLOBAL_VOLATILITY if plugins is None else plugins)
+    plugins += [plugin for plugin in dict.fromkeys(add or []) if plugin not in plugins]
+    return [plugin for plugin in plugins if plugin not in (remove or [])]
@@ -0,0 +1,430 @@
+import io
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import platform
+import threading
+
+# Detect operating system
+os_name = platform.system()
+
+# Define appropriate directories based on OS
+if os_name == "Windows":
+    volatility_dir = "O:\\00_tools\\volatility3-2.8.0"
+    analyzed_volatility_output = "O:\\02_volatility_output"
+else:  # Linux/macOS
+    volatility_dir = "/tmp/MemoryInvestigator/00_tools/volatility3-2.8.0"
+    analyzed_volatility_output = "/tmp/MemoryInvestigator/02_volatility_output"
+
+# Engines by memory file, so every plugin of a dump shares one context
+_engines = {}
+_engines_lock = threading.Lock()
+
+def load_volatility(symbol_dir=None, cache_path=None, offline=False):
+    """
+    Imports the Volatility3 framework from the downloaded release in the tools directory.
+    The import is done on demand, because the release is only downloaded after the app has started.
+
+    :param symbol_dir: Optional symbol directory searched first, like `vol.py -s`.
+    :param cache_path: Optional cache directory, like `vol.py --cache-path`.
+    :param offline: Never download symbols, like `vol.py --offline`.
+    :return: The imported volatility3 package.
+    """
+    if volatility_dir not in sys.path:
+        sys.path.insert(0, volatility_dir)
+
+    import volatility3
+    import volatility3.plugins
+    import volatility3.symbols
+    from volatility3 import framework
+    from volatility3.framework import constants
+
+    if symbol_dir and symbol_dir not in volatility3.symbols.__path__:
+        volatility3.symbols.__path__ = [symbol_dir] + list(volatility3.symbols.__path__)
+    if cache_path:
+        constants.CACHE_PATH = cache_path
+    constants.OFFLINE = offline
+
+    framework.require_interface_version(2, 0, 0)
+    framework.import_files(volatility3.plugins, True)
+    return volatility3
+
+class VolatilityEngine:
+    """
+    Runs Volatility3 plugins in-process against one shared context per memory dump.
+    The memory layers and symbol tables are built by the automagic of the first plugin, all following
+    plugins reuse this kernel configuration instead of repeating the layer and symbol discovery.
+    """
+
+    def __init__(self, memory_file, symbol_dir=None, cache_path=None, offline=False):
+        """
+        Creates the context for a memory dump.
+
+        :param memory_file: Path to the memory dump file.
+        :param symbol_dir: Optional symbol directory searched first.
+        :param cache_path: Optional Volatility3 cache directory.
+        :param offline: Never download symbols.
+        """
+        load_volatility(symbol_dir, cache_path, offline)
+        from volatility3 import framework
+        from volatility3.framework import contexts, automagic
+        from volatility3.framework.configuration import requirements
+
+        self.memory_file = memory_file
+        self.context = contexts.Context()
+        self.context.config["automagic.LayerStacker.single_location"] = \
+            requirements.URIRequirement.location_from_file(memory_file)
+        self.automagics = automagic.available(self.context)
+        self.plugin_list = framework.list_plugins()
+        self.kernel_config = None
+        self.lock = threading.Lock()
+        self.run_count = 0
+
+    def get_plugin_class(self, plugin):
+        """
+        Resolves a plugin name as used on the command line (e.g. 'windows.pslist') to its plugin class.
+
+        :param plugin: Volatility3 plugin name.
+        :return: Plugin class.
+        """
+        for name, plugin_class in self.plugin_list.items():
+            if name == plugin or name.startswith(f"{plugin}."):
+                return plugin_class
+        raise ValueError(f"Unknown Volatility3 plugin: {plugin}")
+
+    def construct(self, plugin, args=None, output_dir=None):
+        """
+        Constructs a plugin on the shared context. Every run gets its own configuration path,
+        so arguments of an earlier run (e.g. a virtual address) never leak into the next one.
+
+        :param plugin: Volatility3 plugin name.
+        :param args: Optional dictionary of plugin arguments (e.g. {"virtaddr": 0x1234} or {"pid": [4]}).
+        :param output_dir: Directory for files written by the plugin (e.g. windows.dumpfiles).
+        :return: Constructed plugin.
+        """
+        from volatility3.framework import automagic, plugins
+        from volatility3.framework.interfaces.configuration import path_join
+
+        plugin_class = self.get_plugin_class(plugin)
+        self.run_count += 1
+        base_config_path = path_join("plugins", f"run{self.run_count}")
+        config_path = path_join(base_config_path, plugin_class.__name__)
+
+        # Reuse the kernel layer and symbol table found for an earlier plugin
+        if self.kernel_config is not None:
+            self.context.config.splice(path_join(config_path, "kernel"), self.kernel_config.clone())
+
+        for key, value in (args or {}).items():
+            self.context.config[path_join(config_path, key)] = value
+
+        constructed = plugins.construct_plugin(
+            self.context,
+            automagic.choose_automagic(self.automagics, plugin_class),
+            plugin_class,
+            base_config_path,
+            mute_progress,
+            file_handler_class(output_dir or analyzed_volatility_output),
+        )
+
+        if self.kernel_config is None and f"{path_join(config_path, 'kernel')}.layer_name" in self.context.config:
+            self.kernel_config = self.context.config.branch(path_join(config_path, "kernel")).clone()
+            self.record_kernel_symbols()
+        return constructed
+
+    def record_kernel_symbols(self):
+        """
+        Records the kernel symbol table of the memory dump in the symbol index, so later analyses run offline.
+        """
+        # Imported here, the module also runs as a script outside the utils package
+        from utils.symbol_cache import record_dump_symbols
+
+        if "symbol_table_name.isf_url" in self.kernel_config:
+            record_dump_symbols(self.memory_file, self.kernel_config["symbol_table_name.isf_url"])
+
+    def run_plugin(self, plugin, output_file=None, args=None, output_dir=None, output_format="json"):
+        """
+        Runs a plugin on the shared context and writes its rows either as one JSON document, equal to
+        `vol.py -r json`, or as JSON Lines with one top-level row per line, written while the plugin runs.
+
+        :param plugin: Volatility3 plugin name.
+        :param output_file: Path of the output file, or None to discard the rows.
+        :param args: Optional dictionary of plugin arguments.
+        :param output_dir: Directory for files written by the plugin.
+        :param output_format: 'json' or 'jsonl'.
+        :return: Number of top-level rows.
+        """
+        with self.lock:
+            grid = self.construct(plugin, args, output_dir).run()
+            if output_file and output_format == "jsonl":
+                with open(output_file, "w", encoding="utf-8") as f:
+                    return stream_rows(grid, f)
+            rows = render_rows(grid)
+
+        if output_file:
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(json.dumps(rows, indent=2, sort_keys=True))
+        return len(rows)
+
+    def run_each(self, plugin, args_list, output_dir, result_callback):
+        """
+        Runs a plugin once per set of arguments on the shared context, e.g. 'windows.dumpfiles' for many virtual
+        addresses. The files of every run are moved into the output directory as soon as the run has finished.
+
+        :param plugin: Volatility3 plugin name.
+        :param args_list: List of argument dictionaries, one per run.
+        :param output_dir: Directory for files written by the plugin.
+        :param result_callback: Function called as result_callback(args, files, rows, error) after every run,
+                                with the paths of the written files and the error message of a failed run.
+        """
+        for args in args_list:
+            os.makedirs(output_dir, exist_ok=True)
+            run_dir = tempfile.mkdtemp(prefix="run_", dir=output_dir)
+            try:
+                rows = self.run_plugin(plugin, args=args, output_dir=run_dir)
+                error = None
+            except Exception as e:
+                rows, error = 0, str(e) or type(e).__name__
+            files = [move_unique(os.path.join(run_dir, name), output_dir) for name in sorted(os.listdir(run_dir))]
+            shutil.rmtree(run_dir, ignore_errors=True)
+            result_callback(args, files, rows, error)
+
+def move_unique(path, output_dir):
+    """
+    Moves a file into a directory without overwriting an earlier file of the same name.
+
+    :param path: Path of the file.
+    :param output_dir: Target directory.
+    :return: New path of the file.
+    """
+    filename, extension = os.path.splitext(os.path.join(output_dir, os.path.basename(path)))
+    destination = f"{filename}{extension}"
+    counter = 1
+    while os.path.exists(destination):
+        destination = f"{filename}-{counter}{extension}"
+        counter += 1
+    os.replace(path, destination)
+    return destination
+
+def mute_progress(progress, description=None):
+    """
+    Progress callback for automagic and plugins, progress is reported per plugin by the caller instead.
+    """
+
+def visit_rows(grid, row_callback):
+    """
+    Visits all rows of a Volatility3 TreeGrid and converts them to JSON serializable dictionaries like the
+    JSON renderer. Child rows are nested via '__children' into their parent.
+
+    :param grid: Populated or unpopulated TreeGrid returned by a plugin.
+    :param row_callback: Function called with every top-level row dictionary when it is created.
+    """
+    from volatility3.cli import text_renderer
+    from volatility3.framework import interfaces
+
+    type_renderers = text_renderer.JsonRenderer._type_renderers
+    node_map = {}
+
+    def visitor(node, accumulator):
+        node_dict = {"__children": []}
+        values = list(node.values)
+        for column_index, column in enumerate(grid.columns):
+            renderer = type_renderers.get(column.type, type_renderers["default"])
+            data = renderer(values[column_index])
+            if isinstance(data, interfaces.renderers.BaseAbsentValue):
+                data = None
+            node_dict[column.name] = data
+        if node.parent:
+            node_map[node.parent.path]["__children"].append(node_dict)
+        else:
+            node_map.clear()  # Earlier top-level rows are complete
+            row_callback(node_dict)
+        node_map[node.path] = node_dict
+        return accumulator
+
+    if not grid.populated:
+        grid.populate(visitor, None)
+    else:
+        grid.visit(node=None, function=visitor, initial_accumulator=None)
+
+def render_rows(grid):
+    """
+    Converts a Volatility3 TreeGrid to JSON serializable rows, nested via '__children' like the JSON renderer.
+
+    :param grid: Populated or unpopulated TreeGrid returned by a plugin.
+    :return: List of row dictionaries.
+    """
+    rows = []
+    visit_rows(grid, rows.append)
+    return rows
+
+def stream_rows(grid, outfd):
+    """
+    Writes the rows of a Volatility3 TreeGrid as flushed JSON Lines while the plugin produces them.
+    A top-level row is written once the next one starts, so it includes all of its children.
+
+    :param grid: Populated or unpopulated TreeGrid returned by a plugin.
+    :param outfd: Text file opened for writing.
+    :return: Number of written rows.
+    """
+    pending = []
+    count = 0
+
+    def write_pending():
+        nonlocal count
+        if pending:
+            outfd.write(json.dumps(pending.pop(), sort_keys=True) + "\n")
+            outfd.flush()
+            count += 1
+
+    def on_row(row):
+        write_pending()
+        pending.append(row)
+
+    try:
+        visit_rows(grid, on_row)
+    finally:
+        write_pending()
+    return count
+
+def file_handler_class(output_dir):
+    """
+    Creates a file handler class that writes files produced by a plugin into the given directory.
+    Data is buffered in a temporary file and renamed to a unique name when the plugin closes it.
+
+    :param output_dir: Target directory for plugin files.
+    :return: Subclass of the Volatility3 FileHandlerInterface.
+    """
+    from volatility3.framework import interfaces
+
+    class EngineFileHandler(interfaces.plugins.FileHandlerInterface):
+        def __init__(self, filename):
+            os.makedirs(output_dir, exist_ok=True)
+            fd, self._temp_name = tempfile.mkstemp(suffix=".vol3", prefix="tmp_", dir=output_dir)
+            self._file = io.open(fd, mode="w+b")
+            interfaces.plugins.FileHandlerInterface.__init__(self, filename)
+
+        def __getattr__(self, item):
+            return getattr(self._file, item)
+
+        def write(self, data):
+            return self._file.write(data)
+
+        def seek(self, offset, whence=io.SEEK_SET):
+            return self._file.seek(offset, whence)
+
+        def tell(self):
+            return self._file.tell()
+
+        @property
+        def closed(self):
+            return self._file.closed
+
+        def close(self):
+            if self._file.closed:
+                return None
+
+            # Never overwrite an earlier extraction with the same name
+            output_filename = os.path.join(output_dir, self.preferred_filename)
+            filename, extension = os.path.splitext(output_filename)
+            counter = 1
+            while os.path.exists(output_filename):
+                output_filename = f"{filename}-{counter}{extension}"
+                counter += 1
+
+            self.preferred_filename = os.path.basename(output_filename)
+            self._file.close()
+            os.replace(self._temp_name, output_filename)
+
+    return EngineFileHandler
+
+def get_engine(memory_file):
+    """
+    Returns the engine of a memory dump, creating it on first use.
+
+    :param memory_file: Path to the memory dump file.
+    :return: VolatilityEngine sharing one context for this dump.
+    """
+    from utils.symbol_cache import symbol_settings
+
+    key = os.path.abspath(memory_file)
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = VolatilityEngine(memory_file, **symbol_settings(memory_file))
+        return _engines[key]
+
+def release_engine(memory_file):
+    """
+    Drops the engine of a memory dump, freeing its layers and symbol tables.
+
+    :param memory_file: Path to the memory dump file.
+    """
+    with _engines_lock:
+        _engines.pop(os.path.abspath(memory_file), None)
+
+def run_analysis_in_process(memory_file, plugins, output_dir=analyzed_volatility_output, status_callback=None,
+                            output_format="json"):
+    """
+    Executes a list of Volatility3 plugins in-process on a shared context and stores the results in JSON format.
+
+    :param memory_file: Path to the memory dump file.
+    :param plugins: List of Volatility3 plugins to execute.
+    :param output_dir: Directory for the JSON output files.
+    :param status_callback: Optional function called as status_callback(plugin, status, message).
+    :param output_format: 'json' or 'jsonl'.
+    :return: List of structured execution results.
+    """
+    # Imported here, the module also runs as a script outside the utils package
+    from utils.plugin_results import PluginRunError, RunTimer, plugin_result, failure_result
+
+    results = []
+    engine = get_engine(memory_file)
+    for plugin in plugins:
+        if status_callback:
+            status_callback(plugin, "running", None)
+        output_file = os.path.join(output_dir, f"{plugin}.json")
+        timer = RunTimer()
+        try:
+            engine.run_plugin(plugin, output_file, output_format=output_format)
+            result = plugin_result(plugin, "done", f"{plugin} successfully executed.", output_file, attempts=1,
+                                   **timer.stats())
+        except Exception as e:
+            error = PluginRunError.from_exception(e)
+            error.stats.update(timer.stats())
+            result = failure_result(plugin, error, output_file)
+        results.append(result)
+        if status_callback:
+            status_callback(plugin, result["status"], result["message"])
+    return results
+
+# Run a single plugin with streamed JSON Lines output, used by the subprocess engine
+if __name__ == "__main__":
+    # Make the utils package importable, e.g. for the symbol index
+    sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    parser = argparse.ArgumentParser(description="Runs a Volatility3 plugin and streams its rows as JSON Lines.")
+    parser.add_argument("memory_file", help="Path to the memory dump file.")
+    parser.add_argument("plugin", help="Volatility3 plugin name, e.g. windows.pslist.")
+    parser.add_argument("output_file", help="Path of the JSON Lines output file.")
+    parser.add_argument("--args", help="Plugin arguments as JSON object, e.g. '{\"pid\": [4]}'.", default="{}")
+    parser.add_argument("-s", "--symbol-dirs", help="Symbol directory searched first, like vol.py.", default=None)
+    parser.add_argument("--cache-path", help="Volatility3 cache directory, like vol.py.", default=None)
+    parser.add_argument("--offline", help="Never download symbols, like vol.py.", action="store_true")
+    parser.add_argument("--each-args", help="Runs the plugin once per argument object of a JSON list on one context, "
+                                            "the output file then receives one result line per run.", default=None)
+    parser.add_argument("--output-dir", help="Directory for files written by the plugin.", default=None)
+    arguments = parser.parse_args()
+
+    engine = VolatilityEngine(arguments.memory_file, arguments.symbol_dirs, arguments.cache_path, arguments.offline)
+    if arguments.each_args is None:
+        engine.run_plugin(arguments.plugin, arguments.output_file, args=json.loads(arguments.args),
+                          output_dir=arguments.output_dir, output_format="jsonl")
+    else:
+        with open(arguments.output_file, "w", encoding="utf-8") as report:
+            def write_result(args, files, rows, error):
+                report.write(json.dumps({"args": args, "files": files, "rows": rows, "error": error}) + "\n")
+                report.flush()
+
+            engine.run_each(arguments.plugin, json.loads(arguments.each_args), arguments.output_dir, write_result)
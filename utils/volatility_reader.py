@@ -0,0 +1,234 @@
+import os
+import re
+import json
+import codecs
+
+# Byte order marks and the encodings they stand for, UTF-32 first as its little-endian BOM starts like UTF-16's
+BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Whitespace and commas between the rows of a JSON array
+SEPARATORS = re.compile(r"[\s,]*")
+
+def detect_encoding(filepath):
+    """
+    Detects the encoding of a Volatility3 output file from its byte order mark. PowerShell redirects write UTF-16
+    with a BOM, vol.py and the engine script UTF-8 without one; UTF-16 without a BOM is recognized by the zero
+    byte next to the opening bracket.
+
+    :param filepath: Path to the output file.
+    :return: Name of the encoding.
+    """
+    with open(filepath, "rb") as file:
+        start = file.read(4)
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if start.startswith(bom):
+            return encoding
+    if start[1:2] == b"\x00":
+        return "utf-16-le"
+    if start[:1] == b"\x00":
+        return "utf-16-be"
+    return "utf-8"
+
+def is_json_lines(filepath):
+    """
+    Checks whether a Volatility3 output file contains JSON Lines (one row per line) instead of one JSON document.
+    JSON Lines files are always written in UTF-8 and start with an object, JSON documents start with an array.
+
+    :param filepath: Path to the output file.
+    :return: True for JSON Lines.
+    """
+    try:
+        with open(filepath, "rb") as file:
+            return file.read(64).lstrip().startswith(b"{")
+    except FileNotFoundError:
+        return False
+
+def read_json_lines(filepath, offset=0):
+    """
+    Reads the complete lines of a JSON Lines file starting at a byte offset. A trailing line that is still being
+    written, or was cut off by a crashing plugin, is left for the next read.
+
+    :param filepath: Path to the JSON Lines file.
+    :param offset: Byte offset of the first unread line.
+    :return: Tuple (records, new offset).
+    """
+    records = []
+    with open(filepath, "rb") as file:
+        file.seek(offset)
+        data = file.read()
+
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        if line.strip():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Skip a damaged line, keep all other rows
+    return records, offset + end
+
+def iter_json_lines(filepath):
+    """
+    Iterates over the rows of a JSON Lines file one line at a time.
+
+    :param filepath: Path to the JSON Lines file.
+    :return: Generator of row dictionaries.
+    """
+    with open(filepath, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break  # Incomplete last line of a running or crashed plugin
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+def iter_json_array(filepath, chunk_size=1024 * 1024):
+    """
+    Iterates over the rows of a JSON document without loading it: the file is decoded chunk by chunk and one
+    row after the other is parsed, so only the current row and chunk are held in memory. The rows before a
+    damaged or cut-off part are yielded.
+
+    :param filepath: Path to the JSON file.
+    :param chunk_size: Number of characters read at once, a larger row is read in growing chunks.
+    :return: Generator of row dictionaries.
+    """
+    decoder = json.JSONDecoder()
+    with open(filepath, "r", encoding=detect_encoding(filepath)) as file:
+        buffer = file.read(chunk_size)
+        position = SEPARATORS.match(buffer).end()
+        if not buffer.startswith("[", position):
+            # A single object is no array of rows, it is small and parsed at once
+            try:
+                document = json.loads(buffer[position:] + file.read()) if buffer.strip() else []
+            except json.JSONDecodeError:
+                return
+            yield from document if isinstance(document, list) else [document]
+            return
+
+        position, eof = position + 1, False
+        while True:
+            position = SEPARATORS.match(buffer, position).end()
+            if buffer.startswith("]", position):
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+                complete = end < len(buffer) or eof  # A number at the end of the buffer may go on
+            except json.JSONDecodeError:
+                if eof:
+                    return
+                complete = False
+            if complete:
+                yield record
+                position = end
+                continue
+
+            # Keep the unparsed rest and read on
+            chunk = file.read(max(chunk_size, len(buffer) - position))
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+
+def iter_volatility_output(filepath):
+    """
+    Iterates over the rows of a Volatility3 output file, either JSON Lines or a JSON document encoded in UTF-16
+    (PowerShell redirect) or UTF-8, with bounded memory.
+
+    :param filepath: Path to the output file.
+    :return: Generator of row dictionaries, nothing if the file does not exist.
+    """
+    if is_json_lines(filepath):
+        yield from iter_json_lines(filepath)
+        return
+    try:
+        yield from iter_json_array(filepath)
+    except (FileNotFoundError, UnicodeError):
+        return
+
+def count_rows(filepath):
+    """
+    Counts the top-level rows of a Volatility3 output file. JSON Lines are counted without parsing the rows,
+    JSON documents are streamed.
+
+    :param filepath: Path to the output file.
+    :return: Number of rows.
+    """
+    if is_json_lines(filepath):
+        with open(filepath, "rb") as file:
+            return sum(1 for line in file if line.endswith(b"\n") and line.strip())
+    return sum(1 for _ in iter_volatility_output(filepath))
+
+def load_volatility_output(filepath):
+    """
+    Loads all rows of a Volatility3 output file, either JSON Lines or a JSON document encoded in UTF-16
+    (PowerShell redirect) or UTF-8. For JSON Lines all rows written so far are returned, also of a failed plugin.
+
+    :param filepath: Path to the output file.
+    :return: Parsed rows or an empty list if an error occurs.
+    """
+    if is_json_lines(filepath):
+        return list(iter_json_lines(filepath))
+
+    try:
+        with open(filepath, "r", encoding=detect_encoding(filepath)) as file:
+            return json.load(file)
+    except (FileNotFoundError, UnicodeError, json.JSONDecodeError):
+        return []
+
+class IncrementalReader:
+    """
+    Keeps the rows of a Volatility3 output file across reads. For JSON Lines only the lines appended since the
+    previous read are parsed, so the rows of a running plugin show up progressively without re-reading the file.
+    """
+
+    def __init__(self, filepath):
+        """
+        :param filepath: Path to the output file.
+        """
+        self.filepath = filepath
+        self.records = []
+        self.offset = 0
+
+    def read(self):
+        """
+        Reads all new rows of the output file.
+
+        :return: List of all rows read so far.
+        """
+        if not is_json_lines(self.filepath):
+            self.records, self.offset = load_volatility_output(self.filepath), 0
+            return self.records
+
+        # Start over if the file was rewritten by a new run
+        if os.path.getsize(self.filepath) < self.offset:
+            self.records, self.offset = [], 0
+
+        new_records, self.offset = read_json_lines(self.filepath, self.offset)
+        self.records.extend(new_records)
+        return self.records
+
+class RecordStream:
+    """
+    Re-iterable stream of the rows of a Volatility3 output file. Every iteration reads the file again one row at
+    a time, so consumers iterating over the rows several times still hold only one row in memory.
+    """
+
+    def __init__(self, filepath, columns=None):
+        """
+        :param filepath: Path to the output file.
+        :param columns: Optional list of columns kept in the rows, all columns by default.
+        """
+        self.filepath = filepath
+        self.columns = columns
+
+    def __iter__(self):
+        for record in iter_volatility_output(self.filepath):
+            if self.columns is None or not isinstance(record, dict):
+                yield record
+            else:
+                yield {column: record[column] for column in self.columns if column in record}